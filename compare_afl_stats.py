@@ -1,14 +1,10 @@
-import sys, os, glob, csv
+import sys, os, csv
 from pathlib import Path
 
-def parse_stats(fp):
-    out = {}
-    with open(fp, 'r', encoding='utf-8', errors='ignore') as f:
-        for line in f:
-            if ':' in line:
-                k,v = line.split(':',1)
-                out[k.strip()] = v.strip()
-    return out
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from engine.campaign_store import CampaignStore  # noqa: E402
+
+KEYS = ["bitmap_cvg","paths_total","execs_done","execs_per_sec","unique_crashes","unique_hangs"]
 
 def human(name):
     # 예: out/3way_YYMMDD_HHMMSS/base_default/default -> base_default
@@ -20,10 +16,16 @@ def human(name):
 
 def main(root):
     rows = []
-    for inst in sorted(glob.glob(os.path.join(root, "*", "default", "fuzzer_stats"))):
-        s = parse_stats(inst)
+    # 캠페인 저장소에 증분 적재 후 조회 (바뀐 인스턴스만 다시 읽음)
+    with CampaignStore() as db:
+        db.ingest(root)
+        latest = db.latest(KEYS, under=root)
+    for s in latest:
+        rel = os.path.relpath(s["path"], root).split(os.sep)
+        if len(rel) != 2 or rel[1] != "default":
+            continue
         rows.append({
-            "run": human(inst),
+            "run": human(s["path"]),
             "bitmap_cvg": s.get("bitmap_cvg",""),
             "paths_total": int(s.get("paths_total","0")),
             "execs_done": int(s.get("execs_done","0")),
@@ -0,0 +1,385 @@
+# engine/campaign.py
+# Multi-instance afl-fuzz campaign: topology-aware core placement, -M/-S sync
+# groups, and a supervisor that restarts dead instances (AFL_AUTORESUME).
+#
+# A campaign is a matrix of targets × mutators × seed sets. Each cell is one
+# sync group, i.e. one afl-fuzz -o dir holding a -M main plus -S secondaries.
+# Free CPUs come from /sys, minus CPUs already pinned by another process.
+# They are ordered physical cores first (SMT siblings last) and grouped by NUMA
+# node. Each group takes a contiguous slice, so its instances share a node.
+#
+#   cpus = free_cpus(cpu_topology())
+#   plan = plan_campaign(matrix(["json", "yajl"], ["none", "json_adapt"]), cpus, "out/camp")
+#   Supervisor(plan, "out/camp", duration=3600).run()
+import json, os, re, signal, subprocess, sys, time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from engine.stats_watch import read_stats
+
+SYS_CPU = "/sys/devices/system/cpu"
+SYS_NODE = "/sys/devices/system/node"
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 타깃 약칭 → (하니스, 기본 시드, 기본 사전)
+TARGETS = {
+    "json":      ("targets/json/json_asan",      "corpus/min",        "corpus/dict/json.dict"),
+    "jsonc":     ("targets/json/jsonc_asan",     "corpus/min",        "corpus/dict/json.dict"),
+    "rapidjson": ("targets/json/rapidjson_asan", "corpus/min",        "corpus/dict/json.dict"),
+    "yajl":      ("targets/json/yajl_asan",      "corpus/min",        "corpus/dict/json.dict"),
+    "yaml":      ("targets/yaml/yaml_asan",      "corpus/yaml_seeds", "corpus/dict/yaml.dict"),
+}
+
+
+@dataclass
+class Cpu:
+    id: int
+    core: int = 0
+    package: int = 0
+    node: int = 0
+    smt: int = 0          # 같은 물리 코어 안에서의 순번 (0 = 첫 하이퍼스레드)
+
+
+@dataclass
+class Group:
+    name: str
+    target: str           # 하니스 경로
+    mutator: str          # "none" | mutators/<name>.py
+    seeds: str
+    dict: Optional[str] = None
+
+
+@dataclass
+class Instance:
+    group: str
+    name: str             # "m" | "s1" ...
+    role: str             # "M" | "S"
+    cpu: Optional[int]
+    argv: List[str] = field(default_factory=list)
+    env: Dict[str, str] = field(default_factory=dict)
+    out_dir: str = ""
+    log: str = ""
+
+
+# ── topology ────────────────────────────────────────────────────────────────
+def parse_cpulist(s: str) -> List[int]:
+    out = []
+    for part in s.strip().split(","):
+        if not part:
+            continue
+        a, _, b = part.partition("-")
+        out += range(int(a), int(b or a) + 1)
+    return out
+
+
+def _read(path: str, default: str = "") -> str:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return default
+
+
+def cpu_topology(sys_cpu: str = SYS_CPU, sys_node: str = SYS_NODE) -> List[Cpu]:
+    """온라인 CPU 목록 + 코어/패키지/NUMA 노드/SMT 순번 (/sys 없으면 os.cpu_count 기준 평면 구조)."""
+    online = _read(os.path.join(sys_cpu, "online"))
+    ids = parse_cpulist(online) if online else list(range(os.cpu_count() or 1))
+    node_of: Dict[int, int] = {}
+    try:
+        for d in os.listdir(sys_node):
+            m = re.fullmatch(r"node(\d+)", d)
+            if m:
+                for c in parse_cpulist(_read(os.path.join(sys_node, d, "cpulist"))):
+                    node_of[c] = int(m.group(1))
+    except OSError:
+        pass
+    out = []
+    for c in ids:
+        topo = os.path.join(sys_cpu, f"cpu{c}", "topology")
+        sib = parse_cpulist(_read(os.path.join(topo, "thread_siblings_list"), str(c)))
+        out.append(Cpu(
+            id=c,
+            core=int(_read(os.path.join(topo, "core_id"), str(c)) or c),
+            package=int(_read(os.path.join(topo, "physical_package_id"), "0") or 0),
+            node=node_of.get(c, 0),
+            smt=sorted(sib).index(c) if c in sib else 0,
+        ))
+    return out
+
+
+def pinned_cpus(proc: str = "/proc", ignore: Iterable[int] = ()) -> Dict[int, int]:
+    """CPU 하나에만 묶인 사용자 프로세스 → {cpu: pid} (afl-fuzz의 bind_to_free_cpu와 같은 기준).
+    커널 스레드(VmSize 없음)는 per-CPU로 묶여 있으므로 제외."""
+    skip = set(ignore)
+    out: Dict[int, int] = {}
+    try:
+        pids = [int(p) for p in os.listdir(proc) if p.isdigit()]
+    except OSError:
+        return out
+    for pid in pids:
+        if pid in skip:
+            continue
+        txt = _read(os.path.join(proc, str(pid), "status"))
+        if "VmSize:" not in txt:
+            continue
+        m = re.search(r"^Cpus_allowed_list:\s*(\S+)", txt, re.M)
+        if not m:
+            continue
+        cl = parse_cpulist(m.group(1))
+        if len(cl) == 1:
+            out.setdefault(cl[0], pid)
+    return out
+
+
+def free_cpus(topo: List[Cpu], busy: Optional[Iterable[int]] = None, reserve: int = 0) -> List[Cpu]:
+    """배치 순서: SMT 첫 스레드(물리 코어) 먼저, 노드/패키지/코어 순 → 나머지 SMT 형제.
+    reserve개는 시스템/폴러용으로 남김 (순서상 마지막 것부터)."""
+    if busy is None:
+        # CPU가 하나뿐이면 모든 프로세스가 "단독 핀"처럼 보이므로 검사하지 않음
+        busy = pinned_cpus() if len(topo) > 1 else {}
+    busy = set(busy)
+    cpus = sorted((c for c in topo if c.id not in busy), key=lambda c: (c.smt, c.node, c.package, c.core, c.id))
+    if reserve > 0:
+        cpus = cpus[:max(0, len(cpus) - reserve)]
+    return cpus
+
+
+# ── plan ────────────────────────────────────────────────────────────────────
+def resolve_target(name: str):
+    """약칭(json/yajl/...) 또는 하니스 경로 → (경로, 기본 시드, 기본 사전)."""
+    if name in TARGETS:
+        return tuple(os.path.join(ROOT, p) for p in TARGETS[name])
+    return (os.path.abspath(name), os.path.join(ROOT, "corpus/min"), os.path.join(ROOT, "corpus/dict/json.dict"))
+
+
+def matrix(targets: Sequence[str], mutators: Sequence[str], seeds: Sequence[Optional[str]] = (None,),
+           dict_path: Optional[str] = None) -> List[Group]:
+    groups = []
+    for t in targets:
+        path, dseed, ddict = resolve_target(t)
+        tname = t if t in TARGETS else os.path.basename(t)
+        for mu in mutators:
+            for sd in seeds:
+                sd = os.path.abspath(sd) if sd else dseed
+                name = f"{tname}__{mu}"
+                if len(seeds) > 1:
+                    name += "__" + os.path.basename(os.path.normpath(sd))
+                groups.append(Group(name, path, mu, sd, os.path.abspath(dict_path) if dict_path else ddict))
+    return groups
+
+
+def plan_campaign(groups: List[Group], cpus: List[Cpu], out_root: str, per_group: int = 0,
+                  afl_fuzz: str = "afl-fuzz", timeout_ms: int = 200, duration: int = 0,
+                  extra_args: Sequence[str] = (), oversubscribe: bool = False) -> List[Instance]:
+    """그룹마다 연속된 CPU 조각을 배정; 첫 인스턴스 -M, 나머지 -S."""
+    if not groups:
+        return []
+    n = len(cpus)
+    if per_group > 0:
+        sizes = [per_group] * len(groups)
+    else:
+        base, extra = divmod(n, len(groups)) if n else (0, 0)
+        sizes = [base + (1 if i < extra else 0) for i in range(len(groups))]
+    if not oversubscribe:
+        left = n
+        for i, s in enumerate(sizes):
+            sizes[i] = min(s, left)
+            left -= sizes[i]
+    else:
+        sizes = [max(1, s) for s in sizes]
+
+    out: List[Instance] = []
+    k = 0
+    for g, size in zip(groups, sizes):
+        gdir = os.path.join(out_root, g.name)
+        for j in range(size):
+            cpu = cpus[k % n].id if n else None
+            k += 1
+            role, name = ("M", "m") if j == 0 else ("S", f"s{j}")
+            argv = [afl_fuzz, f"-{role}", name, "-i", g.seeds, "-o", gdir, "-m", "none", "-t", str(timeout_ms)]
+            if g.dict and os.path.exists(g.dict):
+                argv += ["-x", g.dict]
+            if duration:
+                argv += ["-V", str(int(duration))]
+            argv += list(extra_args) + ["--", g.target]
+            env = {"AFL_NO_AFFINITY": "1", "AFL_SKIP_CPUFREQ": "1", "AFL_AUTORESUME": "1",
+                   "AFL_NO_UI": "1", "PYTHONPATH": ROOT}
+            if g.mutator != "none":
+                env["AFL_PYTHON_MODULE"] = g.mutator if "." in g.mutator else f"mutators.{g.mutator}"
+                env["AFL_OUT_DIR"] = gdir      # 변이기 사이드카(op_profile.json 등) 위치
+            out.append(Instance(g.name, name, role, cpu, argv, env,
+                                out_dir=os.path.join(gdir, name), log=os.path.join(gdir, f"{name}.log")))
+    return out
+
+
+# ── supervisor ──────────────────────────────────────────────────────────────
+class _Child:
+    def __init__(self, inst: Instance):
+        self.inst = inst
+        self.proc: Optional[subprocess.Popen] = None
+        self.restarts = 0
+        self.started = 0.0
+        self.next_start = 0.0
+        self.done = False        # 정상 종료(-V 만료) 또는 재시작 한도 초과
+        self.last_rc: Optional[int] = None
+
+
+class Supervisor:
+    """afl-fuzz 자식들을 띄우고 감시: 비정상 종료는 지수 백오프로 재시작 (AFL_AUTORESUME으로 이어서)."""
+
+    def __init__(self, plan: List[Instance], out_root: str, duration: int = 0, max_restarts: int = 5,
+                 poller: bool = True, status_every: float = 60.0, log=None):
+        self.plan = plan
+        self.out_root = out_root
+        self.duration = duration
+        self.max_restarts = max_restarts
+        self.status_every = status_every
+        self.log = log or (lambda m: print(m, file=sys.stderr, flush=True))
+        self.children = [_Child(i) for i in plan]
+        self.poller: Optional[subprocess.Popen] = None
+        self.want_poller = poller
+        self._stop = False
+
+    def _spawn(self, ch: _Child) -> None:
+        inst = ch.inst
+        os.makedirs(os.path.dirname(inst.log), exist_ok=True)
+        env = dict(os.environ)
+        env.pop("AFL_PYTHON_MODULE", None)
+        env.update(inst.env)
+        cpu = inst.cpu
+        logf = open(inst.log, "ab")
+        try:
+            ch.proc = subprocess.Popen(
+                inst.argv, env=env, stdin=subprocess.DEVNULL, stdout=logf, stderr=subprocess.STDOUT,
+                cwd=ROOT, start_new_session=True,
+                preexec_fn=(lambda: os.sched_setaffinity(0, {cpu})) if cpu is not None else None)
+        except OSError as e:
+            self.log(f"[campaign] {inst.group}/{inst.name}: spawn failed: {e}")
+            ch.proc = None
+            ch.last_rc = -1
+            self._schedule_restart(ch)
+        finally:
+            logf.close()
+        ch.started = time.monotonic()
+
+    def _schedule_restart(self, ch: _Child) -> None:
+        if ch.restarts >= self.max_restarts:
+            ch.done = True
+            self.log(f"[campaign] {ch.inst.group}/{ch.inst.name}: giving up after {ch.restarts} restarts")
+            return
+        ch.restarts += 1
+        delay = min(60.0, 2.0 ** ch.restarts)
+        ch.next_start = time.monotonic() + delay
+        self.log(f"[campaign] {ch.inst.group}/{ch.inst.name}: exited rc={ch.last_rc}, restart #{ch.restarts} in {delay:.0f}s")
+
+    def _start_poller(self) -> None:
+        env = dict(os.environ, RAGFUZZ_POLL_BASE=self.out_root, PYTHONPATH=ROOT)
+        logf = open(os.path.join(self.out_root, "poller.log"), "ab")
+        try:
+            self.poller = subprocess.Popen([sys.executable, "-u", os.path.join(ROOT, "engine", "reward_poller.py")],
+                                           env=env, stdin=subprocess.DEVNULL, stdout=logf,
+                                           stderr=subprocess.STDOUT, cwd=ROOT, start_new_session=True)
+        finally:
+            logf.close()
+
+    def status(self) -> List[dict]:
+        rows = []
+        for ch in self.children:
+            st = read_stats(os.path.join(ch.inst.out_dir, "fuzzer_stats")) or {}
+            alive = ch.proc is not None and ch.proc.poll() is None
+            rows.append({
+                "group": ch.inst.group, "name": ch.inst.name, "cpu": ch.inst.cpu,
+                "pid": ch.proc.pid if alive else None, "restarts": ch.restarts,
+                "state": "run" if alive else ("done" if ch.done else "wait"),
+                "execs_per_sec": st.get("execs_per_sec", "-"),
+                "corpus": st.get("corpus_count", st.get("paths_total", "-")),
+                "crashes": st.get("saved_crashes", st.get("unique_crashes", "-")),
+            })
+        return rows
+
+    def _print_status(self) -> None:
+        for r in self.status():
+            self.log(f"  {r['group'] + '/' + r['name']:36s} cpu={str(r['cpu']):>3s} {r['state']:4s} "
+                     f"restarts={r['restarts']} execs/s={r['execs_per_sec']} corpus={r['corpus']} crashes={r['crashes']}")
+
+    def write_manifest(self) -> str:
+        path = os.path.join(self.out_root, "campaign.json")
+        os.makedirs(self.out_root, exist_ok=True)
+        with open(path + ".tmp", "w") as f:
+            json.dump({"started": int(time.time()), "duration": self.duration,
+                       "instances": [asdict(i) for i in self.plan]}, f, indent=2)
+        os.replace(path + ".tmp", path)
+        return path
+
+    def stop(self, *_):
+        self._stop = True
+
+    def run(self, poll: float = 1.0) -> int:
+        """모든 인스턴스가 끝나거나(duration) 시그널을 받을 때까지 감시. 재시작 한도를 넘긴 인스턴스 수 반환."""
+        self.write_manifest()
+        old = {s: signal.signal(s, self.stop) for s in (signal.SIGINT, signal.SIGTERM)}
+        deadline = time.monotonic() + self.duration + 30 if self.duration else None
+        try:
+            if self.want_poller:
+                self._start_poller()
+            for ch in self.children:
+                self._spawn(ch)
+            self.log(f"[campaign] {len(self.children)} instances in {len({i.group for i in self.plan})} groups → {self.out_root}")
+            last_status = time.monotonic()
+            while not self._stop:
+                now = time.monotonic()
+                if deadline and now > deadline:
+                    self.log("[campaign] duration elapsed")
+                    break
+                for ch in self.children:
+                    if ch.done:
+                        continue
+                    if ch.proc is None:
+                        if ch.next_start and now >= ch.next_start:
+                            ch.next_start = 0.0
+                            self._spawn(ch)
+                        continue
+                    rc = ch.proc.poll()
+                    if rc is None:
+                        continue
+                    ch.proc, ch.last_rc = None, rc
+                    if rc == 0 and self.duration:
+                        ch.done = True             # -V 만료로 정상 종료
+                    else:
+                        self._schedule_restart(ch)
+                if all(ch.done for ch in self.children):
+                    break
+                if self.want_poller and self.poller is not None and self.poller.poll() is not None:
+                    self.log("[campaign] reward poller exited, restarting")
+                    self._start_poller()
+                if self.status_every and now - last_status >= self.status_every:
+                    last_status = now
+                    self._print_status()
+                time.sleep(poll)
+        finally:
+            self.shutdown()
+            for s, h in old.items():
+                signal.signal(s, h)
+        self._print_status()
+        return sum(1 for ch in self.children if ch.done and ch.last_rc not in (0, None))
+
+    def shutdown(self, grace: float = 10.0) -> None:
+        # afl-fuzz는 SIGINT에 fuzzer_stats/queue를 정리하고 종료
+        procs = [ch.proc for ch in self.children if ch.proc is not None and ch.proc.poll() is None]
+        if self.poller is not None and self.poller.poll() is None:
+            procs.append(self.poller)
+        for p in procs:
+            try:
+                os.killpg(p.pid, signal.SIGTERM if p is self.poller else signal.SIGINT)
+            except OSError:
+                pass
+        end = time.monotonic() + grace
+        for p in procs:
+            try:
+                p.wait(max(0.1, end - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                try:
+                    os.killpg(p.pid, signal.SIGKILL)
+                except OSError:
+                    pass
+                p.wait()
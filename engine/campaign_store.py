@@ -0,0 +1,190 @@
+# engine/campaign_store.py
+# SQLite store of every fuzzer_stats snapshot and plot_data series under out/.
+# ingest() is incremental: an instance whose fuzzer_stats mtime is unchanged
+# is skipped, and plot_data is read from the byte offset saved last time, so
+# reports can call it before every query and only pay for what is new.
+#
+#   db = CampaignStore("reports/campaign.sqlite")
+#   db.ingest("out")
+#   db.latest(["paths_total", "execs_per_sec"], run="3way_*")
+#   db.series(inst_id, ["time", "saved_crashes"])
+import fnmatch, json, os, sqlite3
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from engine.plot_data import PlotData, canon
+from engine.stats_watch import SKIP_DIRS, STATS_NAME, read_stats
+
+DEFAULT_DB = "reports/campaign.sqlite"
+PLOT_COLS = ["time", "cycles_done", "cur_item", "corpus_count", "pending_total", "pending_favs",
+             "map_size", "saved_crashes", "saved_hangs", "max_depth", "execs_per_sec",
+             "total_execs", "edges_found", "total_crashes", "servers_count"]
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS instances(
+  id INTEGER PRIMARY KEY, path TEXT UNIQUE, run TEXT, instance TEXT,
+  stats_mtime INTEGER DEFAULT 0, latest_snap INTEGER,
+  plot_state TEXT DEFAULT '{{}}', plot_rows INTEGER DEFAULT 0);
+CREATE INDEX IF NOT EXISTS instances_run ON instances(run);
+CREATE TABLE IF NOT EXISTS snapshots(
+  id INTEGER PRIMARY KEY, inst INTEGER, mtime INTEGER, UNIQUE(inst, mtime));
+CREATE TABLE IF NOT EXISTS stats(
+  snap INTEGER, key TEXT, val TEXT, num REAL, PRIMARY KEY(snap, key)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS stats_key ON stats(key, num);
+CREATE TABLE IF NOT EXISTS plot(
+  inst INTEGER, row INTEGER, {", ".join(c + " REAL" for c in PLOT_COLS)},
+  PRIMARY KEY(inst, row)) WITHOUT ROWID;
+"""
+
+
+def _num(v: str) -> Optional[float]:
+    v = v.strip().rstrip("%")
+    try:
+        return float(v)
+    except ValueError:
+        return None
+
+
+def run_of(path: str):
+    """(run, instance): out/<run>/<instance...> 기준, out 밖이면 (상위 폴더, 폴더)."""
+    parts = os.path.abspath(path).split(os.sep)
+    if "out" in parts[:-1]:
+        i = len(parts) - 1 - parts[::-1].index("out")
+        if i + 1 < len(parts):
+            return parts[i + 1], "/".join(parts[i + 2:]) or "."
+    return parts[-2] if len(parts) > 1 else "", parts[-1]
+
+
+def find_instances(root: str) -> List[str]:
+    """root 아래 fuzzer_stats가 있는 디렉터리 (queue/crashes 등은 내려가지 않음)."""
+    out = []
+    for d, dirs, files in os.walk(root):
+        dirs[:] = sorted(x for x in dirs if x not in SKIP_DIRS)
+        if STATS_NAME in files:
+            out.append(d)
+    return out
+
+
+class CampaignStore:
+    def __init__(self, path: str = DEFAULT_DB):
+        self.path = path
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "CampaignStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ── ingest ──────────────────────────────────────────────────────────────
+    def _inst(self, path: str) -> sqlite3.Row:
+        path = os.path.abspath(path)
+        row = self.db.execute("SELECT * FROM instances WHERE path=?", (path,)).fetchone()
+        if row is None:
+            run, inst = run_of(path)
+            self.db.execute("INSERT INTO instances(path, run, instance) VALUES (?,?,?)", (path, run, inst))
+            row = self.db.execute("SELECT * FROM instances WHERE path=?", (path,)).fetchone()
+        return row
+
+    def _ingest_stats(self, row: sqlite3.Row, d: str) -> int:
+        p = os.path.join(d, STATS_NAME)
+        try:
+            mtime = os.stat(p).st_mtime_ns
+        except OSError:
+            return 0
+        if mtime == row["stats_mtime"]:
+            return 0
+        st = read_stats(p)
+        if not st:
+            return 0
+        cur = self.db.execute("INSERT OR IGNORE INTO snapshots(inst, mtime) VALUES (?,?)", (row["id"], mtime))
+        if not cur.rowcount:
+            return 0
+        snap = cur.lastrowid
+        self.db.executemany("INSERT INTO stats(snap, key, val, num) VALUES (?,?,?,?)",
+                            [(snap, k, v, _num(v)) for k, v in st.items()])
+        self.db.execute("UPDATE instances SET stats_mtime=?, latest_snap=? WHERE id=?", (mtime, snap, row["id"]))
+        return 1
+
+    def _ingest_plot(self, row: sqlite3.Row, d: str) -> int:
+        pd = PlotData(os.path.join(d, "plot_data"))
+        pd.restore(json.loads(row["plot_state"] or "{}"))
+        resets = pd.resets
+        n = pd.update()
+        base = row["plot_rows"]
+        if pd.resets != resets:                 # 파일이 새로 만들어짐/잘림
+            self.db.execute("DELETE FROM plot WHERE inst=?", (row["id"],))
+            base = 0
+        if n:
+            cols = [list(pd.col(c)) if canon(c) in pd.columns else [None] * n for c in PLOT_COLS]
+            q = f"INSERT OR REPLACE INTO plot(inst, row, {', '.join(PLOT_COLS)}) VALUES ({', '.join('?' * (len(PLOT_COLS) + 2))})"
+            self.db.executemany(q, [(row["id"], base + i, *(None if v != v else v for v in vals))
+                                    for i, vals in enumerate(zip(*cols))])
+        self.db.execute("UPDATE instances SET plot_state=?, plot_rows=? WHERE id=?",
+                        (json.dumps(pd.state()), base + n, row["id"]))
+        return n
+
+    def ingest(self, root: str = "out") -> Dict[str, int]:
+        """root 아래 모든 인스턴스를 적재; 바뀐 것만 읽음."""
+        res = {"instances": 0, "snapshots": 0, "plot_rows": 0}
+        with self.db:
+            for d in find_instances(root):
+                row = self._inst(d)
+                res["instances"] += 1
+                res["snapshots"] += self._ingest_stats(row, d)
+                res["plot_rows"] += self._ingest_plot(row, d)
+        return res
+
+    # ── queries ─────────────────────────────────────────────────────────────
+    def instance(self, path: str) -> Optional[sqlite3.Row]:
+        return self.db.execute("SELECT * FROM instances WHERE path=?", (os.path.abspath(path),)).fetchone()
+
+    def instances(self, under: Optional[str] = None, run: Optional[str] = None) -> List[sqlite3.Row]:
+        rows = self.db.execute("SELECT * FROM instances ORDER BY run, instance").fetchall()
+        if under is not None:
+            top = os.path.abspath(under).rstrip(os.sep)
+            rows = [r for r in rows if r["path"] == top or r["path"].startswith(top + os.sep)]
+        if run is not None:
+            rows = [r for r in rows if fnmatch.fnmatchcase(r["run"], run)]
+        return rows
+
+    def latest(self, keys: Sequence[str], under: Optional[str] = None,
+               run: Optional[str] = None) -> List[Dict[str, object]]:
+        """인스턴스별 최신 fuzzer_stats 스냅샷: {id, run, instance, path, <key>: 문자열 값}."""
+        insts = self.instances(under, run)
+        out = []
+        ph = ", ".join("?" * len(keys))
+        for r in insts:
+            d = {"id": r["id"], "run": r["run"], "instance": r["instance"], "path": r["path"]}
+            if r["latest_snap"] is not None and keys:
+                for k, v in self.db.execute(f"SELECT key, val FROM stats WHERE snap=? AND key IN ({ph})",
+                                            (r["latest_snap"], *keys)):
+                    d[k] = v
+            out.append(d)
+        return out
+
+    def series(self, inst: int, cols: Iterable[str]) -> Dict[str, List[float]]:
+        cols = [canon(c) for c in cols]
+        bad = [c for c in cols if c not in PLOT_COLS]
+        if bad:
+            raise KeyError(f"unknown plot columns: {bad}")
+        rows = self.db.execute(f"SELECT {', '.join(cols)} FROM plot WHERE inst=? ORDER BY row", (inst,)).fetchall()
+        return {c: [r[i] for r in rows] for i, c in enumerate(cols)}
+
+    def last_plot(self, inst: int) -> Optional[Dict[str, float]]:
+        r = self.db.execute(f"SELECT {', '.join(PLOT_COLS)} FROM plot WHERE inst=? ORDER BY row DESC LIMIT 1",
+                            (inst,)).fetchone()
+        return None if r is None else {c: r[c] for c in PLOT_COLS if r[c] is not None}
+
+    def ttfc(self, inst: int) -> Optional[float]:
+        """첫 크래시까지 걸린 시간(초), 크래시가 없으면 None."""
+        r = self.db.execute("SELECT MIN(time) AS t0, MIN(CASE WHEN saved_crashes > 0 THEN time END) AS t1 "
+                            "FROM plot WHERE inst=?", (inst,)).fetchone()
+        return None if r is None or r["t1"] is None else r["t1"] - r["t0"]
@@ -0,0 +1,203 @@
+# engine/corpus_min.py
+# Coverage-guided corpus distillation (afl-cmin style, in Python).
+# Each seed runs once per target through an Executor(coverage=True). Its edge
+# map is bucketed into AFL hit-count classes, and the (edge, bucket) tuples are
+# cached on disk by input sha1, per target build. Re-minimizing after new seeds
+# arrive therefore only executes the new files. Selection is a greedy set cover
+# over the union of every target's tuples: the seed with the most uncovered
+# tuples is taken first, and the smaller file wins ties.
+#
+#   cov = collect([...paths], ["targets/json/json_asan", ...], jobs=8)
+#   keep = minimize(cov)       # → [path, ...]
+import hashlib, heapq, json, os, re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from engine.crash_triage import target_id
+from engine.executor import DEFAULT_ASAN, Executor
+
+DEFAULT_CACHE = "corpus/.cmin_cache.jsonl"
+# AFL count_class_lookup8: 히트 수 → 버킷(1,2,3,4-7,8-15,16-31,32-127,128+) 번호 1..8
+_BUCKET = bytes([0, 1, 2, 3] + [4] * 4 + [5] * 8 + [6] * 16 + [7] * 96 + [8] * 128)
+_NONZERO = re.compile(rb"[^\x00]")
+
+_WORKER: Dict[str, object] = {}
+
+
+def tuples(trace: bytes) -> List[int]:
+    """엣지 맵 → 정렬된 튜플 id 목록 (edge*8 + bucket-1)."""
+    cls = trace.translate(_BUCKET)
+    return [m.start() * 8 + cls[m.start()] - 1 for m in _NONZERO.finditer(cls)]
+
+
+def _worker_init(targets: Sequence[str], timeout_ms: int, asan: str) -> None:
+    env = os.environ.copy()
+    env["ASAN_OPTIONS"] = asan
+    _WORKER["ex"] = [Executor(t, timeout_ms=timeout_ms, env=env, coverage=True) for t in targets]
+
+
+def _worker_close() -> None:
+    for ex in _WORKER.pop("ex", []):
+        ex.close()
+
+
+def _measure(job):
+    """(sha1, path, [타깃 번호]) → [(타깃 번호, {status, tuples})]."""
+    sha, path, idxs = job
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        return sha, [(i, {"status": "error", "tuples": [], "err": str(e)[:80]}) for i in idxs]
+    out = []
+    for i in idxs:
+        try:
+            r = _WORKER["ex"][i].run(data)
+        except Exception as e:
+            out.append((i, {"status": "error", "tuples": [], "err": str(e)[:80]}))
+            continue
+        out.append((i, {"status": r.status, "tuples": tuples(r.trace) if r.trace else []}))
+    return sha, out
+
+
+class CoverageCache:
+    """jsonl 인덱스: 한 줄 = (입력 sha1, 타깃 빌드) 하나의 상태 + 튜플 목록."""
+
+    def __init__(self, path: str, targets: Sequence[str]):
+        self.path = path
+        self.tids = [target_id(t) for t in targets]
+        want = set(self.tids)
+        self.recs: Dict[tuple, dict] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue
+                    if rec.get("target") in want:
+                        self.recs[(rec["target"], rec["sha1"])] = rec
+        except FileNotFoundError:
+            pass
+
+    def get(self, idx: int, sha: str) -> Optional[dict]:
+        return self.recs.get((self.tids[idx], sha))
+
+    def add(self, recs: Iterable[dict]) -> None:
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for rec in recs:
+                self.recs[(rec["target"], rec["sha1"])] = rec
+                f.write(json.dumps(rec, sort_keys=True, separators=(",", ":")) + "\n")
+
+
+def collect(paths: Iterable[str], targets: Sequence[str], jobs: int = 0, timeout_ms: int = 1000,
+            cache_path: Optional[str] = DEFAULT_CACHE, asan: str = DEFAULT_ASAN,
+            log=None) -> Dict[str, dict]:
+    """path → {sha1, size, status, cov: [타깃별 튜플 목록]}. 캐시에 있는 (입력, 타깃)은 재실행하지 않음."""
+    cache = CoverageCache(cache_path, targets) if cache_path else None
+    fresh: Dict[tuple, dict] = {}
+    meta: Dict[str, tuple] = {}
+    todo: Dict[str, tuple] = {}
+    for p in paths:
+        try:
+            with open(p, "rb") as f:
+                data = f.read()
+        except OSError:
+            continue
+        sha = hashlib.sha1(data).hexdigest()
+        meta[p] = (sha, len(data))
+        if sha in todo:
+            continue
+        idxs = [i for i in range(len(targets)) if cache is None or cache.get(i, sha) is None]
+        if idxs:
+            todo[sha] = (p, idxs)
+
+    if todo:
+        jobs = jobs or os.cpu_count() or 1
+        work = [(sha, p, idxs) for sha, (p, idxs) in todo.items()]
+        if log:
+            log(f"[i] tracing {len(work)} new inputs ({len(meta) - len(work)} cached or duplicate) "
+                f"on {len(targets)} target(s), {jobs} workers")
+        tids = [target_id(t) for t in targets]
+        if jobs == 1:
+            _worker_init(targets, timeout_ms, asan)
+            try:
+                results = list(map(_measure, work))
+            finally:
+                _worker_close()
+        else:
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_worker_init,
+                                     initargs=(list(targets), timeout_ms, asan)) as pool:
+                results = list(pool.map(_measure, work, chunksize=max(1, len(work) // (jobs * 8))))
+        for sha, runs in results:
+            for i, rec in runs:
+                fresh[(i, sha)] = dict(rec, sha1=sha, target=tids[i])
+        if cache is not None:
+            cache.add(fresh.values())
+
+    out = {}
+    for p, (sha, size) in meta.items():
+        cov, status = [], "ok"
+        for i in range(len(targets)):
+            rec = fresh.get((i, sha)) or (cache.get(i, sha) if cache else None)
+            if rec is None:
+                rec = {"status": "error", "tuples": []}
+            if rec["status"] != "ok" and status == "ok":
+                status = rec["status"]
+            cov.append(rec["tuples"])
+        out[p] = {"sha1": sha, "size": size, "status": status, "cov": cov}
+    return out
+
+
+def _bitset(cov: List[List[int]], widths: List[int]) -> int:
+    # 타깃별 튜플 공간을 이어 붙인 하나의 비트셋
+    v, off = 0, 0
+    for ts, w in zip(cov, widths):
+        for t in ts:
+            v |= 1 << (off + t)
+        off += w
+    return v
+
+
+def minimize(results: Dict[str, dict], include_crashes: bool = False) -> List[str]:
+    """모든 튜플을 덮는 작은 부분집합 (lazy greedy set cover). 같은 내용은 하나만."""
+    uniq: Dict[str, str] = {}
+    for p in sorted(results, key=lambda p: (results[p]["size"], p)):
+        r = results[p]
+        if r["status"] != "ok" and not (include_crashes and r["status"] == "crash"):
+            continue
+        uniq.setdefault(r["sha1"], p)
+    if not uniq:
+        return []
+    n_t = len(next(iter(results.values()))["cov"])
+    widths = [1 + max((max(results[p]["cov"][i], default=-1) for p in uniq.values()), default=-1)
+              for i in range(n_t)]
+    sets = {p: _bitset(results[p]["cov"], widths) for p in uniq.values()}
+
+    # 힙 항목: (-이득, 크기, 경로) — 이득은 선택이 진행될수록 줄기만 하므로 꺼낼 때 재계산
+    heap = [(-v.bit_count(), results[p]["size"], p) for p, v in sets.items() if v]
+    heapq.heapify(heap)
+    covered, keep = 0, []
+    while heap:
+        neg, size, p = heapq.heappop(heap)
+        gain = (sets[p] & ~covered).bit_count()
+        if gain == 0:
+            continue
+        if gain != -neg:
+            heapq.heappush(heap, (-gain, size, p))
+            continue
+        keep.append(p)
+        covered |= sets[p]
+    return keep
+
+
+def tuple_count(results: Dict[str, dict], paths: Iterable[str]) -> int:
+    """paths가 덮는 (타깃, 튜플) 수."""
+    seen = set()
+    for p in paths:
+        for i, ts in enumerate(results[p]["cov"]):
+            seen.update((i, t) for t in ts)
+    return len(seen)
@@ -0,0 +1,202 @@
+# engine/crash_triage.py
+# Crash reproduction + stack-signature clustering.
+# Each worker process keeps one Executor (forkserver) per target; results are
+# cached on disk by input sha1 (per target build), so re-running over a growing
+# crashes/ directory only reproduces new files.
+#
+#   res = triage([...paths], "targets/json/json_asan", jobs=8)
+#   clusters = cluster(res)     # → reports/triage.json rows
+import hashlib, json, os, re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from engine.executor import Executor
+
+DEFAULT_ASAN = "abort_on_error=1:symbolize=0:detect_leaks=0:handle_segv=1"
+# "#3 0x4f3a2b in json_loadb /src/load.c:123:5" / "#3 0x4f3a2b  (/bin/json_asan+0x4f3a2b)"
+_FRAME_RE = re.compile(rb"^\s*#(\d+)\s+0x[0-9a-fA-F]+\s+(?:in\s+(\S+)(?:\s+(\S+))?)?\s*(?:\(([^)]*)\))?")
+_KIND_RE = re.compile(rb"ERROR: AddressSanitizer: ([\w-]+)")
+# 새니타이저 런타임/libc 프레임은 크래시 위치가 아님
+_SKIP_FUNCS = ("__asan", "__sanitizer", "__interceptor", "__interception", "___interceptor",
+               "__libc_", "abort", "raise", "__GI_", "__pthread_kill", "pthread_kill")
+_SKIP_MODS = ("libclang_rt.", "libasan", "libc.so", "libc-", "libstdc++", "ld-linux")
+
+_WORKER: Dict[str, object] = {}
+
+
+def target_id(target: str) -> str:
+    """타깃 빌드 식별자: 재빌드되면 캐시가 자동으로 무효화됨."""
+    st = os.stat(target)
+    return f"{os.path.basename(target)}:{st.st_size}:{int(st.st_mtime)}"
+
+
+def _norm_frame(func: Optional[bytes], loc: Optional[bytes], mod: Optional[bytes]) -> Optional[str]:
+    if func:
+        f = func.decode("utf-8", "replace")
+        if f.startswith(_SKIP_FUNCS):
+            return None
+        # 소스 위치는 파일명:줄만 (경로/열 번호 제거)
+        if loc and b":" in loc:
+            parts = os.path.basename(loc.decode("utf-8", "replace")).split(":")
+            return f"{f}@{parts[0]}:{parts[1]}" if len(parts) > 1 else f
+        return f
+    if mod:
+        m = os.path.basename(mod.decode("utf-8", "replace"))
+        if m.startswith(_SKIP_MODS):
+            return None
+        return m
+    return None
+
+
+def stack_signature(stderr: bytes, top: int = 5) -> Dict[str, object]:
+    """ASAN 리포트에서 (kind, 상위 top개 정규화 프레임) 추출. 첫 번째 스택만 사용."""
+    kind = ""
+    m = _KIND_RE.search(stderr)
+    if m:
+        kind = m.group(1).decode("ascii", "replace")
+    frames: List[str] = []
+    seen_first = False
+    for ln in stderr.splitlines():
+        fm = _FRAME_RE.match(ln)
+        if not fm:
+            if seen_first and frames and not ln.strip():
+                break                  # 첫 스택 끝 (이후는 alloc/free 스택)
+            continue
+        if fm.group(1) == b"0" and seen_first:
+            break
+        seen_first = True
+        f = _norm_frame(fm.group(2), fm.group(3), fm.group(4))
+        if f and len(frames) < top:
+            frames.append(f)
+    return {"kind": kind, "frames": frames}
+
+
+def _sig_hash(rec: Dict[str, object]) -> str:
+    if rec["status"] != "crash":
+        key = rec["status"]
+    elif rec["frames"] or rec["kind"]:
+        key = rec["kind"] + "|" + "|".join(rec["frames"])
+    else:
+        key = f"signal{rec['signal']}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+
+def _worker_init(target: str, timeout_ms: int, asan: str) -> None:
+    env = os.environ.copy()
+    env["ASAN_OPTIONS"] = asan
+    _WORKER["ex"] = Executor(target, timeout_ms=timeout_ms, env=env, capture_stderr=True)
+
+
+def _reproduce(job):
+    sha, path, top = job
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        r = _WORKER["ex"].run(data)
+    except Exception as e:
+        return {"sha1": sha, "status": "error", "signal": None, "kind": str(e)[:80], "frames": []}
+    rec = {"sha1": sha, "status": r.status, "signal": r.signal}
+    rec.update(stack_signature(r.stderr, top) if r.status == "crash" else {"kind": "", "frames": []})
+    return rec
+
+
+class TriageCache:
+    """jsonl 인덱스: 한 줄 = 입력 하나의 재현 결과 (target 빌드별)."""
+
+    def __init__(self, path: str, target: str):
+        self.path = path
+        self.tid = target_id(target)
+        self.recs: Dict[str, dict] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue
+                    if rec.get("target") == self.tid:
+                        self.recs[rec["sha1"]] = rec
+        except FileNotFoundError:
+            pass
+
+    def get(self, sha: str) -> Optional[dict]:
+        return self.recs.get(sha)
+
+    def add(self, recs: Iterable[dict]) -> None:
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for rec in recs:
+                rec = dict(rec, target=self.tid)
+                self.recs[rec["sha1"]] = rec
+                f.write(json.dumps(rec, sort_keys=True) + "\n")
+
+
+def _sha1_file(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def triage(paths: Iterable[str], target: str, jobs: int = 0, timeout_ms: int = 2000,
+           top: int = 5, cache_path: Optional[str] = None, asan: str = DEFAULT_ASAN,
+           log=None) -> Dict[str, dict]:
+    """path → 재현 결과(+sig). 캐시에 있는 입력은 재실행하지 않음."""
+    cache = TriageCache(cache_path, target) if cache_path else None
+    by_path: Dict[str, str] = {}
+    todo: Dict[str, str] = {}
+    for p in paths:
+        sha = _sha1_file(p)
+        if sha is None:
+            continue
+        by_path[p] = sha
+        if (cache is None or cache.get(sha) is None) and sha not in todo:
+            todo[sha] = p
+
+    fresh: Dict[str, dict] = {}
+    if todo:
+        jobs = jobs or os.cpu_count() or 1
+        work = [(sha, p, top) for sha, p in todo.items()]
+        if log:
+            log(f"[i] reproducing {len(work)} new inputs ({len(by_path) - len(work)} cached or duplicate), {jobs} workers")
+        if jobs == 1:
+            _worker_init(target, timeout_ms, asan)
+            results = map(_reproduce, work)
+            for rec in results:
+                fresh[rec["sha1"]] = rec
+            _WORKER.pop("ex").close()
+        else:
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_worker_init,
+                                     initargs=(target, timeout_ms, asan)) as pool:
+                for rec in pool.map(_reproduce, work, chunksize=max(1, len(work) // (jobs * 8))):
+                    fresh[rec["sha1"]] = rec
+        for rec in fresh.values():
+            rec["sig"] = _sig_hash(rec)
+        if cache is not None:
+            cache.add(fresh.values())
+
+    out = {}
+    for p, sha in by_path.items():
+        rec = fresh.get(sha) or (cache.get(sha) if cache else None)
+        if rec is not None:
+            out[p] = rec
+    return out
+
+
+def cluster(results: Dict[str, dict], samples: int = 3) -> List[dict]:
+    """reports/triage.json 형식: [{hash,count,samples,kind,status,signal,frames}], 큰 클러스터 먼저."""
+    groups: Dict[str, dict] = {}
+    for p in sorted(results):
+        rec = results[p]
+        g = groups.setdefault(rec["sig"], {
+            "hash": rec["sig"], "count": 0, "samples": [],
+            "status": rec["status"], "kind": rec["kind"], "signal": rec["signal"],
+            "frames": rec["frames"],
+        })
+        g["count"] += 1
+        if len(g["samples"]) < samples:
+            g["samples"].append(p)
+    return sorted(groups.values(), key=lambda g: (-g["count"], g["hash"]))
@@ -0,0 +1,324 @@
+# engine/executor.py
+# Reusable target executor: keeps an AFL++ forkserver (and, for
+# ##SIG_AFL_PERSISTENT## binaries, the persistent child) alive and feeds it
+# inputs through a stdin file, instead of fork+exec'ing the target per input.
+# Falls back to one subprocess per input for non-instrumented binaries.
+#
+#   with Executor("targets/json/json_asan", timeout_ms=60) as ex:
+#       r = ex.run(b'{"a":1}')
+#       r.status   # "ok" | "crash" | "timeout" | "error"
+#       r.signal   # terminating signal (crash) or None
+#       r.exit_code
+#
+#   Executor(..., coverage=True) additionally hands the target a SysV shm
+#   edge map (__AFL_SHM_ID) and returns it as r.trace (raw hit counts).
+import ctypes, os, select, signal, struct, subprocess, tempfile, time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, Optional
+
+FORKSRV_FD = 198
+# AFL++ forkserver option bits (classic handshake)
+FS_OPT_ENABLED = 0x80000001
+FS_OPT_MAPSIZE = 0x40000000
+FS_OPT_GET_MAPSIZE = lambda x: ((x & 0x00fffffe) >> 1) + 1  # noqa: E731
+
+SIG_PERSISTENT = b"##SIG_AFL_PERSISTENT##"
+SIG_DEFER = b"##SIG_AFL_DEFER_FORKSRV##"
+DEFAULT_ASAN = "abort_on_error=1:symbolize=0:detect_leaks=0:handle_segv=1"
+DEFAULT_MAP_SIZE = 1 << 16
+SHM_ENV_VAR = "__AFL_SHM_ID"
+IPC_PRIVATE, IPC_CREAT, IPC_EXCL, IPC_RMID = 0, 0o1000, 0o2000, 0
+_U32 = struct.Struct("<I")
+_I32 = struct.Struct("<i")
+
+
+@dataclass
+class RunResult:
+    status: str                      # ok | crash | timeout | error
+    exit_code: Optional[int] = None
+    signal: Optional[int] = None
+    stderr: bytes = b""
+    elapsed_ms: float = 0.0
+    trace: Optional[bytes] = None    # coverage=True일 때 엣지 히트 카운트 맵
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+def _scan_signatures(path: str) -> Dict[str, bool]:
+    try:
+        with open(path, "rb") as f:
+            blob = f.read()
+    except OSError:
+        return {"persistent": False, "defer": False}
+    return {"persistent": SIG_PERSISTENT in blob, "defer": SIG_DEFER in blob}
+
+
+class ForkserverError(RuntimeError):
+    pass
+
+
+class SharedMap:
+    """afl-fuzz와 같은 방식의 SysV 공유메모리 커버리지 맵 (ctypes로 shmget/shmat)."""
+
+    _libc = None
+
+    def __init__(self, size: int):
+        if SharedMap._libc is None:
+            libc = ctypes.CDLL(None, use_errno=True)
+            libc.shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+            libc.shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+            libc.shmat.restype = ctypes.c_void_p
+            libc.shmdt.argtypes = [ctypes.c_void_p]
+            libc.shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+            SharedMap._libc = libc
+        self.size = int(size)
+        self.addr = None
+        self.shm_id = self._libc.shmget(IPC_PRIVATE, self.size, IPC_CREAT | IPC_EXCL | 0o600)
+        if self.shm_id < 0:
+            e = ctypes.get_errno()
+            raise OSError(e, "shmget: " + os.strerror(e))
+        addr = self._libc.shmat(self.shm_id, None, 0)
+        if addr is None or addr == ctypes.c_void_p(-1).value:
+            e = ctypes.get_errno()
+            self._libc.shmctl(self.shm_id, IPC_RMID, None)
+            raise OSError(e, "shmat: " + os.strerror(e))
+        self.addr = addr
+        # 바로 삭제 표시: 붙어 있는 프로세스가 모두 떨어지면 커널이 회수
+        # (Linux는 삭제 표시된 세그먼트에도 shmat 허용 → 워커가 비정상 종료해도 누수 없음)
+        self._libc.shmctl(self.shm_id, IPC_RMID, None)
+
+    def clear(self) -> None:
+        ctypes.memset(self.addr, 0, self.size)
+
+    def read(self, n: Optional[int] = None) -> bytes:
+        return ctypes.string_at(self.addr, min(self.size, n or self.size))
+
+    def close(self) -> None:
+        if self.addr is not None:
+            self._libc.shmdt(self.addr)
+            self.addr = None
+
+
+class Executor:
+    def __init__(self, target: str, args: Iterable[str] = (), timeout_ms: int = 1000,
+                 env: Optional[Dict[str, str]] = None, capture_stderr: bool = False,
+                 use_forkserver: bool = True, coverage: bool = False):
+        self.target = target
+        self.argv = [target] + list(args)
+        self.timeout = max(1, int(timeout_ms)) / 1000.0
+        self.capture_stderr = capture_stderr
+        self.env = dict(os.environ if env is None else env)
+        self.env.setdefault("ASAN_OPTIONS", DEFAULT_ASAN)
+        self.map_size = 0
+        self.execs = 0
+        self._fs_pid = None
+        self._ctl = self._st = None
+        self._was_killed = 0
+        self._in = self._err = None
+        self.shm: Optional[SharedMap] = None
+        if coverage:
+            self._attach_map(max(DEFAULT_MAP_SIZE, int(self.env.get("AFL_MAP_SIZE") or 0)))
+        sig = _scan_signatures(target)
+        self.persistent = sig["persistent"]
+        self.defer = sig["defer"]
+        self.mode = "subprocess"
+        if use_forkserver:
+            try:
+                self._start_forkserver()
+                if self.shm is not None and self.map_size > self.shm.size:
+                    # 타깃 맵이 더 크면 그 크기로 다시 붙여서 재시작
+                    self._stop_forkserver()
+                    self._attach_map(self.map_size)
+                    self._start_forkserver()
+                self.mode = "persistent" if self.persistent else "forkserver"
+            except (OSError, ForkserverError):
+                self._stop_forkserver()
+
+    def _attach_map(self, size: int) -> None:
+        if self.shm is not None:
+            self.shm.close()
+        self.shm = SharedMap(size)
+        self.env[SHM_ENV_VAR] = str(self.shm.shm_id)
+        self.env["AFL_MAP_SIZE"] = str(size)
+
+    # ── forkserver ──────────────────────────────────────────────────────────
+    def _read_u32(self, timeout: float) -> Optional[int]:
+        r, _, _ = select.select([self._st], [], [], max(0.0, timeout))
+        if not r:
+            return None
+        b = os.read(self._st, 4)
+        if len(b) != 4:
+            raise ForkserverError("forkserver pipe closed")
+        return _U32.unpack(b)[0]
+
+    def _start_forkserver(self) -> None:
+        tmpdir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        fd, path = tempfile.mkstemp(prefix="ragfuzz_in_", dir=tmpdir)
+        os.unlink(path)
+        self._in = fd
+        if self.capture_stderr:
+            fd, path = tempfile.mkstemp(prefix="ragfuzz_err_", dir=tmpdir)
+            os.unlink(path)
+            self._err = fd
+        ctl_r, ctl_w = os.pipe()
+        st_r, st_w = os.pipe()
+        env = dict(self.env)
+        if self.persistent:
+            env["__AFL_PERSISTENT"] = "1"
+        if self.defer:
+            env["__AFL_DEFER_FORKSRV"] = "1"
+        devnull = os.open(os.devnull, os.O_RDWR)
+        actions = [
+            (os.POSIX_SPAWN_DUP2, ctl_r, FORKSRV_FD),
+            (os.POSIX_SPAWN_DUP2, st_w, FORKSRV_FD + 1),
+            (os.POSIX_SPAWN_DUP2, self._in, 0),
+            (os.POSIX_SPAWN_DUP2, devnull, 1),
+            (os.POSIX_SPAWN_DUP2, self._err if self._err is not None else devnull, 2),
+        ]
+        try:
+            self._fs_pid = os.posix_spawn(self.target, self.argv, env, file_actions=actions)
+        finally:
+            for fd in (ctl_r, st_w, devnull):
+                os.close(fd)
+        self._ctl, self._st = ctl_w, st_r
+
+        status = self._read_u32(max(10.0, self.timeout * 10))
+        if status is None:
+            raise ForkserverError("no forkserver handshake")
+        if (status & 0xffffff00) == 0x41464c00:
+            raise ForkserverError("unsupported forkserver protocol version")
+        if (status & FS_OPT_ENABLED) == FS_OPT_ENABLED:
+            if status & FS_OPT_MAPSIZE:
+                self.map_size = FS_OPT_GET_MAPSIZE(status)
+            # 공유메모리 입력/autodict는 쓰지 않음: 0 응답 → stdin 폴백 경로
+            os.write(self._ctl, _U32.pack(0))
+
+    def _stop_forkserver(self) -> None:
+        if self._fs_pid:
+            try:
+                os.kill(self._fs_pid, signal.SIGKILL)
+                os.waitpid(self._fs_pid, 0)
+            except OSError:
+                pass
+        self._fs_pid = None
+        for fd in (self._ctl, self._st, self._in, self._err):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._ctl = self._st = self._in = self._err = None
+
+    def _run_forkserver(self, data: bytes) -> RunResult:
+        os.ftruncate(self._in, 0)
+        os.pwrite(self._in, data, 0)
+        os.lseek(self._in, 0, os.SEEK_SET)
+        if self._err is not None:
+            os.ftruncate(self._err, 0)
+            os.lseek(self._err, 0, os.SEEK_SET)
+
+        if self.shm is not None:
+            self.shm.clear()
+
+        t0 = time.monotonic()
+        os.write(self._ctl, _U32.pack(self._was_killed))
+        self._was_killed = 0
+        pid = self._read_u32(self.timeout * 10 + 1.0)
+        if pid is None:
+            raise ForkserverError("no child pid from forkserver")
+        pid = _I32.unpack(_U32.pack(pid))[0]
+        if pid <= 0:
+            raise ForkserverError("forkserver failed to fork")
+
+        status = self._read_u32(self.timeout)
+        timed_out = status is None
+        if timed_out:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+            self._was_killed = 1
+            status = self._read_u32(self.timeout * 10 + 1.0)
+            if status is None:
+                raise ForkserverError("forkserver stopped responding")
+        ms = (time.monotonic() - t0) * 1000.0
+        self.execs += 1
+
+        err = b""
+        if self._err is not None:
+            err = os.pread(self._err, 1 << 20, 0)
+        if timed_out:
+            return RunResult("timeout", stderr=err, elapsed_ms=ms, trace=self._trace())
+        if os.WIFSTOPPED(status):            # 퍼시스턴트 반복 1회 종료
+            return RunResult("ok", exit_code=0, stderr=err, elapsed_ms=ms, trace=self._trace())
+        if os.WIFSIGNALED(status):
+            return RunResult("crash", signal=os.WTERMSIG(status), stderr=err, elapsed_ms=ms,
+                             trace=self._trace())
+        return RunResult("ok", exit_code=os.WEXITSTATUS(status), stderr=err, elapsed_ms=ms,
+                         trace=self._trace())
+
+    def _trace(self) -> Optional[bytes]:
+        if self.shm is None:
+            return None
+        return self.shm.read(self.map_size or None)
+
+    # ── subprocess fallback ─────────────────────────────────────────────────
+    def _run_subprocess(self, data: bytes) -> RunResult:
+        if self.shm is not None:
+            self.shm.clear()
+        t0 = time.monotonic()
+        try:
+            p = subprocess.run(self.argv, input=data, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.PIPE if self.capture_stderr else subprocess.DEVNULL,
+                               env=self.env, timeout=self.timeout, check=False)
+        except subprocess.TimeoutExpired:
+            return RunResult("timeout", elapsed_ms=(time.monotonic() - t0) * 1000.0, trace=self._trace())
+        except OSError:
+            return RunResult("error")
+        ms = (time.monotonic() - t0) * 1000.0
+        self.execs += 1
+        err = p.stderr or b""
+        if p.returncode < 0:
+            return RunResult("crash", signal=-p.returncode, stderr=err, elapsed_ms=ms, trace=self._trace())
+        return RunResult("ok", exit_code=p.returncode, stderr=err, elapsed_ms=ms, trace=self._trace())
+
+    # ── public API ──────────────────────────────────────────────────────────
+    def run(self, data: bytes) -> RunResult:
+        if self._fs_pid is None:
+            return self._run_subprocess(bytes(data))
+        try:
+            return self._run_forkserver(bytes(data))
+        except (OSError, ForkserverError):
+            # 포크서버가 죽었으면 한 번 재시작 후 재시도
+            self._stop_forkserver()
+            try:
+                self._start_forkserver()
+                return self._run_forkserver(bytes(data))
+            except (OSError, ForkserverError):
+                self._stop_forkserver()
+                self.mode = "subprocess"
+                return self._run_subprocess(bytes(data))
+
+    def run_many(self, inputs: Iterable[bytes]) -> Iterator[RunResult]:
+        for data in inputs:
+            yield self.run(data)
+
+    def close(self) -> None:
+        self._stop_forkserver()
+        if self.shm is not None:
+            self.shm.close()
+            self.shm = None
+
+    def __enter__(self) -> "Executor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
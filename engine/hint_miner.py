@@ -0,0 +1,193 @@
+# engine/hint_miner.py
+# Incremental key/shape miner for LLM seed hints.
+# Every JSON file under the seed dirs and AFL queue dirs is parsed at most once.
+# Per-directory progress is kept in a small on-disk summary:
+#   queue dirs  → highest id:NNNNNN consumed, plus the dir inode (a campaign
+#                 restart recreates queue/, which resets the watermark)
+#   other dirs  → names already consumed
+# It stores frequency counters for keys, value types, per-file nesting depth
+# and number magnitudes, so hint gathering costs O(new files).
+#
+#   m = HintMiner()                       # corpus/.hint_summary.json
+#   m.update(["corpus/json_seeds", "out/exp_x/default/queue"])
+#   m.top_keys(64); m.profile()
+#   m.save()
+import json, math, os, re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_PATH = "corpus/.hint_summary.json"
+MAX_KEYS = 4096          # 저장할 때 빈도 상위만 유지
+MAX_KEY_LEN = 64
+MAX_FILE = 1 << 20       # 이보다 큰 queue 항목은 건너뜀
+_QID = re.compile(r"^id:(\d+)")
+
+
+def _num_bucket(x) -> str:
+    # 크기 구간: "0", "+1e3" (= 1000 <= x < 10000), "-1e0", 정수/실수 구분 없이 10의 거듭제곱
+    if x == 0:
+        return "0"
+    try:
+        e = int(math.floor(math.log10(abs(x))))
+    except (OverflowError, ValueError):
+        return "inf"
+    return f"{'-' if x < 0 else '+'}1e{e}"
+
+
+def _type_name(v) -> str:
+    if v is None:
+        return "null"
+    if isinstance(v, bool):
+        return "bool"
+    if isinstance(v, int):
+        return "int"
+    if isinstance(v, float):
+        return "float"
+    if isinstance(v, str):
+        return "string"
+    if isinstance(v, list):
+        return "array"
+    return "object"
+
+
+class HintMiner:
+    def __init__(self, path: Optional[str] = DEFAULT_PATH):
+        self.path = path
+        self.keys: Counter = Counter()
+        self.types: Counter = Counter()
+        self.depths: Counter = Counter()
+        self.numbers: Counter = Counter()
+        self.files = {"parsed": 0, "invalid": 0}
+        self.dirs: Dict[str, dict] = {}
+        if path:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                d = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.keys = Counter(d.get("keys", {}))
+        self.types = Counter(d.get("types", {}))
+        self.depths = Counter({int(k): v for k, v in d.get("depths", {}).items()})
+        self.numbers = Counter(d.get("numbers", {}))
+        self.files.update(d.get("files", {}))
+        self.dirs = d.get("dirs", {})
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        doc = {
+            "version": 1, "files": self.files,
+            "keys": dict(self.keys.most_common(MAX_KEYS)),
+            "types": dict(self.types), "numbers": dict(self.numbers),
+            "depths": {str(k): v for k, v in sorted(self.depths.items())},
+            "dirs": self.dirs,
+        }
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(doc, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+    # ── mining ──────────────────────────────────────────────────────────────
+    def _walk(self, obj) -> int:
+        """카운터 갱신 + 최대 중첩 깊이 반환 (재귀 대신 스택: 깊은 입력도 안전)."""
+        depth = 0
+        stack = [(obj, 1)]
+        while stack:
+            v, d = stack.pop()
+            t = _type_name(v)
+            self.types[t] += 1
+            if t == "object":
+                depth = max(depth, d)
+                for k, x in v.items():
+                    if len(k) <= MAX_KEY_LEN:
+                        self.keys[k] += 1
+                    stack.append((x, d + 1))
+            elif t == "array":
+                depth = max(depth, d)
+                stack.extend((x, d + 1) for x in v)
+            elif t in ("int", "float"):
+                self.numbers[_num_bucket(v)] += 1
+        return depth
+
+    def add_bytes(self, data: bytes) -> bool:
+        try:
+            obj = json.loads(data)
+        except (ValueError, RecursionError):
+            self.files["invalid"] += 1
+            return False
+        self.files["parsed"] += 1
+        self.depths[self._walk(obj)] += 1
+        return True
+
+    def _consume(self, path: str) -> None:
+        try:
+            with open(path, "rb") as f:
+                data = f.read(MAX_FILE + 1)
+        except OSError:
+            return
+        if len(data) > MAX_FILE:
+            self.files["invalid"] += 1
+            return
+        self.add_bytes(data)
+
+    def update(self, dirs: Iterable[str], pattern: Optional[str] = None) -> int:
+        """새 파일만 파싱; 처리한 파일 수 반환. queue 디렉터리는 id 워터마크로, 나머지는 이름으로 추적."""
+        n = 0
+        for d in dirs:
+            try:
+                st = os.stat(d)
+                names = os.listdir(d)
+            except OSError:
+                continue
+            key = os.path.normpath(d)
+            ent = self.dirs.get(key)
+            queue = os.path.basename(key) == "queue"
+            if ent is None or ent.get("ino") != st.st_ino:
+                ent = self.dirs[key] = {"ino": st.st_ino, "max_id": -1, "names": []}
+            if queue:
+                todo = []
+                for name in names:
+                    m = _QID.match(name)
+                    if m and int(m.group(1)) > ent["max_id"]:
+                        todo.append((int(m.group(1)), name))
+                for i, name in sorted(todo):
+                    self._consume(os.path.join(d, name))
+                    ent["max_id"] = i
+                    n += 1
+            else:
+                seen = set(ent["names"])
+                for name in sorted(names):
+                    if name in seen or name.startswith(".") or (pattern and not re.fullmatch(pattern, name)):
+                        continue
+                    p = os.path.join(d, name)
+                    if not os.path.isfile(p):
+                        continue
+                    self._consume(p)
+                    ent["names"].append(name)
+                    n += 1
+        return n
+
+    # ── hints ───────────────────────────────────────────────────────────────
+    def top_keys(self, n: int = 128) -> List[str]:
+        return [k for k, _ in self.keys.most_common(n)]
+
+    def profile(self) -> Dict[str, object]:
+        """프롬프트용 요약: 타입 비율, 깊이 분위수, 흔한 수 크기 구간."""
+        tot = sum(self.types.values()) or 1
+        depths = sorted(self.depths.elements())
+
+        def q(p):
+            return depths[min(len(depths) - 1, int(p * len(depths)))] if depths else 0
+
+        return {
+            "files": self.files["parsed"],
+            "types": {t: round(c / tot, 3) for t, c in self.types.most_common()},
+            "depth_p50": q(0.5), "depth_p90": q(0.9), "depth_max": depths[-1] if depths else 0,
+            "numbers": [b for b, _ in self.numbers.most_common(8)],
+        }
@@ -0,0 +1,138 @@
+# engine/plot_data.py
+# Shared AFL/AFL++ plot_data reader.
+# - columns are mapped by the "# ..." header (old/new AFL names are aliased)
+# - byte offsets: repeated update() parses only the rows appended since the
+#   last call (truncated/replaced files restart); state()/restore() let a
+#   caller persist the offset (engine/campaign_store.py does)
+# - columns come back as numpy arrays when numpy is importable, else array('d')
+#
+#   pd = PlotData("out/x/default/plot_data")
+#   pd.update()
+#   t, crashes = pd.col("time"), pd.col("saved_crashes")
+import os
+from array import array
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy 없는 환경: array('d') 그대로 반환
+    np = None
+
+# 버전별 컬럼 이름 → 공통 이름
+ALIASES = {
+    "unix_time": "time", "relative_time": "time",
+    "cur_path": "cur_item",
+    "paths_total": "corpus_count",
+    "unique_crashes": "saved_crashes",
+    "unique_hangs": "saved_hangs",
+}
+# 헤더 없는 구형 파일의 컬럼 순서
+LEGACY_HEADER = ["unix_time", "cycles_done", "cur_path", "paths_total", "pending_total",
+                 "pending_favs", "map_size", "unique_crashes", "unique_hangs", "max_depth",
+                 "execs_per_sec"]
+
+
+def canon(name: str) -> str:
+    name = name.strip().lower()
+    return ALIASES.get(name, name)
+
+
+def _parse_header(line: str) -> List[str]:
+    return [canon(c) for c in line.lstrip("#").split(",") if c.strip()]
+
+
+def _num(s: str) -> float:
+    s = s.strip()
+    if s.endswith("%"):
+        s = s[:-1]
+    try:
+        return float(s)
+    except ValueError:
+        return float("nan")
+
+
+class PlotData:
+    def __init__(self, path: str):
+        self.path = path
+        self.header: List[str] = []
+        self._cols: Dict[str, array] = {}
+        self._n = 0
+        self._off = 0
+        self._ino = None
+        self.resets = 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._cols)
+
+    def _reset(self) -> None:
+        self.header, self._cols, self._n, self._off = [], {}, 0, 0
+        self.resets += 1
+
+    def state(self) -> Dict[str, object]:
+        """Resume point (inode, byte offset, header) for readers that persist it."""
+        return {"ino": self._ino, "off": self._off, "header": list(self.header)}
+
+    def restore(self, st: Dict[str, object]) -> None:
+        # 컬럼은 비운 채 오프셋만 복원: 다음 update()는 그 이후 행만 읽음
+        self._cols, self._n = {}, 0
+        self._ino, self._off, self.header = st.get("ino"), int(st.get("off") or 0), list(st.get("header") or [])
+
+    def _add_row(self, parts: List[str]) -> None:
+        hdr = self.header or [canon(c) for c in LEGACY_HEADER]
+        for i, name in enumerate(hdr):
+            col = self._cols.get(name)
+            if col is None:
+                # 중간에 새 컬럼이 생기면(재시작 후 다른 버전) 이전 행은 NaN
+                col = self._cols[name] = array("d", [float("nan")] * self._n)
+            col.append(_num(parts[i]) if i < len(parts) else float("nan"))
+        for name, col in self._cols.items():
+            if len(col) <= self._n:
+                col.append(float("nan"))
+        self._n += 1
+
+    def update(self) -> int:
+        """Parse rows appended since the last call; returns how many were added."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return 0
+        if st.st_ino != self._ino or st.st_size < self._off:
+            self._reset()
+            self._ino = st.st_ino
+        if st.st_size == self._off:
+            return 0
+        before = self._n
+        with open(self.path, "rb") as f:
+            f.seek(self._off)
+            chunk = f.read(st.st_size - self._off)
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return 0                       # 아직 줄이 완성되지 않음
+        self._off += end + 1
+        for raw in chunk[:end].split(b"\n"):
+            line = raw.decode("utf-8", "ignore").strip()
+            if not line:
+                continue
+            if line.startswith("#"):
+                self.header = _parse_header(line)
+                continue
+            self._add_row(line.split(","))
+        return self._n - before
+
+    def col(self, name: str):
+        """Column by (canonical or AFL) name; empty if the file has no such column."""
+        a = self._cols.get(canon(name))
+        if a is None:
+            a = array("d")
+        # numpy는 복사본: 버퍼를 내보낸 array는 이후 append가 막힘
+        return np.array(a, dtype=np.float64) if np is not None else a
+
+    def last(self) -> Optional[Dict[str, float]]:
+        if not self._n:
+            return None
+        return {k: v[-1] for k, v in self._cols.items()}
+
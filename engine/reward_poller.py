@@ -1,8 +1,16 @@
-# write EMA state to mutators/state.json so AFL-side mutator can read it
-import os, time, glob, re, json, collections
+# publish EMA state to the shared mmap segment read by the AFL-side mutator
+# (mutators/state.json is still written as a human-readable export)
+import os, sys, time, re, json
 
-BASE = "out"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from mutators.shm_state import ShmState
+from mutators.op_ring import OpRingReader, ring_path
+from engine.stats_watch import StatsWatcher
+
+BASE = os.environ.get("RAGFUZZ_POLL_BASE","out")   # tools/campaign.py가 캠페인 루트로 지정
 STATE_PATH = os.environ.get("RAGFUZZ_STATE","mutators/state.json")
+STATE_SHM = os.environ.get("RAGFUZZ_STATE_SHM","mutators/state.shm")
+OPLOG_DIR = os.environ.get("RAGFUZZ_OPLOG_DIR","mutators/oplog")
 
 def _to_float(s, default=0.0):
   try: return float(str(s).strip().rstrip("%"))
@@ -16,65 +24,87 @@ def _to_int(s, default=0):
     except Exception:
       m=re.search(r"([0-9]+)", str(s) or ""); return int(m.group(1)) if m else default
 
-def _read_stats(path):
-  d={}
-  try:
-    with open(path,"r") as f:
-      for line in f:
-        if ":" in line:
-          k,v=line.split(":",1); d[k.strip()]=v.strip()
-  except FileNotFoundError:
-    return None
-  return d
-
-def _discover_stats():
-  paths = glob.glob(os.path.join(BASE,"*","fuzzer_stats")) + \
-          glob.glob(os.path.join(BASE,"*","*","fuzzer_stats"))
-  paths = sorted(paths, key=lambda p: os.path.getmtime(p), reverse=True)
-  return paths
-
 # 공유 상태
 OPS=["bitflip","arith","havoc","splice","dict_ins","len_skew","grammar_ins"]
 ema={op:0.0 for op in OPS}
 counts={op:1 for op in OPS}
 _lambda=0.2
 
+_rings={}  # fuzzer_pid -> OpRingReader
+
+def _op_activity(stats):
+  """변이기 ring에서 이번 주기의 연산자별 (attempts, hits); ring이 없으면 None"""
+  pid=_to_int(stats.get("fuzzer_pid","0"))
+  if pid<=0: return None
+  rd=_rings.get(pid)
+  if rd is None:
+    rd=_rings[pid]=OpRingReader(ring_path(OPLOG_DIR, pid), OPS)
+  return rd.poll()
+
+def _credit(r, activity):
+  """보상 r을 실제로 queue hit를 낸 연산자에 배분 (hit이 없으면 시도 비율로)"""
+  attempts, hits = activity
+  basis = hits if sum(hits) > 0 else attempts
+  total = sum(basis)
+  for i,o in enumerate(OPS):
+    if attempts[i]==0 and hits[i]==0: continue   # 이번 주기에 안 쓰인 연산자는 유지
+    share = basis[i]/total if total>0 else 0.0
+    ema[o]=(1-_lambda)*ema[o]+_lambda*r*share
+    counts[o]+=1
+
+_shm=None
+
+def _publish_state():
+  global _shm
+  if _shm is None:
+    _shm=ShmState.create(STATE_SHM, OPS)
+  _shm.write(ema, counts)
+
 def _save_state():
+  # JSON export (사람/분석용); 변이기는 읽지 않음
   os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
   tmp=STATE_PATH+".tmp"
   with open(tmp,"w") as f:
     json.dump({"ema":ema,"counts":counts}, f)
   os.replace(tmp, STATE_PATH)
 
+_seen=set()
+
+def _on_stats(sp, s, prev):
+  """StatsWatcher 구독자: 바뀐 fuzzer_stats 하나에 대한 보상 반영"""
+  cov=_to_float(s.get("bitmap_cvg","0"))
+  uniq=_to_int(s.get("unique_crashes","0"))
+  total=_to_int(s.get("paths_total","0"))
+  pc=prev or {}
+  d_cov=max(0.0, cov-_to_float(pc.get("bitmap_cvg","0")))
+  d_paths=max(0, total-_to_int(pc.get("paths_total","0")))
+  new_cr= uniq>_to_int(pc.get("unique_crashes","0"))
+
+  r = 1.0*d_cov + 5.0*(1 if new_cr else 0) + 0.3*d_paths
+  act=_op_activity(s)
+  if act is not None:
+    # 연산자별 배분: 델타를 만든 연산자에게만 보상
+    _credit(r, act)
+  else:
+    # ring 없는 변이기(json_adapt 등): 동일 보상 분배
+    for o in OPS:
+      ema[o]=(1-_lambda)*ema[o]+_lambda*r
+      counts[o]+=1
+
+  if sp not in _seen:
+    print(f"[poller] tracking {sp}"); _seen.add(sp)
+  print(f"[poller] cov={cov:6.2f}% (Δ{d_cov:4.2f}) paths={total:7d} (Δ{d_paths:4d}) uniq={uniq:4d} {'NEW_CRASH' if new_cr else ''}")
+
 if __name__=="__main__":
-  prev = collections.defaultdict(lambda: {"cov":0.0,"paths":0,"uniq":0})
-  seen=set()
+  # 변경된 fuzzer_stats만 이벤트로 받아 즉시 반영 (inotify, 없으면 mtime 폴링)
+  watcher=StatsWatcher(BASE, depth=2, interval=5.0)
+  watcher.subscribe(_on_stats)
+  print(f"[poller] watching {BASE}/ ({watcher.mode})")
+  last_export=0.0
   while True:
-    paths=_discover_stats()
-    if not paths:
+    if watcher.run_once(timeout=30):
+      _publish_state()
+      if time.monotonic()-last_export >= 30:
+        _save_state(); last_export=time.monotonic()
+    elif not watcher.paths():
       print("[poller] waiting afl-fuzz ...")
-      time.sleep(5); continue
-    for sp in paths:
-      s=_read_stats(sp)
-      if not s: continue
-      cov=_to_float(s.get("bitmap_cvg","0"))
-      uniq=_to_int(s.get("unique_crashes","0"))
-      total=_to_int(s.get("paths_total","0"))
-      pc=prev[sp]
-      d_cov=max(0.0, cov-pc["cov"])
-      d_paths=max(0, total-pc["paths"])
-      new_cr= uniq>pc["uniq"]
-
-      # 동일 보상 분배(안정적)
-      r = 1.0*d_cov + 5.0*(1 if new_cr else 0) + 0.3*d_paths
-      for o in OPS:
-        ema[o]=(1-_lambda)*ema[o]+_lambda*r
-        counts[o]+=1
-
-      if sp not in seen:
-        print(f"[poller] tracking {sp}"); seen.add(sp)
-      print(f"[poller] cov={cov:6.2f}% (Δ{d_cov:4.2f}) paths={total:7d} (Δ{d_paths:4d}) uniq={uniq:4d} {'NEW_CRASH' if new_cr else ''}")
-
-      prev[sp]={"cov":cov,"paths":total,"uniq":uniq}
-    _save_state()
-    time.sleep(30)
@@ -0,0 +1,219 @@
+# engine/stats_watch.py
+# Shared fuzzer_stats watcher: inotify on Linux, mtime polling elsewhere.
+# Only files that actually changed are re-parsed; subscribers get
+# fn(path, cur, prev) where prev is the previous parse (None the first time).
+#
+#   w = StatsWatcher("out", depth=2)
+#   w.subscribe(lambda path, cur, prev: ...)
+#   while True: w.run_once(timeout=30)
+import ctypes, ctypes.util, os, select, struct, time
+from typing import Callable, Dict, List, Optional, Tuple
+
+STATS_NAME = "fuzzer_stats"
+# AFL 인스턴스 내부 디렉터리: 감시하면 queue 파일마다 이벤트가 쏟아짐
+SKIP_DIRS = {"queue", "crashes", "hangs", ".synced", ".state", "plot", "cmplog"}
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO    = 0x00000080
+_IN_CREATE      = 0x00000100
+_IN_DELETE_SELF = 0x00000400
+_IN_IGNORED     = 0x00008000
+_IN_ISDIR       = 0x40000000
+_IN_Q_OVERFLOW  = 0x00004000
+_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE_SELF
+_EVT = struct.Struct("iIII")
+
+Subscriber = Callable[[str, Dict[str, str], Optional[Dict[str, str]]], None]
+
+
+def read_stats(path: str) -> Optional[Dict[str, str]]:
+    d = {}
+    try:
+        with open(path, "r", errors="ignore") as f:
+            for line in f:
+                if ":" in line:
+                    k, v = line.split(":", 1)
+                    d[k.strip()] = v.strip()
+    except FileNotFoundError:
+        return None
+    return d
+
+
+class _Inotify:
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add = libc.inotify_add_watch
+        self._add.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.wd: Dict[int, str] = {}
+
+    def add(self, path: str) -> bool:
+        wd = self._add(self.fd, os.fsencode(path), _MASK)
+        if wd < 0:
+            return False
+        self.wd[wd] = path
+        return True
+
+    def read(self, timeout: float) -> List[Tuple[str, str, int]]:
+        """(dir, name, mask) events; waits up to timeout seconds."""
+        r, _, _ = select.select([self.fd], [], [], max(0.0, timeout))
+        if not r:
+            return []
+        try:
+            buf = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return []
+        out, i = [], 0
+        while i + _EVT.size <= len(buf):
+            wd, mask, _cookie, n = _EVT.unpack_from(buf, i)
+            name = buf[i + _EVT.size:i + _EVT.size + n].rstrip(b"\0").decode("utf-8", "replace")
+            i += _EVT.size + n
+            if mask & _IN_IGNORED:
+                self.wd.pop(wd, None)
+                continue
+            out.append((self.wd.get(wd, ""), name, mask))
+        return out
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class StatsWatcher:
+    def __init__(self, root: str, depth: int = 2, interval: float = 5.0, use_inotify: bool = True):
+        """
+        root 아래 depth 단계까지의 디렉터리에서 fuzzer_stats를 추적.
+        (depth=0: root/fuzzer_stats만, depth=2: out/*/fuzzer_stats + out/*/*/fuzzer_stats)
+        """
+        self.root = os.path.abspath(root)
+        self.depth = int(depth)
+        self.interval = float(interval)
+        self._subs: List[Subscriber] = []
+        self._last: Dict[str, Dict[str, str]] = {}
+        self._mtime: Dict[str, int] = {}
+        self._dirty: set = set()
+        self._ino: Optional[_Inotify] = None
+        self._watched: set = set()
+        self._next_scan = 0.0
+        if use_inotify:
+            try:
+                self._ino = _Inotify()
+            except (OSError, AttributeError):
+                self._ino = None
+        self._scan_dirs()
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._ino is not None else "poll"
+
+    def subscribe(self, fn: Subscriber) -> None:
+        self._subs.append(fn)
+
+    def paths(self) -> List[str]:
+        return sorted(self._last)
+
+    def _level(self, d: str) -> int:
+        rel = os.path.relpath(d, self.root)
+        return 0 if rel == "." else rel.count(os.sep) + 1
+
+    def _watch_tree(self, d: str) -> None:
+        lvl = self._level(d)
+        if lvl > self.depth or os.path.basename(d) in SKIP_DIRS:
+            return
+        if d not in self._watched:
+            if self._ino is not None and not self._ino.add(d):
+                return
+            self._watched.add(d)
+            # 폴링 모드는 mtime 비교(_poll_changes)가 첫 파싱을 담당
+            if self._ino is not None and os.path.isfile(os.path.join(d, STATS_NAME)):
+                self._dirty.add(os.path.join(d, STATS_NAME))
+        if lvl < self.depth:
+            try:
+                with os.scandir(d) as it:
+                    for e in it:
+                        if e.is_dir(follow_symlinks=False):
+                            self._watch_tree(e.path)
+            except OSError:
+                pass
+
+    def _scan_dirs(self) -> None:
+        if not os.path.isdir(self.root):
+            return
+        self._watch_tree(self.root)
+
+    def _poll_changes(self) -> None:
+        # inotify 없을 때: 감시 디렉터리의 fuzzer_stats mtime만 비교
+        self._watched.clear()
+        self._scan_dirs()
+        for d in self._watched:
+            p = os.path.join(d, STATS_NAME)
+            try:
+                m = os.stat(p).st_mtime_ns
+            except OSError:
+                continue
+            if self._mtime.get(p) != m:
+                self._mtime[p] = m
+                self._dirty.add(p)
+
+    def run_once(self, timeout: Optional[float] = None) -> List[str]:
+        """변경 이벤트를 기다렸다가(최대 timeout초) 바뀐 파일만 파싱해 구독자에게 전달."""
+        timeout = self.interval if timeout is None else timeout
+        if self._ino is None:
+            if not self._dirty:
+                wait = self._next_scan - time.monotonic()
+                if wait > 0:
+                    time.sleep(min(wait, timeout))
+                self._poll_changes()
+                self._next_scan = time.monotonic() + self.interval
+        else:
+            # 다른 파일(phase_ctl.json 등) 이벤트는 무시하고 기한까지 계속 대기
+            deadline = time.monotonic() + timeout
+            while not self._dirty:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    break
+                if not self._watched:
+                    # root가 아직 없음: 생길 때까지 주기적으로 확인
+                    time.sleep(min(left, self.interval))
+                    self._scan_dirs()
+                    continue
+                for d, name, mask in self._ino.read(left):
+                    p = os.path.join(d, name)
+                    if mask & _IN_Q_OVERFLOW:
+                        self._watched.clear()
+                        self._scan_dirs()
+                    elif mask & _IN_DELETE_SELF:
+                        self._watched.discard(d)
+                    elif mask & _IN_ISDIR:
+                        if mask & (_IN_CREATE | _IN_MOVED_TO):
+                            self._watch_tree(p)
+                    elif name == STATS_NAME and mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO):
+                        self._dirty.add(p)
+        return self._flush()
+
+    def _flush(self) -> List[str]:
+        changed = []
+        for p in sorted(self._dirty):
+            cur = read_stats(p)
+            if not cur:
+                continue
+            prev = self._last.get(p)
+            if cur == prev:
+                continue
+            self._last[p] = cur
+            changed.append(p)
+            for fn in self._subs:
+                try:
+                    fn(p, cur, prev)
+                except Exception:
+                    pass
+        self._dirty.clear()
+        return changed
+
+    def close(self) -> None:
+        if self._ino is not None:
+            self._ino.close()
@@ -0,0 +1,86 @@
+# mutators/dict_util.py
+# AFL dictionary (-x) parsing/escaping shared by tools/dict_build.py and the
+# mutators' DictCache.
+#
+#   "value"            plain token
+#   name="value"       named token
+#   "value"@3          token with a level
+#   value              bare token (auto_from_cve_nums.dict style)
+# Escapes inside quotes: \xNN, \\, \"
+#
+# Weight sidecar (<dict>.weights, written by tools/dict_build.py):
+#   <weight>\t"<escaped token>"   one per line, same escaping as the dict
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+MAX_TOKEN = 128     # AFL++ MAX_DICT_FILE
+_QUOTED = re.compile(rb'"((?:[^"\\]|\\.)*)"')
+_ESC = re.compile(rb"\\(x[0-9A-Fa-f]{2}|.)", re.S)
+
+
+def _unescape(body: bytes) -> bytes:
+    def sub(m):
+        e = m.group(1)
+        if e[:1] == b"x" and len(e) == 3:
+            return bytes([int(e[1:], 16)])
+        return e
+    return _ESC.sub(sub, body)
+
+
+def escape_token(tok: bytes) -> str:
+    out = []
+    for c in tok:
+        if c in (0x22, 0x5C):              # " \
+            out.append("\\" + chr(c))
+        elif 0x20 <= c < 0x7F:
+            out.append(chr(c))
+        else:
+            out.append(f"\\x{c:02x}")
+    return '"' + "".join(out) + '"'
+
+
+def parse_line(line: bytes) -> List[bytes]:
+    """Tokens on one dict line (usually one; yaml.dict-style lines can hold several)."""
+    line = line.strip()
+    if not line or line.startswith(b"#"):
+        return []
+    toks = [_unescape(m.group(1)) for m in _QUOTED.finditer(line)]
+    if toks:
+        return toks
+    return [line]                          # bare token
+
+
+def parse_dict(path: str) -> List[bytes]:
+    out = []
+    with open(path, "rb") as f:
+        for line in f:
+            out.extend(parse_line(line))
+    return out
+
+
+def load_weights(path: str) -> Optional[Dict[bytes, float]]:
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return None
+    w: Dict[bytes, float] = {}
+    with f:
+        for line in f:
+            parts = line.rstrip(b"\n").split(b"\t", 1)
+            if len(parts) != 2:
+                continue
+            toks = parse_line(parts[1])
+            try:
+                val = float(parts[0])
+            except ValueError:
+                continue
+            if toks:
+                w[toks[0]] = val
+    return w
+
+
+def write_weights(path: str, ranked: List[Tuple[bytes, float]]) -> None:
+    with open(path, "w", encoding="ascii") as f:
+        for tok, wt in ranked:
+            f.write(f"{wt:.6g}\t{escape_token(tok)}\n")
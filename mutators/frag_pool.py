@@ -0,0 +1,142 @@
+# mutators/frag_pool.py
+# Cross-corpus pool of typed JSON fragments for structure-aware splicing.
+# queue_new_entry hands every new queue file to harvest_file(): it is parsed
+# once with json_ast and its subtrees are filed into buckets by
+# (kind, depth), kind being the json_ast value kinds plus MEMBER for whole
+# object members ('"key":value'). Each bucket is a fixed-size reservoir
+# sample (Algorithm R) over everything offered to it, so memory is bounded
+# by KINDS × DEPTHS × cap × max_frag no matter how long the campaign runs,
+# and old and new queue entries are equally likely to survive. Duplicates
+# (the same bytes already in the bucket) are not offered twice.
+#
+#   POOL.harvest_file(path)         # queue_new_entry
+#   POOL.draw(kind, depth)          # O(1): same kind, nearest non-empty depth
+#   POOL.draw_value(depth)          # O(1): any value kind
+#
+# RAGFUZZ_FRAG_POOL=0 disables it (POOL is None, pool operators fall back to
+# add_buf), RAGFUZZ_FRAG_CAP sets the per-bucket reservoir size.
+import os, random
+from typing import List, Optional, Set
+from .json_ast import KIND_NAMES, parse
+
+MEMBER = len(KIND_NAMES)        # 객체 멤버 '"k":v' (json_ast 값 종류 다음 번호)
+KINDS = MEMBER + 1
+DEPTHS = 8                      # depth ≥ DEPTHS-1은 마지막 버킷
+CAP = 128                       # 버킷당 조각 수
+MAX_FRAG = 1024                 # 이보다 큰 조각은 버림
+MAX_FILE = 1 << 16              # 이보다 큰 큐 파일은 수확하지 않음
+PER_FILE = 64                   # 파일당 제안하는 노드 수 상한 (무작위 표본)
+
+
+class FragmentPool:
+    def __init__(self, cap: int = CAP, max_frag: int = MAX_FRAG, rng: Optional[random.Random] = None):
+        self.cap = max(1, int(cap))
+        self.max_frag = int(max_frag)
+        self.rng = rng or random.Random()
+        self._frags: List[List[bytes]] = [[] for _ in range(KINDS * DEPTHS)]
+        self._have: List[Set[bytes]] = [set() for _ in range(KINDS * DEPTHS)]
+        self._seen = [0] * (KINDS * DEPTHS)     # 버킷에 제안된 (중복 아닌) 조각 수
+        self.files = 0
+        self.nbytes = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["FragmentPool"]:
+        if os.environ.get("RAGFUZZ_FRAG_POOL", "1").strip().lower() in ("0", "no", "off", "false"):
+            return None
+        try:
+            cap = int(os.environ.get("RAGFUZZ_FRAG_CAP", str(CAP)))
+        except ValueError:
+            cap = CAP
+        return cls(cap=cap)
+
+    def __len__(self) -> int:
+        return sum(len(b) for b in self._frags)
+
+    # ── harvest ─────────────────────────────────────────────────────────────
+    def add(self, kind: int, depth: int, frag: bytes) -> bool:
+        """reservoir 한 단계: 버킷이 차 있으면 seen 분의 cap 확률로 임의 조각을 교체."""
+        if len(frag) > self.max_frag:
+            return False
+        b = kind * DEPTHS + min(depth, DEPTHS - 1)
+        have = self._have[b]
+        if frag in have:
+            return False
+        self._seen[b] += 1
+        frags = self._frags[b]
+        if len(frags) < self.cap:
+            frags.append(frag)
+        else:
+            j = self.rng.randrange(self._seen[b])
+            if j >= self.cap:
+                return False
+            old = frags[j]
+            have.discard(old)
+            self.nbytes -= len(old)
+            frags[j] = frag
+        have.add(frag)
+        self.nbytes += len(frag)
+        return True
+
+    def harvest(self, data) -> int:
+        """JSON 버퍼의 서브트리(+ 객체 멤버)를 풀에 제안; 넣은 조각 수 (JSON이 아니면 0)."""
+        try:
+            t = parse(data)
+        except (ValueError, IndexError):
+            return 0
+        n = len(t)
+        nodes = range(n) if n <= PER_FILE else self.rng.sample(range(n), PER_FILE)
+        d, added = t.data, 0
+        for i in nodes:
+            a, e, depth = t.start[i], t.end[i], t.depth[i]
+            added += self.add(t.kind[i], depth, d[a:e])
+            k = t.key[i]
+            if k >= 0:
+                added += self.add(MEMBER, depth, d[k:e])
+        self.files += 1
+        return added
+
+    def harvest_file(self, path) -> int:
+        if not path:
+            return 0
+        try:
+            with open(path, "rb") as f:
+                data = f.read(MAX_FILE + 1)
+        except OSError:
+            return 0
+        if len(data) > MAX_FILE:
+            return 0
+        return self.harvest(data)
+
+    # ── draw ────────────────────────────────────────────────────────────────
+    def draw(self, kind: int, depth: int = -1) -> Optional[bytes]:
+        """kind 조각 하나; depth 버킷이 비었으면 가까운 깊이부터 (depth < 0: 임의 깊이)."""
+        base = kind * DEPTHS
+        if depth < 0:
+            depth = self.rng.randrange(DEPTHS)
+        depth = min(depth, DEPTHS - 1)
+        for step in range(DEPTHS):
+            for dd in ((depth - step, depth + step) if step else (depth,)):
+                if 0 <= dd < DEPTHS:
+                    frags = self._frags[base + dd]
+                    if frags:
+                        return frags[self.rng.randrange(len(frags))]
+        return None
+
+    def draw_value(self, depth: int = -1) -> Optional[bytes]:
+        """값 조각 하나 (종류 무작위, 빈 종류는 건너뜀)."""
+        k0 = self.rng.randrange(MEMBER)
+        for s in range(MEMBER):
+            frag = self.draw((k0 + s) % MEMBER, depth)
+            if frag is not None:
+                return frag
+        return None
+
+    def stats(self) -> dict:
+        out = {"files": self.files, "fragments": len(self), "bytes": self.nbytes}
+        for k, name in enumerate(KIND_NAMES + ("member",)):
+            out[name] = [len(self._frags[k * DEPTHS + dd]) for dd in range(DEPTHS)]
+        return out
+
+
+# json_ops의 풀 연산자와 json_adapt의 queue_new_entry가 같은 인스턴스를 공유
+POOL = FragmentPool.from_env()
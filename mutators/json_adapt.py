@@ -2,52 +2,127 @@
 # Robust Python mutator for AFL++ (supports both Python-only API: init/fuzz
 # and afl_custom_* aliases). All exceptions are swallowed to never kill afl-fuzz.
 
-import os, json, random
-from typing import Optional, List
+import os, random
+from collections import deque
+from time import perf_counter_ns as _now
+from typing import Optional, Sequence
 from .sched_ema import EMAScheduler
 from .json_ops import OPS
+from .json_trim import Trimmer
+from .seed_sched import SeedEnergy
+from .op_profile import OpProfiler
+from .phase_rate import PhaseControl, valid as _valid
+from .frag_pool import POOL
 
 # ── globals ──────────────────────────────────────────────────────────────────
 _RNG = random.Random()
 _SCHED = EMAScheduler(n_ops=len(OPS), lam=0.2, tau=0.8, eps=0.02)
 _last_op: Optional[int] = None
 
-# For simple phase control based on JSON parse rate (best-effort, never throws)
-_parse_ok = 0
-_parse_all = 0
+# Batch mode: RAGFUZZ_BATCH=N pre-generates N mutants per parent into a ring.
+# AFL++ calls fuzz() many times in a row for the same queue entry, so the
+# scheduler picks, phase lookup and parent conversion are paid once per batch.
+# add_buf (splice partner) and the operator picks are fixed for the batch.
+try:
+    _BATCH = max(0, int(os.environ.get("RAGFUZZ_BATCH", "0")))
+except ValueError:
+    _BATCH = 0
+_ring: deque = deque(maxlen=_BATCH or 1)   # (op_idx, mutant bytes)
+_ring_key: Optional[tuple] = None          # (parent bytes, max_size)
+
+# Profiling: RAGFUZZ_PROFILE=1 (or a sidecar path) records per-operator call
+# counts, ns, size delta and parse success (see op_profile.py). When unset
+# _PROF is None and the hot path only pays an `is None` test per op/parse.
+_PROF = OpProfiler.from_env([op.__name__ for op in OPS])
+
+# Structural trimming (json_trim.py): the plan lives across trim()/post_trim()
+_TRIM = Trimmer()
+
+# Seed energy (seed_sched.py): queue_get skips stale entries, fuzz_count scales
+# iterations by per-seed productivity. RAGFUZZ_SEED_SCHED=0 disables it.
+_SEEDS = SeedEnergy.from_env(rng=_RNG)
+
+# Fragment pool (frag_pool.py): subtrees of every new queue entry are filed by
+# kind/depth for the op_pool_* splice operators. RAGFUZZ_FRAG_POOL=0 disables it.
+_POOL = POOL
 
 
 # ── helpers ──────────────────────────────────────────────────────────────────
-def _clip(ba: bytearray, max_size: int) -> bytearray:
+def _run_op(op_idx: int, data: bytearray, add_buf, max_size) -> bytes:
+    # Run the operator; never let exceptions bubble out
+    t0 = _now() if _PROF is not None else 0
     try:
-        if len(ba) > max_size:
-            del ba[max_size:]
+        out = OPS[op_idx](data, add_buf, max_size, rng=_RNG)
+        if not isinstance(out, (bytes, bytearray)):
+            out = data
+    except Exception:
+        out = data
+    # Clip by slicing a view: one copy at most (none for an in-budget bytes result)
+    if len(out) > int(max_size):
+        out = memoryview(out)[:int(max_size)]
+    out = bytes(out)
+    if _PROF is not None:
+        _PROF.op(op_idx, _now() - t0, len(out) - len(data))
+    return out
+
+
+def _count_parse(out: bytes, op_idx: int) -> None:
+    # Update parse stats for a sampled fraction of outputs (best-effort only)
+    try:
+        if not _PHASE.sample():
+            if _SEEDS is not None:
+                _SEEDS.spent(None)
+            return
+        if _PROF is None:
+            ok = _valid(out)
+        else:
+            t0 = _now()
+            ok = _valid(out)
+            _PROF.parse(op_idx, _now() - t0, ok)
+        _PHASE.record(op_idx, ok)
+        if _SEEDS is not None:
+            _SEEDS.spent(ok, _PHASE.period)
     except Exception:
         pass
-    return ba
 
 
-def _safe_json_loads(b: bytes | bytearray) -> bool:
-    try:
-        json.loads(b)
-        return True
-    except Exception:
-        return False
+def _refill(data: bytearray, add_buf, max_size) -> None:
+    allowed = _allowed_ops() or (0,)
+    picks = _SCHED.pick_many(_BATCH, allowed=allowed)
+    _ring.clear()
+    for op_idx in picks:
+        if not isinstance(op_idx, int) or not (0 <= op_idx < len(OPS)):
+            op_idx = allowed[0]
+        _ring.append((op_idx, _run_op(op_idx, data, add_buf, max_size)))
 
 
-def _allowed_ops() -> List[int]:
-    # Simple curriculum: widen operator set as parse rate improves
-    try:
-        rate = (_parse_ok / _parse_all) if _parse_all > 0 else 0.0
-    except Exception:
-        rate = 0.0
+def _fuzz_batched(buf, add_buf, max_size) -> bytes:
+    global _last_op, _ring_key
+    key = (bytes(buf), int(max_size))
+    if not _ring or key != _ring_key:
+        _ring_key = key
+        _refill(bytearray(key[0]), add_buf, max_size)
+    op_idx, out = _ring.popleft()
+    _last_op = op_idx
+    _count_parse(out, op_idx)
+    return out
+
+
+# Phase op sets are fixed tuples so the scheduler can reuse its cached table
+_PHASE_A = (0, 1)                     # safe core
+_PHASE_B = (0, 1, 2)                  # moderate
+_PHASE_C = tuple(range(len(OPS)))     # all ops
 
-    if rate >= 0.90:
-        return list(range(len(OPS)))   # Phase C: all ops
-    elif rate >= 0.50:
-        return [0, 1, 2]               # Phase B: moderate
-    else:
-        return [0, 1]                  # Phase A: safe core
+# Curriculum (phase_rate.py): a sampled, per-operator decaying parse rate moves
+# A <-> B <-> C with hysteresis; the phase_ctl.json plateau flag promotes B->C
+# and resets the EMA scores in C. RAGFUZZ_PARSE_SAMPLE=N checks ~1/N outputs.
+_PHASE = PhaseControl.from_env(len(OPS), (_PHASE_A, _PHASE_B, _PHASE_C),
+                               on_reset=_SCHED.reset_scores, rng=_RNG)
+
+
+def _allowed_ops() -> Sequence[int]:
+    # Simple curriculum: widen operator set as parse rate improves
+    return _PHASE.ops
 
 
 # ── AFL++ "afl_custom_*" (C mutator parity) ──────────────────────────────────
@@ -61,42 +136,31 @@ def afl_custom_init(seed: int | None):
 
 
 def afl_custom_deinit():
+    if _PROF is not None:
+        _PROF.flush(final=True)
     return 0
 
 
-def afl_custom_fuzz(buf, add_buf, max_size):
-    global _last_op, _parse_ok, _parse_all
+def _fuzz(buf, add_buf, max_size):
+    global _last_op
     try:
+        if _BATCH:
+            return _fuzz_batched(buf, add_buf, max_size)
+
         data = bytearray(buf) if not isinstance(buf, bytearray) else buf
 
         allowed = _allowed_ops()
         if not allowed:
-            allowed = [0]
+            allowed = (0,)
 
         op_idx = _SCHED.pick(allowed=allowed)
         if not isinstance(op_idx, int) or not (0 <= op_idx < len(OPS)):
             op_idx = allowed[0]
         _last_op = op_idx
 
-        # Run the operator; never let exceptions bubble out
-        try:
-            out = OPS[op_idx](data, add_buf, max_size, rng=_RNG)
-            if not isinstance(out, (bytes, bytearray)):
-                out = data
-        except Exception:
-            out = data
-
-        out = _clip(bytearray(out), int(max_size))
-
-        # Update parse stats (best-effort only)
-        try:
-            _parse_all += 1
-            if _safe_json_loads(out):
-                _parse_ok += 1
-        except Exception:
-            pass
-
-        return bytes(out)
+        out = _run_op(op_idx, data, add_buf, max_size)
+        _count_parse(out, op_idx)
+        return out
 
     except Exception:
         # Last resort: return original buffer or minimal valid JSON
@@ -106,6 +170,20 @@ def afl_custom_fuzz(buf, add_buf, max_size):
             return b"{}"
 
 
+def _fuzz_profiled(buf, add_buf, max_size):
+    t0 = _now()
+    out = _fuzz(buf, add_buf, max_size)
+    try:
+        _PROF.fuzz(_now() - t0)
+    except Exception:
+        pass
+    return out
+
+
+# Bound once at import, so the disabled path costs no extra call
+afl_custom_fuzz = _fuzz if _PROF is None else _fuzz_profiled
+
+
 def afl_custom_post_process(buf):
     return post_process(buf)
 
@@ -114,6 +192,18 @@ def afl_custom_queue_new_entry(filename, orig_filename):
     queue_new_entry(filename, orig_filename)
 
 
+def afl_custom_init_trim(buf):
+    return init_trim(buf)
+
+
+def afl_custom_trim():
+    return trim()
+
+
+def afl_custom_post_trim(success):
+    return post_trim(success)
+
+
 # ── Python-only mutator API expected by AFL++ (init/fuzz/deinit/…) ───────────
 def init(seed=None):
     # Some afl++ builds call without an argument; keep it permissive
@@ -136,11 +226,62 @@ def post_process(buf):
     return buf
 
 
+def init_trim(buf) -> int:
+    # Number of trim steps; 0 (non-JSON input) makes afl-fuzz skip trimming
+    try:
+        return _TRIM.init(buf)
+    except Exception:
+        return 0
+
+
+def trim():
+    # Next candidate: whole members/elements/nesting levels removed
+    try:
+        return _TRIM.trim()
+    except Exception:
+        return bytearray(_TRIM.data)
+
+
+def post_trim(success) -> int:
+    # afl-fuzz kept the candidate iff coverage was unchanged; returns next step
+    try:
+        return _TRIM.post_trim(success)
+    except Exception:
+        return _TRIM.steps
+
+
+def _queue_get(filename) -> bool:
+    # False tells afl-fuzz to skip this queue entry for now
+    try:
+        return _SEEDS.select(filename)
+    except Exception:
+        return True
+
+
+def _fuzz_count(buf) -> int:
+    # Number of fuzz() calls for the entry picked by queue_get
+    try:
+        return _SEEDS.energy(len(buf))
+    except Exception:
+        return _SEEDS.base
+
+
+# Only exported when enabled: without fuzz_count afl-fuzz keeps its own
+# perf_score-based iteration count
+if _SEEDS is not None:
+    queue_get = afl_custom_queue_get = _queue_get
+    fuzz_count = afl_custom_fuzz_count = _fuzz_count
+
+
 def queue_new_entry(filename: str, *rest) -> None:
     # Reward the last operator when afl adds a new queue entry
     try:
         if isinstance(_last_op, int):
             _SCHED.reward_update(_last_op, d_cov=0.0, uniq_crash=False, new_path=True)
+        if _SEEDS is not None:
+            _SEEDS.hit(rest[0] if rest else None)
+        if _POOL is not None:
+            _POOL.harvest_file(filename)
     except Exception:
         pass
 
@@ -0,0 +1,229 @@
+# mutators/json_ast.py
+# Flat, array-backed JSON syntax tree for structure-aware mutation and trimming.
+# One pass over a regex tokenizer (no recursion, so deep nesting is safe) fills
+# parallel arrays, one slot per value node in document (pre)order:
+#   kind    OBJ / ARR / STR / NUM / LIT (true, false, null and other bare words)
+#   start   [start, end) byte span of the value
+#   end
+#   key     start of the member's key string (-1 outside objects)
+#   parent  parent node (-1 for the root = node 0)
+#   depth   root = 0
+#   koff    children of node i are kids[koff[i] : koff[i] + kcnt[i]]
+#   kcnt    (CSR layout, children in document order)
+# Mutations are expressed as byte-span edits on the original buffer and
+# rendered with render(): unchanged bytes are copied through memoryview slices,
+# only the edited spans are re-serialized.
+#
+#   t = parse(b'{"a":[1,2]}')      # ValueError if not JSON
+#   t.children(0), t.span(2), t.unit(1)
+#   render(t.data, [(t.start[2], t.end[2], b"7")], max_size)
+import re
+from array import array
+from typing import List, Optional, Sequence, Tuple
+
+OBJ, ARR, STR, NUM, LIT = range(5)
+KIND_NAMES = ("object", "array", "string", "number", "literal")
+
+# 토큰 (앞 공백 포함): 1 key(+':') 2 문자열 3 여는 괄호 4 닫는 괄호 5 쉼표 6 bare word
+_TOK = re.compile(rb'[ \t\n\r]*(?:("(?:[^"\\]|\\.)*")[ \t\n\r]*:|("(?:[^"\\]|\\.)*")|([{\[])|([}\]])|(,)'
+                  rb'|([^ \t\n\r{}\[\],:"]+))', re.S)
+_G_KEY, _G_STR, _G_OPEN, _G_CLOSE, _G_COMMA, _G_WORD = range(1, 7)
+_WS_END = re.compile(rb"[ \t\n\r]*\Z")
+_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"', re.S)
+_NUM = re.compile(rb"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?\Z")
+# strict 모드: json.loads와 같은 범위만 허용 (제어문자 없는 문자열, 정해진 이스케이프,
+# 리터럴은 true/false/null + json.loads 기본값이 받는 NaN/Infinity/-Infinity)
+_STRICT_STR = re.compile(rb'"(?:[^"\\\x00-\x1f]|\\["\\/bfnrt]|\\u[0-9a-fA-F]{4})*"')
+_LITERALS = frozenset((b"true", b"false", b"null", b"NaN", b"Infinity", b"-Infinity"))
+
+# 파서 상태: 다음에 올 수 있는 토큰
+_VALUE, _KEY_OR_CLOSE, _VALUE_OR_CLOSE, _KEY, _NEXT = range(5)
+
+
+class Tree:
+    __slots__ = ("data", "kind", "start", "end", "key", "parent", "depth", "koff", "kcnt", "kids")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.kind = array("b")
+        self.start = array("i")
+        self.end = array("i")
+        self.key = array("i")
+        self.parent = array("i")
+        self.depth = array("i")
+        self.koff = array("i")
+        self.kcnt = array("i")
+        self.kids = array("i")
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def children(self, i: int) -> array:
+        o = self.koff[i]
+        return self.kids[o:o + self.kcnt[i]]
+
+    def span(self, i: int) -> bytes:
+        return self.data[self.start[i]:self.end[i]]
+
+    def unit(self, i: int) -> int:
+        """지우거나 복제할 단위의 시작: 객체 멤버면 key, 아니면 값."""
+        k = self.key[i]
+        return k if k >= 0 else self.start[i]
+
+    def key_span(self, i: int) -> Optional[Tuple[int, int]]:
+        """객체 멤버 i의 key 문자열 스팬 (따옴표 포함), 멤버가 아니면 None."""
+        k = self.key[i]
+        if k < 0:
+            return None
+        return k, _STRING.match(self.data, k).end()
+
+    def is_container(self, i: int) -> bool:
+        return self.kind[i] <= ARR
+
+    def nodes_of(self, kinds: Sequence[int]) -> List[int]:
+        want = set(kinds)
+        return [i for i, k in enumerate(self.kind) if k in want]
+
+    def contains(self, a: int, b: int) -> bool:
+        """a의 스팬이 b를 포함 (a가 b의 조상이거나 같음)."""
+        return self.start[a] <= self.start[b] and self.end[b] <= self.end[a]
+
+
+def parse(data, strict: bool = False) -> Tree:
+    """
+    JSON 바이트열 → Tree. 문법 오류면 ValueError. 기본은 관대함(아무 bare word나 LIT,
+    문자열 내용은 검사 안 함); strict면 리터럴/숫자/문자열 내용까지 json.loads 기준으로 검사.
+    """
+    data = bytes(data)
+    t = Tree(data)
+    kind, start, end, keys, parent, depth = t.kind.append, t.start.append, t.end, t.key.append, \
+        t.parent.append, t.depth.append
+    stack: List[int] = []
+    obj: List[bool] = []           # stack과 나란히: 열린 컨테이너가 객체인지
+    need, pos, key, n = _VALUE, 0, -1, 0
+    for m in _TOK.finditer(data):
+        g = m.lastindex
+        if m.start() != pos:
+            raise ValueError(f"unexpected input at {pos}")
+        pos = m.end()
+        if g == _G_KEY:
+            if need != _KEY and need != _KEY_OR_CLOSE:
+                raise ValueError(f"unexpected key at {m.start(g)}")
+            if strict and not _STRICT_STR.fullmatch(data, m.start(g), m.end(g)):
+                raise ValueError(f"bad string at {m.start(g)}")
+            key, need = m.start(g), _VALUE
+            continue
+        if g == _G_COMMA:
+            if need != _NEXT or not stack:
+                raise ValueError(f"unexpected ',' at {pos - 1}")
+            need = _KEY if obj[-1] else _VALUE
+            continue
+        if g == _G_CLOSE:
+            closer = data[pos - 1]
+            if not stack or not (need == _NEXT or need == (_KEY_OR_CLOSE if closer == 125 else _VALUE_OR_CLOSE)) \
+                    or obj[-1] != (closer == 125):
+                raise ValueError(f"unexpected close at {pos - 1}")
+            end[stack.pop()] = pos
+            obj.pop()
+            need = _NEXT
+            continue
+        # 값: 문자열 / 스칼라 / 여는 괄호
+        if need != _VALUE and need != _VALUE_OR_CLOSE:
+            raise ValueError(f"unexpected value at {m.start(g)}")
+        a = m.start(g)
+        if strict and (not _STRICT_STR.fullmatch(data, a, pos) if g == _G_STR else
+                       g == _G_WORD and m.group(g) not in _LITERALS and not _NUM.match(m.group(g))):
+            raise ValueError(f"bad value at {a}")
+        kind(STR if g == _G_STR else OBJ if data[a] == 123 else ARR if g == _G_OPEN
+             else NUM if _NUM.match(m.group(g)) else LIT)
+        start(a)
+        keys(key)
+        parent(stack[-1] if stack else -1)
+        depth(len(stack))
+        key = -1
+        if g == _G_OPEN:
+            end.append(-1)
+            stack.append(n)
+            is_obj = data[a] == 123
+            obj.append(is_obj)
+            need = _KEY_OR_CLOSE if is_obj else _VALUE_OR_CLOSE
+        else:
+            end.append(pos)
+            need = _NEXT
+        n += 1
+    if need != _NEXT or stack or not _WS_END.match(data, pos):
+        raise ValueError(f"unexpected input at {pos}")
+    _link(t)
+    return t
+
+
+def _link(t: Tree) -> None:
+    # 부모별 자식 수 → 누적 오프셋 → 문서 순서대로 배치 (counting sort, 안정)
+    n = len(t.kind)
+    cnt = array("i", bytes(4 * n))
+    for p in t.parent:
+        if p >= 0:
+            cnt[p] += 1
+    off = array("i", bytes(4 * n))
+    acc = 0
+    for i in range(n):
+        off[i] = acc
+        acc += cnt[i]
+    t.koff, t.kcnt = off, cnt
+    kids = array("i", bytes(4 * acc))
+    fill = array("i", off)
+    for i in range(1, n):
+        p = t.parent[i]
+        kids[fill[p]] = i
+        fill[p] += 1
+    t.kids = kids
+
+
+# ── cache / render ──────────────────────────────────────────────────────────
+_CACHE: List[Tuple[bytes, Optional[Tree]]] = []
+_CACHE_N = 2       # 부모 버퍼 + splice 상대(add_buf)
+
+
+def tree(buf) -> Optional[Tree]:
+    """buf의 Tree (JSON이 아니면 None). havoc 중 같은 부모가 반복되므로 최근 2개를 캐시."""
+    data = bytes(buf)
+    for i, (d, t) in enumerate(_CACHE):
+        if d == data:
+            if i:
+                _CACHE.insert(0, _CACHE.pop(i))
+            return t
+    try:
+        t = parse(data)
+    except (ValueError, IndexError):
+        t = None
+    _CACHE.insert(0, (data, t))
+    del _CACHE[_CACHE_N:]
+    return t
+
+
+def render(data: bytes, edits: Sequence[Tuple[int, int, bytes]], max_size: int) -> bytes:
+    """겹치지 않는 (start, end, 교체 바이트) 편집을 적용; 편집 밖은 원본 슬라이스 그대로, max_size까지만."""
+    mv = memoryview(data)
+    parts, pos = [], 0
+    for a, b, rep in sorted(edits, key=lambda e: e[0]):
+        parts.append(mv[pos:a])
+        parts.append(rep)
+        pos = b
+    parts.append(mv[pos:])
+    return join(parts, max_size)
+
+
+def join(parts, max_size: int) -> bytes:
+    """
+    bytes-like 조각들을 max_size까지만 이어 붙임. 경계를 넘는 조각은 memoryview로 잘라
+    (복사 없음) 넘친 뒤의 조각은 버리므로, 할당은 최종 출력 한 번뿐.
+    """
+    out, room = [], int(max_size)
+    for p in parts:
+        if room <= 0:
+            break
+        if len(p) > room:
+            p = memoryview(p)[:room]
+        out.append(p)
+        room -= len(p)
+    return b"".join(out)
@@ -1,6 +1,9 @@
 from typing import Any
+from functools import cached_property
 import re
 import random as _rnd
+from .json_ast import ARR, NUM, OBJ, STR, join as _join, render, tree
+from .frag_pool import MEMBER, POOL
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Helpers
@@ -38,6 +41,155 @@ def _extract_between(s: str, open_ch: str, close_ch: str):
         return None
     return s[a + 1 : b]
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Span index: 입력 버퍼를 1회만 토큰 스캔해 byte offset을 공유
+# ─────────────────────────────────────────────────────────────────────────────
+
+# 각 패턴은 문자열 토큰을 먼저 소비하므로 문자열 안의 숫자/리터럴/괄호는 건너뜀
+_STR = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+_NUM_RE  = re.compile(_STR + rb'|(-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)', re.S)
+_BOOL_RE = re.compile(_STR + rb'|(true|false)', re.S)
+_KEY_RE  = re.compile(rb'(' + _STR + rb')\s*(:)?', re.S)
+_TOK_RE  = re.compile(_STR + rb'(\s*:)?|([{}\[\],])|[^\s{}\[\],"]+', re.S)
+_COLON_RE  = re.compile(rb'\s*:\s*')
+_SCALAR_RE = re.compile(_STR + rb'|[^\s,{}\[\]":]+', re.S)
+_COMMA_RE  = re.compile(rb'\s*,')
+
+class SpanIndex:
+    """
+    버퍼 하나에 대한 토큰/스팬 인덱스. 각 항목은 처음 접근할 때 1회 스캔 후 캐시.
+      - nums / bools : 숫자 / true·false 리터럴 스팬 (문자열 밖)
+      - keys         : 객체 key 문자열 스팬 (따옴표 포함)
+      - objs / arrs  : (open, close) 괄호 위치 쌍 (닫힘 없으면 close=-1)
+      - member(k)    : keys[k]의 key:value 한 쌍을 인접 쉼표까지 포함해 지울 (start, end)
+      - last_obj_close / last_arr_close : 마지막 '}' / ']' 위치 (문자열 밖, 없으면 -1)
+    모든 스팬은 data(bytes) 기준 [start, end) 입니다.
+    """
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self._members = {}
+
+    @cached_property
+    def nums(self):
+        return [m.span(1) for m in _NUM_RE.finditer(self.data) if m.lastindex]
+
+    @cached_property
+    def bools(self):
+        return [m.span(1) for m in _BOOL_RE.finditer(self.data) if m.lastindex]
+
+    @cached_property
+    def keys(self):
+        return [m.span(1) for m in _KEY_RE.finditer(self.data) if m.lastindex == 2]
+
+    @cached_property
+    def _structure(self):
+        # 전체 토큰 스캔 + 괄호 짝 맞추기 (구조 정보가 필요한 연산자만 지불)
+        toks = [(m.start(), m.end(), m.group(2) or (b":" if m.lastindex == 1 else b""))
+                for m in _TOK_RE.finditer(self.data)]
+        n = len(toks)
+        match = [-1] * n          # 여는 괄호 토큰 -> 닫는 괄호 토큰
+        stack = []
+        last_o = last_a = -1
+        for i, (a, _, k) in enumerate(toks):
+            if k == b"{" or k == b"[":
+                stack.append(i)
+            elif k == b"}" or k == b"]":
+                if stack and toks[stack[-1]][2] == (b"{" if k == b"}" else b"["):
+                    match[stack.pop()] = i
+                if k == b"}":
+                    last_o = a
+                else:
+                    last_a = a
+
+        objs, arrs = [], []
+        for i, (a, _, k) in enumerate(toks):
+            if k == b"{" or k == b"[":
+                j = match[i]
+                (objs if k == b"{" else arrs).append((a, toks[j][0] if j >= 0 else -1))
+        return objs, arrs, last_o, last_a
+
+    @property
+    def objs(self):
+        return self._structure[0]
+
+    @property
+    def arrs(self):
+        return self._structure[1]
+
+    @cached_property
+    def last_obj_close(self):
+        return self._last_close(b"}", 2)
+
+    @cached_property
+    def last_arr_close(self):
+        return self._last_close(b"]", 3)
+
+    def _last_close(self, ch: bytes, slot: int) -> int:
+        # 흔한 경우(뒤에 문자열이 없음)는 rfind로 끝내고, 애매하면 전체 스캔
+        i = self.data.rfind(ch)
+        if i == -1 or b'"' not in self.data[i:]:
+            return i
+        return self._structure[slot]
+
+    def member(self, k: int):
+        """keys[k]부터 값 끝까지만 스캔해 삭제 범위를 계산 (값이 닫히지 않으면 None)"""
+        if k not in self._members:
+            self._members[k] = self._member_span(k)
+        return self._members[k]
+
+    def _member_span(self, k: int):
+        d = self.data
+        a, p = self.keys[k]
+        p = _COLON_RE.match(d, p).end()
+        if p >= len(d):
+            return None
+        if d[p] in b"{[":
+            depth = 0
+            for m in _TOK_RE.finditer(d, p):
+                br = m.group(2)
+                if br in (b"{", b"["):
+                    depth += 1
+                elif br in (b"}", b"]"):
+                    depth -= 1
+                    if depth == 0:
+                        p = m.end()
+                        break
+            else:
+                return None
+        else:
+            m = _SCALAR_RE.match(d, p)
+            if not m:
+                return None
+            p = m.end()
+        m = _COMMA_RE.match(d, p)
+        if m:
+            return a, m.end()
+        j = a - 1
+        while j >= 0 and d[j] in b" \t\r\n":
+            j -= 1
+        return (j if j >= 0 and d[j] == 44 else a), p   # 44 == ord(",")
+
+_IDX_LAST = None
+
+def span_index(buf) -> SpanIndex:
+    """
+    buf의 SpanIndex를 반환. havoc 중 같은 부모 버퍼가 반복 변이되므로
+    직전 인덱스(와 이미 스캔된 항목)를 재사용.
+    """
+    global _IDX_LAST
+    data = bytes(buf)
+    idx = _IDX_LAST
+    if idx is None or idx.data != data:
+        idx = _IDX_LAST = SpanIndex(data)
+    return idx
+
+def _splice(data: bytes, start: int, end: int, payload: bytes, max_size: int) -> bytearray:
+    """data[start:end]를 payload로 교체한 새 bytearray (max_size로 절단)"""
+    ba = bytearray(data)
+    ba[start:end] = payload
+    return _clip(ba, max_size)
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Base operators (Phase A: [0,1], Phase B: [0,2], Phase C: 전부)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -47,40 +199,35 @@ def op_nop(buf, add_buf, max_size, rng=None, **kw):
     return _clip(bytearray(buf), max_size)
 
 def op_flip_bool(buf, add_buf, max_size, rng=None, **kw):
-    """텍스트 기반 "true"/"false" 1회 토글"""
+    """문자열 밖 true/false 리터럴 하나를 토글"""
     try:
-        s = bytes(buf).decode("utf-8", errors="ignore")
-        if ("true" in s) or ("false" in s):
-            r = _r(rng)
-            if ("true" in s) and (r < 0.5 or "false" not in s):
-                s = s.replace("true", "false", 1)
-            elif "false" in s:
-                s = s.replace("false", "true", 1)
-            return _clip(bytearray(s.encode("utf-8", errors="ignore")), max_size)
+        idx = span_index(buf)
+        if idx.bools:
+            a, b = idx.bools[_ri(rng, 0, len(idx.bools) - 1)]
+            v = b"false" if idx.data[a:b] == b"true" else b"true"
+            return _splice(idx.data, a, b, v, max_size)
     except Exception:
         pass
     return _clip(bytearray(buf), max_size)
 
+_BOUNDARIES = [
+    b"0", b"1", b"-1",
+    b"2147483647", b"-2147483648",        # int32
+    b"4294967295",                        # uint32
+    b"9007199254740991",                  # 2^53-1 (JS max safe int)
+    b"9007199254740993",                  # 2^53+1 (precision edge)
+    b"1e308", b"-1e308", b"1e309", b"-1e309"  # big float-ish
+]
+
 def op_num_boundary(buf, add_buf, max_size, rng=None, **kw):
-    """정수 하나를 경계값으로 치환"""
+    """숫자 토큰 하나를 경계값으로 치환"""
     try:
-        s = bytes(buf).decode("utf-8", errors="ignore")
-        nums = list(re.finditer(r"-?\d+", s))
-        if not nums:
+        idx = span_index(buf)
+        if not idx.nums:
             return _clip(bytearray(buf), max_size)
-        i = _ri(rng, 0, len(nums) - 1)
-        m = nums[i]
-        boundaries = [
-            "0","1","-1",
-            "2147483647","-2147483648",        # int32
-            "4294967295",                      # uint32
-            "9007199254740991",                # 2^53-1 (JS max safe int)
-            "9007199254740993",                # 2^53+1 (precision edge)
-            "1e308","-1e308","1e309","-1e309"  # big float-ish
-        ]
-        v = boundaries[_ri(rng, 0, len(boundaries) - 1)]
-        s2 = s[:m.start()] + v + s[m.end():]
-        return _clip(bytearray(s2.encode("utf-8", errors="ignore")), max_size)
+        a, b = idx.nums[_ri(rng, 0, len(idx.nums) - 1)]
+        v = _BOUNDARIES[_ri(rng, 0, len(_BOUNDARIES) - 1)]
+        return _splice(idx.data, a, b, v, max_size)
     except Exception:
         return _clip(bytearray(buf), max_size)
 
@@ -135,33 +282,43 @@ def op_rare_token(buf, add_buf, max_size, rng=None, **kw):
     except Exception:
         return _clip(bytearray(buf), max_size)
 
+_LONG_MAX = 4096
+_AS = memoryview(b"A" * _LONG_MAX)                 # 페이로드는 이 뷰의 슬라이스 (매번 만들지 않음)
+_NEST_MAX = 8
+_NEST_OPEN = memoryview(b'"x":{' * _NEST_MAX)
+_NEST_CLOSE = memoryview(b"}" * (_NEST_MAX + 1))
+
 def op_long_string(buf, add_buf, max_size, rng=None, **kw):
-    """매우 긴 문자열 삽입 (1~4KB)"""
+    """
+    매우 긴 문자열 삽입 (1~4KB). 결과가 max_size에 들어가도록 길이를 줄이고,
+    그래도 넘치면 예산까지만 이어 붙임 (전체를 만든 뒤 자르지 않음)
+    """
     try:
-        s = bytes(buf).decode("utf-8", errors="ignore")
-        L = _ri(rng, 1024, 4096)
-        payload = '"long":"' + ("A" * L) + '"'
-        if "}" in s:
-            ins = ("," if s.rfind("{") < s.rfind("}") - 1 else "") + payload
-            s2 = _insert_before_last(s, "}", ins)
-        else:
-            s2 = "{%s}" % payload
-        return _clip(bytearray(s2.encode("utf-8", errors="ignore")), max_size)
+        data = buf if isinstance(buf, (bytes, bytearray)) else bytes(buf)
+        L = _ri(rng, 1024, _LONG_MAX)
+        close = data.rfind(b"}")
+        if close == -1:
+            L = max(1, min(L, int(max_size) - 11))
+            return _join((b'{"long":"', _AS[:L], b'"}'), max_size)
+        comma = b"," if data.rfind(b"{") < close - 1 else b""
+        room = int(max_size) - len(data) - len(comma) - 9
+        if room >= 1:
+            L = min(L, room)
+        mv = memoryview(data)
+        return _join((mv[:close], comma, b'"long":"', _AS[:L], b'"', mv[close:]), max_size)
     except Exception:
         return _clip(bytearray(buf), max_size)
 
 def op_deep_nest(buf, add_buf, max_size, rng=None, **kw):
-    """깊은 중첩 감싸기: {"x":{"x":...,"v":<원본>...}}"""
+    """깊은 중첩 감싸기: {"x":{"x":...,"v":<원본>...}} (max_size에 맞게 깊이를 줄이고, 예산까지만 씀)"""
     try:
-        s = bytes(buf).decode("utf-8", errors="ignore")
-        depth = _ri(rng, 2, 8)
-        pre = "{"
-        for _ in range(depth):
-            pre += '"x":{'
-        mid = '"v":' + s
-        post = "}" * (depth + 1)
-        s2 = pre + mid + post
-        return _clip(bytearray(s2.encode("utf-8", errors="ignore")), max_size)
+        data = buf if isinstance(buf, (bytes, bytearray)) else bytes(buf)
+        depth = _ri(rng, 2, _NEST_MAX)
+        # 감싸는 비용: '{' + '"x":{'×depth + '"v":' + '}'×(depth+1) = 6·depth + 6
+        fit = (int(max_size) - len(data) - 6) // 6
+        if fit >= 1:
+            depth = min(depth, fit)
+        return _join((b"{", _NEST_OPEN[:5 * depth], b'"v":', data, _NEST_CLOSE[:depth + 1]), max_size)
     except Exception:
         return _clip(bytearray(buf), max_size)
 
@@ -183,23 +340,18 @@ def op_utf8_edge(buf, add_buf, max_size, rng=None, **kw):
     except Exception:
         return _clip(bytearray(buf), max_size)
 
-_key_re = re.compile(r'"([A-Za-z0-9_\-\$\.\:]+)"\s*:\s*')
+_DUP_VALS = [b"null", b"true", b"false", b"0", b"1", b"-1", b'"dup"']
 
 def op_dup_keys(buf, add_buf, max_size, rng=None, **kw):
-    """객체 내 임의 key를 복제하여 중복 키 삽입"""
+    """객체 내 임의 key를 복제하여 마지막 '}' 앞에 중복 키 삽입"""
     try:
-        s = bytes(buf).decode("utf-8", errors="ignore")
-        if "}" not in s:
-            return _clip(bytearray(buf), max_size)
-        keys = list(_key_re.finditer(s))
-        if not keys:
+        idx = span_index(buf)
+        if idx.last_obj_close < 0 or not idx.keys:
             return _clip(bytearray(buf), max_size)
-        m = keys[_ri(rng, 0, len(keys) - 1)]
-        key = m.group(1)
-        val = _rnd.choice(["null", "true", "false", "0", "1", "-1", "\"dup\""])
-        ins = f',"{key}":{val}'
-        s2 = _insert_before_last(s, "}", ins)
-        return _clip(bytearray(s2.encode("utf-8", errors="ignore")), max_size)
+        a, b = idx.keys[_ri(rng, 0, len(idx.keys) - 1)]
+        val = _DUP_VALS[_ri(rng, 0, len(_DUP_VALS) - 1)]
+        pos = idx.last_obj_close
+        return _splice(idx.data, pos, pos, b"," + idx.data[a:b] + b":" + val, max_size)
     except Exception:
         return _clip(bytearray(buf), max_size)
 
@@ -225,18 +377,15 @@ def op_add_field(buf, add_buf, max_size, rng=None, **kw):
         return _clip(bytearray(buf), max_size)
 
 def op_delete_field(buf, add_buf, max_size, rng=None, **kw):
-    """임의 key:value 한 쌍 삭제(러프한 정규식 기반)"""
+    """임의 key:value 한 쌍 삭제 (중첩 값 포함, 인접 쉼표 정리)"""
     try:
-        s = bytes(buf).decode("utf-8", errors="ignore")
-        pairs = list(re.finditer(r'"[A-Za-z0-9_\-\$\.\:]+"\s*:\s*[^,}]*', s))
-        if not pairs:
+        idx = span_index(buf)
+        if not idx.keys:
             return _clip(bytearray(buf), max_size)
-        m = pairs[_ri(rng, 0, len(pairs) - 1)]
-        end = m.end()
-        if end < len(s) and s[end:end+1] == ",":
-            end += 1
-        s2 = s[:m.start()] + s[end:]
-        return _clip(bytearray(s2.encode("utf-8", errors="ignore")), max_size)
+        span = idx.member(_ri(rng, 0, len(idx.keys) - 1))
+        if span is None:
+            return _clip(bytearray(buf), max_size)
+        return _splice(idx.data, span[0], span[1], b"", max_size)
     except Exception:
         return _clip(bytearray(buf), max_size)
 
@@ -293,8 +442,205 @@ OPS += [
 ]
 
 __all__ = [
-    "OPS",
+    "OPS", "SpanIndex", "span_index",
     "op_nop", "op_flip_bool", "op_num_boundary",
     "op_fix_basic", "op_rare_token", "op_long_string", "op_deep_nest", "op_utf8_edge",
     "op_dup_keys", "op_add_field", "op_delete_field", "op_splice_objects", "op_splice_arrays",
 ]
+
+# ─────────────────────────────────────────────────────────────────────────────
+# AST operator pack v2 (json_ast.Tree 편집; Phase C)
+# 버퍼를 평면 노드 테이블로 한 번 파싱(최근 2개 캐시)하고, 바뀐 스팬만 다시 써서 렌더.
+# 유효 JSON 입력이면 출력도 유효 (max_size 절단 제외). JSON이 아니면 입력 그대로.
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _pick(rng, xs):
+    return xs[_ri(rng, 0, len(xs) - 1)]
+
+def _donor(add_buf, t):
+    # splice 상대: add_buf가 JSON이면 그 트리, 아니면 자기 자신
+    d = tree(add_buf) if add_buf else None
+    return d if d is not None and len(d) else t
+
+def op_ast_replace(buf, add_buf, max_size, rng=None, **kw):
+    """임의 값 하나를 add_buf(또는 자신)의 임의 서브트리로 교체"""
+    try:
+        t = tree(buf)
+        if t is None or len(t) < 2:
+            return _clip(bytearray(buf), max_size)
+        i = _ri(rng, 1, len(t) - 1)
+        d = _donor(add_buf, t)
+        j = _ri(rng, 0, len(d) - 1)
+        return render(t.data, [(t.start[i], t.end[i], d.span(j))], max_size)
+    except Exception:
+        return _clip(bytearray(buf), max_size)
+
+def op_ast_swap(buf, add_buf, max_size, rng=None, **kw):
+    """서로 포함하지 않는 두 값의 자리를 맞바꿈"""
+    try:
+        t = tree(buf)
+        if t is None or len(t) < 3:
+            return _clip(bytearray(buf), max_size)
+        for _ in range(4):
+            a, b = _ri(rng, 1, len(t) - 1), _ri(rng, 1, len(t) - 1)
+            if not (t.contains(a, b) or t.contains(b, a)):
+                return render(t.data, [(t.start[a], t.end[a], t.span(b)),
+                                       (t.start[b], t.end[b], t.span(a))], max_size)
+        return _clip(bytearray(buf), max_size)
+    except Exception:
+        return _clip(bytearray(buf), max_size)
+
+def op_ast_dup(buf, add_buf, max_size, rng=None, **kw):
+    """배열 원소/객체 멤버 하나를 바로 뒤에 복제 (객체면 중복 키)"""
+    try:
+        t = tree(buf)
+        if t is None or len(t) < 2:
+            return _clip(bytearray(buf), max_size)
+        i = _ri(rng, 1, len(t) - 1)
+        e = t.end[i]
+        return render(t.data, [(e, e, b"," + t.data[t.unit(i):e])], max_size)
+    except Exception:
+        return _clip(bytearray(buf), max_size)
+
+def op_ast_deepen(buf, add_buf, max_size, rng=None, **kw):
+    """임의 값 하나를 1~4단 배열/객체로 감쌈"""
+    try:
+        t = tree(buf)
+        if t is None:
+            return _clip(bytearray(buf), max_size)
+        i = _ri(rng, 0, len(t) - 1)
+        pre, post = [], []
+        for _ in range(_ri(rng, 1, 4)):
+            if _r(rng) < 0.5:
+                pre.append(b"["); post.append(b"]")
+            else:
+                pre.append(b'{"d":'); post.append(b"}")
+        rep = b"".join(pre) + t.span(i) + b"".join(reversed(post))
+        return render(t.data, [(t.start[i], t.end[i], rep)], max_size)
+    except Exception:
+        return _clip(bytearray(buf), max_size)
+
+_NUM_EDGE = _BOUNDARIES + [b"-0", b"0.0", b"1e-400", b"123456789012345678901234567890",
+                           b"0.30000000000000004", b"-9223372036854775808", b"18446744073709551616"]
+
+def op_ast_num(buf, add_buf, max_size, rng=None, **kw):
+    """숫자 노드 하나: 경계값 / ±1 / 부호 반전 / 지수 확대"""
+    try:
+        t = tree(buf)
+        nums = t.nodes_of((NUM,)) if t is not None else []
+        if not nums:
+            return _clip(bytearray(buf), max_size)
+        i = _pick(rng, nums)
+        v = t.span(i)
+        r = _ri(rng, 0, 3)
+        if r == 0 or not v.lstrip(b"-").isdigit():
+            rep = _pick(rng, _NUM_EDGE)
+        elif r == 1:
+            rep = str(int(v) + _pick(rng, (-1, 1))).encode()
+        elif r == 2:
+            rep = v[1:] if v.startswith(b"-") else b"-" + v
+        else:
+            rep = v + b"e" + str(_ri(rng, 1, 400)).encode()
+        return render(t.data, [(t.start[i], t.end[i], rep)], max_size)
+    except Exception:
+        return _clip(bytearray(buf), max_size)
+
+_STR_EDGE = [b'""', b'"\\u0000"', b'"\\ud800"', b'"\\udfff\\ud800"', b'"\\\\"', b'"\\"\\/\\b\\f\\n\\r\\t"',
+             b'"\xc3\xa9\xe2\x82\xac\xf0\x9f\x98\x80"', b'"\\u00e9"', b'"' + b"A" * 256 + b'"']
+_STR_TAIL = [b"\\u0000", b"\\ud800", b"\\n", b"\\\\", b"\\\"", b"\xe2\x80\xae", b"%s%n"]
+
+def op_ast_str(buf, add_buf, max_size, rng=None, **kw):
+    """문자열 노드(값 또는 키) 하나: 경계 문자열로 교체 또는 끝에 이스케이프 덧붙임"""
+    try:
+        t = tree(buf)
+        if t is None:
+            return _clip(bytearray(buf), max_size)
+        strs = t.nodes_of((STR,))
+        keyed = [i for i in range(len(t)) if t.key[i] >= 0]
+        if not strs and not keyed:
+            return _clip(bytearray(buf), max_size)
+        if keyed and (not strs or _r(rng) < 0.3):
+            a, b = t.key_span(_pick(rng, keyed))
+        else:
+            i = _pick(rng, strs)
+            a, b = t.start[i], t.end[i]
+        if _r(rng) < 0.5:
+            rep = _pick(rng, _STR_EDGE)
+        else:
+            rep = t.data[a:b - 1] + _pick(rng, _STR_TAIL) + b'"'
+        return render(t.data, [(a, b, rep)], max_size)
+    except Exception:
+        return _clip(bytearray(buf), max_size)
+
+AST_OPS = [
+    op_ast_replace,
+    op_ast_swap,
+    op_ast_dup,
+    op_ast_deepen,
+    op_ast_num,
+    op_ast_str,
+]
+OPS += AST_OPS
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Fragment pool splicing (frag_pool.POOL; Phase C)
+# queue_new_entry로 모은 다른 큐 항목의 서브트리를 O(1)로 꺼내 씀 (add_buf 하나에 묶이지 않음).
+# 풀이 비었거나 꺼져 있으면 add_buf(또는 자신)의 서브트리로 대체.
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _member(d, rng):
+    # 대체 멤버: donor 트리의 객체 멤버, 없으면 아무 값에 키를 붙여서
+    keyed = [i for i in range(len(d)) if d.key[i] >= 0]
+    if keyed:
+        i = _pick(rng, keyed)
+        return d.data[d.key[i]:d.end[i]]
+    return b'"p":' + d.span(_ri(rng, 0, len(d) - 1))
+
+def op_pool_replace(buf, add_buf, max_size, rng=None, **kw):
+    """값 하나를 풀에서 꺼낸 같은 종류·비슷한 깊이의 조각으로 교체"""
+    try:
+        t = tree(buf)
+        if t is None:
+            return _clip(bytearray(buf), max_size)
+        i = _ri(rng, 1 if len(t) > 1 else 0, len(t) - 1)
+        frag = POOL.draw(t.kind[i], t.depth[i]) if POOL is not None else None
+        if frag is None:
+            d = _donor(add_buf, t)
+            frag = d.span(_ri(rng, 0, len(d) - 1))
+        return render(t.data, [(t.start[i], t.end[i], frag)], max_size)
+    except Exception:
+        return _clip(bytearray(buf), max_size)
+
+def op_pool_insert(buf, add_buf, max_size, rng=None, **kw):
+    """객체에는 풀의 멤버를, 배열에는 풀의 값을 임의 위치에 끼워 넣음"""
+    try:
+        t = tree(buf)
+        conts = t.nodes_of((OBJ, ARR)) if t is not None else []
+        if not conts:
+            return _clip(bytearray(buf), max_size)
+        c = _pick(rng, conts)
+        is_obj = t.kind[c] == OBJ
+        frag = None
+        if POOL is not None:
+            frag = POOL.draw(MEMBER, t.depth[c] + 1) if is_obj else POOL.draw_value(t.depth[c] + 1)
+        if frag is None:
+            d = _donor(add_buf, t)
+            frag = _member(d, rng) if is_obj else d.span(_ri(rng, 0, len(d) - 1))
+        kids = t.children(c)
+        if not kids:
+            at = t.start[c] + 1
+            return render(t.data, [(at, at, frag)], max_size)
+        k = _ri(rng, 0, len(kids))
+        if k == len(kids):
+            at = t.end[kids[-1]]
+            return render(t.data, [(at, at, b"," + frag)], max_size)
+        at = t.unit(kids[k])
+        return render(t.data, [(at, at, frag + b",")], max_size)
+    except Exception:
+        return _clip(bytearray(buf), max_size)
+
+POOL_OPS = [
+    op_pool_replace,
+    op_pool_insert,
+]
+OPS += POOL_OPS
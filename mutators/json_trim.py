@@ -0,0 +1,159 @@
+# mutators/json_trim.py
+# Structure-aware trimming for AFL++ custom mutators (init_trim/trim/post_trim).
+# AFL's byte trimmer chops JSON into unparseable junk; this one only proposes
+# structurally valid deletions of a valid JSON input:
+#   1. drop insignificant whitespace (one step)
+#   2. per container, outermost first: delta-debugging style removal of
+#      member/element chunks (all children, then halves, quarters, ... single
+#      children), then hoisting (replace the container with a descendant value
+#      down its smallest-child chain, farthest first, halving the distance)
+# The plan is a generator that stays alive between trim()/post_trim() calls:
+# it yields the next candidate and receives whether AFL kept it (same
+# coverage), so accepted deletions are applied before the next proposal.
+# Nodes come from the flat json_ast.Tree (re-parsed after each accepted step).
+#
+#   t = Trimmer()
+#   steps = t.init(buf)          # 0 → not JSON, AFL skips trimming
+#   cand = t.trim(); nxt = t.post_trim(success)   # until nxt >= steps
+
+import json, re
+from collections import deque
+from typing import Generator, Optional, Tuple
+try:
+    from .json_ast import Tree, parse
+except ImportError:  # loaded as a top-level module (PYTHONPATH=mutators)
+    from json_ast import Tree, parse
+
+MAX_STEPS = 2048          # 한 입력에 쓰는 trim 실행 상한
+HOIST_TRIES = 2           # 컨테이너마다 자식으로 끌어올리기 시도 수 (작은 자식부터)
+
+_WS_OR_STR = re.compile(rb'("(?:[^"\\]|\\.)*")|[ \t\n\r]+', re.S)
+
+
+def _at(t: Tree, path: Tuple[int, ...]) -> int:
+    """루트에서 자식 인덱스 경로를 따라간 노드 (없으면 -1)."""
+    node = 0
+    for k in path:
+        if k >= t.kcnt[node]:
+            return -1
+        node = t.kids[t.koff[node] + k]
+    return node
+
+
+def _remove(t: Tree, node: int, i: int, j: int) -> bytes:
+    """node의 자식 [i, j)를 쉼표까지 함께 지운 바이트열."""
+    kids = t.children(node)
+    if j < len(kids):
+        a, b = t.unit(kids[i]), t.unit(kids[j])          # 뒤따르는 쉼표 포함
+    elif i > 0:
+        a, b = t.end[kids[i - 1]], t.end[kids[j - 1]]    # 앞 쉼표 포함
+    else:
+        a, b = t.unit(kids[0]), t.end[kids[-1]]
+    return t.data[:a] + t.data[b:]
+
+
+def compact(data: bytes) -> bytes:
+    """문자열 밖 공백 제거 (토큰은 그대로)."""
+    return _WS_OR_STR.sub(lambda m: m.group(1) or b"", data)
+
+
+class Trimmer:
+    def __init__(self, max_steps: int = MAX_STEPS):
+        self.max_steps = int(max_steps)
+        self.data = b""
+        self.steps = 0
+        self.step = 0
+        self._gen: Optional[Generator] = None
+        self._cand: Optional[bytes] = None
+
+    def init(self, buf) -> int:
+        self.data = bytes(buf)
+        self.step = self.steps = 0
+        self._gen = self._cand = None
+        try:
+            json.loads(self.data)
+        except ValueError:
+            return 0
+        except RecursionError:
+            pass                                 # 너무 깊음: 구조 검사는 parse()가 (스택 기반)
+        try:
+            t = parse(self.data)
+        except ValueError:
+            return 0
+        # 단계 수 추정 (진행 표시/상한용): 컨테이너마다 자식 수 × 2 + 끌어올리기
+        est = 1
+        for i in range(len(t)):
+            if t.is_container(i):
+                est += 2 * t.kcnt[i] + HOIST_TRIES
+        self._gen = self._plan()
+        self._cand = next(self._gen, None)
+        if self._cand is None:
+            return 0
+        self.steps = min(est, self.max_steps)
+        return self.steps
+
+    def trim(self) -> bytearray:
+        return bytearray(self._cand if self._cand is not None else self.data)
+
+    def post_trim(self, success) -> int:
+        self.step += 1
+        try:
+            self._cand = self._gen.send(bool(success)) if self._gen is not None else None
+        except StopIteration:
+            self._cand = None
+        if self._cand is None or self.step >= self.steps:
+            self._gen = self._cand = None
+            return self.steps
+        return self.step
+
+    # ── plan ────────────────────────────────────────────────────────────────
+    def _plan(self):
+        """후보를 하나씩 yield, AFL이 받아들였는지(bool)를 send로 받음."""
+        c = compact(self.data)
+        if len(c) < len(self.data) and (yield c):
+            self.data = c
+        t = parse(self.data)
+        queue = deque([()])                      # 컨테이너 경로 (루트부터 자식 인덱스), 바깥부터
+        while queue:
+            path = queue.popleft()
+            node = _at(t, path)
+            if node < 0 or not t.is_container(node):
+                continue
+            # 1) 자식 덩어리 삭제: 전부 → 절반 → … → 하나씩
+            size = t.kcnt[node]
+            while size >= 1 and t.kcnt[node]:
+                i = 0
+                while i < t.kcnt[node]:
+                    j = min(i + size, t.kcnt[node])
+                    cand = _remove(t, node, i, j)
+                    if (yield cand):
+                        self.data = cand
+                        t = parse(cand)
+                        node = _at(t, path)      # 지운 뒤 i번째에 다음 덩어리가 옴
+                    else:
+                        i += size
+                size = min(size // 2, t.kcnt[node]) if size > 1 else 0
+            # 2) 끌어올리기: 컨테이너를 자손 값 하나로 교체 (작은 자식부터).
+            #    가장 작은 자식을 따라 내려가는 사슬에서 먼 자손부터 절반씩: 깊은 중첩도 O(log) 실행
+            width = lambda x: t.end[x] - t.start[x]
+            hoisted = False
+            for c in sorted(t.children(node), key=width)[:HOIST_TRIES]:
+                chain = [c]
+                while t.kcnt[chain[-1]]:
+                    chain.append(min(t.children(chain[-1]), key=width))
+                d = len(chain)
+                while d >= 1:
+                    kid = chain[d - 1]
+                    cand = self.data[:t.start[node]] + t.span(kid) + self.data[t.end[node]:]
+                    if (yield cand):
+                        self.data = cand
+                        t = parse(cand)
+                        hoisted = True
+                        break
+                    d //= 2
+                if hoisted:
+                    break
+            if hoisted:
+                queue.appendleft(path)           # 같은 자리에 올라온 값부터 다시
+                continue
+            queue.extend(path + (k,) for k, c in enumerate(t.children(node)) if t.is_container(c))
@@ -0,0 +1,206 @@
+# mutators/op_profile.py
+# Opt-in per-operator profiler for json_adapt (RAGFUZZ_PROFILE=1 or a path).
+# Counters live in plain lists indexed by operator; per call the hot path only
+# does a few list increments and one bit_length() for the latency histogram
+# (bucket b = ns.bit_length(), i.e. [2^(b-1), 2^b) ns).
+# Every `every` seconds the cumulative totals are rewritten atomically to a
+# JSON sidecar, by default <instance dir>/op_profile.json next to fuzzer_stats:
+# the instance dir is the one under $AFL_OUT_DIR whose fuzzer_stats carries our
+# pid (afl-fuzz runs the Python mutator in-process). Without AFL_OUT_DIR the
+# file goes to $RAGFUZZ_OPLOG_DIR/profile_<pid>.json.
+#
+#   prof = OpProfiler.from_env(["op_nop", ...])     # None unless enabled
+#   prof.op(i, ns, len(out) - len(buf)); prof.parse(i, ns, ok); prof.fuzz(ns)
+#   tools/op_report.py out/x/default/op_profile.json
+
+import glob, json, os, time
+from typing import List, Optional, Sequence
+
+SIDECAR = "op_profile.json"
+NBUCKET = 40                 # 2^39 ns ≈ 9분: 그 이상은 마지막 버킷
+_CHECK_EVERY = 256           # fuzz() 호출 256번마다 한 번만 시계 확인
+_OFF = ("", "0", "no", "off", "false")
+
+
+def find_instance(out_dir: str, pid: int) -> Optional[str]:
+    # out_dir 자체가 인스턴스 디렉터리일 수도 있음 (-o 대신 인스턴스 경로를 넘긴 경우)
+    for stats in [os.path.join(out_dir, "fuzzer_stats")] + glob.glob(os.path.join(out_dir, "*", "fuzzer_stats")):
+        try:
+            with open(stats, "r", encoding="utf-8", errors="replace") as f:
+                for ln in f:
+                    k, _, v = ln.partition(":")
+                    if k.strip() == "fuzzer_pid":
+                        if v.strip() == str(pid):
+                            return os.path.dirname(stats)
+                        break
+        except OSError:
+            continue
+    return None
+
+
+class OpProfiler:
+    def __init__(self, names: Sequence[str], path: Optional[str] = None, every: float = 10.0):
+        self.names = list(names)
+        n = len(self.names)
+        self.path = path
+        self.every = float(every)
+        self.pid = os.getpid()
+        self.calls = [0] * n
+        self.ns = [0] * n
+        self.delta = [0] * n         # 출력 크기 - 입력 크기 합
+        self.hist = [[0] * NBUCKET for _ in range(n)]
+        self.parsed = [0] * n
+        self.parse_ok = [0] * n
+        self.parse_ns = [0] * n
+        self.parse_hist = [0] * NBUCKET
+        self.fuzz_calls = 0
+        self.fuzz_ns = 0
+        self.fuzz_hist = [0] * NBUCKET
+        self.started = time.time()
+        self._t0 = time.monotonic()
+        self._next = self._t0 + self.every
+        self._tick = 0
+
+    @classmethod
+    def from_env(cls, names: Sequence[str]) -> Optional["OpProfiler"]:
+        v = os.environ.get("RAGFUZZ_PROFILE", "").strip()
+        if v.lower() in _OFF:
+            return None
+        try:
+            every = float(os.environ.get("RAGFUZZ_PROFILE_EVERY", "10"))
+        except ValueError:
+            every = 10.0
+        path = None if v.lower() in ("1", "yes", "on", "true") else v
+        return cls(names, path=path, every=every)
+
+    # ── hot path ────────────────────────────────────────────────────────────
+    def op(self, i: int, ns: int, delta: int) -> None:
+        self.calls[i] += 1
+        self.ns[i] += ns
+        self.delta[i] += delta
+        self.hist[i][min(ns.bit_length(), NBUCKET - 1)] += 1
+
+    def parse(self, i: int, ns: int, ok: bool) -> None:
+        self.parsed[i] += 1
+        self.parse_ns[i] += ns
+        if ok:
+            self.parse_ok[i] += 1
+        self.parse_hist[min(ns.bit_length(), NBUCKET - 1)] += 1
+
+    def fuzz(self, ns: int) -> None:
+        self.fuzz_calls += 1
+        self.fuzz_ns += ns
+        self.fuzz_hist[min(ns.bit_length(), NBUCKET - 1)] += 1
+        self._tick += 1
+        if self._tick >= _CHECK_EVERY:
+            self._tick = 0
+            if time.monotonic() >= self._next:
+                self.flush()
+
+    # ── sidecar ─────────────────────────────────────────────────────────────
+    def _resolve(self, final: bool) -> Optional[str]:
+        if self.path:
+            return self.path
+        out = os.environ.get("AFL_OUT_DIR")
+        if out:
+            inst = find_instance(out, self.pid)
+            if inst:
+                self.path = os.path.join(inst, SIDECAR)
+                return self.path
+            if not final:
+                return None          # fuzzer_stats가 아직 없음: 다음 주기에 재시도
+        log_dir = os.environ.get("RAGFUZZ_OPLOG_DIR", "mutators/oplog")
+        return os.path.join(log_dir, f"profile_{self.pid}.json")
+
+    def snapshot(self) -> dict:
+        ops = {}
+        for i, name in enumerate(self.names):
+            ops[name] = {"calls": self.calls[i], "ns": self.ns[i], "delta": self.delta[i],
+                         "parsed": self.parsed[i], "parse_ok": self.parse_ok[i],
+                         "parse_ns": self.parse_ns[i], "hist": self.hist[i]}
+        return {"version": 1, "pid": self.pid, "started": self.started, "updated": time.time(),
+                "wall_ns": int((time.monotonic() - self._t0) * 1e9),
+                "fuzz": {"calls": self.fuzz_calls, "ns": self.fuzz_ns, "hist": self.fuzz_hist},
+                "parse": {"calls": sum(self.parsed), "ns": sum(self.parse_ns), "hist": self.parse_hist},
+                "ops": ops}
+
+    def flush(self, final: bool = False) -> None:
+        self._next = time.monotonic() + self.every
+        try:
+            path = self._resolve(final)
+            if not path:
+                return
+            d = os.path.dirname(path)
+            if d:
+                os.makedirs(d, exist_ok=True)
+            tmp = f"{path}.{self.pid}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, separators=(",", ":"))
+            os.replace(tmp, path)
+        except Exception:
+            pass
+
+
+# ── report helpers (tools/op_report.py) ─────────────────────────────────────
+def load(paths: Sequence[str]) -> List[dict]:
+    """
+    사이드카 파일/디렉터리 → 스냅샷 목록. 디렉터리는 하위 *.json을 모두 열어 보고
+    프로파일 스냅샷("version"과 "ops" 키가 있는 객체)만 남김: RAGFUZZ_PROFILE=<경로>로
+    이름을 바꾼 사이드카도 찾음.
+    """
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            files += glob.glob(os.path.join(p, "**", "*.json"), recursive=True)
+        else:
+            files.append(p)
+    out = []
+    for p in sorted(set(files)):
+        try:
+            with open(p, "r", encoding="utf-8") as f:
+                d = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if isinstance(d, dict) and "version" in d and isinstance(d.get("ops"), dict):
+            d["path"] = p
+            out.append(d)
+    return out
+
+
+def merge(snaps: Sequence[dict]) -> dict:
+    """여러 인스턴스 스냅샷 합산 (wall_ns도 합: 비율은 인스턴스-시간 기준)."""
+    def add_hist(a, b):
+        if len(a) < len(b):
+            a.extend([0] * (len(b) - len(a)))
+        for i, x in enumerate(b):
+            a[i] += x
+
+    tot = {"wall_ns": 0, "fuzz": {"calls": 0, "ns": 0, "hist": []},
+           "parse": {"calls": 0, "ns": 0, "hist": []}, "ops": {}}
+    for s in snaps:
+        tot["wall_ns"] += s.get("wall_ns", 0)
+        for sec in ("fuzz", "parse"):
+            src = s.get(sec, {})
+            tot[sec]["calls"] += src.get("calls", 0)
+            tot[sec]["ns"] += src.get("ns", 0)
+            add_hist(tot[sec]["hist"], src.get("hist", []))
+        for name, o in s.get("ops", {}).items():
+            t = tot["ops"].setdefault(name, {"calls": 0, "ns": 0, "delta": 0, "parsed": 0,
+                                             "parse_ok": 0, "parse_ns": 0, "hist": []})
+            for k in ("calls", "ns", "delta", "parsed", "parse_ok", "parse_ns"):
+                t[k] += o.get(k, 0)
+            add_hist(t["hist"], o.get("hist", []))
+    return tot
+
+
+def quantile_ns(hist: Sequence[int], q: float) -> int:
+    """log2 히스토그램 분위수 (버킷 상한 2^b ns로 근사)."""
+    n = sum(hist)
+    if not n:
+        return 0
+    want, acc = q * n, 0
+    for b, c in enumerate(hist):
+        acc += c
+        if acc >= want:
+            return 1 << b
+    return 1 << (len(hist) - 1)
@@ -0,0 +1,130 @@
+# mutators/op_ring.py
+# Per-instance ring file of per-operator attempt / queue-hit records.
+# One afl-fuzz instance (single writer, its mutator) appends; reward_poller
+# tails it to attribute paths/crash deltas to the operators that produced them.
+#
+# Layout (little endian):
+#   0  magic  4s   b"RFOR"
+#   4  n_ops  u32
+#   8  crc    u32  crc32 of "\n".join(ops)
+#   12 cap    u32  record slots
+#   16 head   u64  total records ever written (slot = head % cap)
+#   24 cap × record(op u16, kind u16, n u32)
+#
+# The writer fills a slot, then bumps head, so no lock is needed; a reader
+# that fell more than cap records behind just skips what was overwritten.
+
+import mmap, os, struct, zlib
+from typing import List, Optional, Sequence, Tuple
+
+MAGIC = b"RFOR"
+K_ATTEMPT = 0
+K_HIT = 1
+_HDR = struct.Struct("<4sIIIQ")
+_HEAD_OFF = 16
+_HEAD = struct.Struct("<Q")
+_REC = struct.Struct("<HHI")
+
+def ring_path(log_dir: str, pid: int) -> str:
+    return os.path.join(log_dir, f"op_{int(pid)}.ring")
+
+def _ops_crc(ops: Sequence[str]) -> int:
+    return zlib.crc32("\n".join(ops).encode("utf-8")) & 0xFFFFFFFF
+
+
+class OpRingWriter:
+    def __init__(self, path: str, ops: Sequence[str], cap: int = 4096, flush_every: int = 256):
+        self.n = len(ops)
+        self.cap = int(cap)
+        self.flush_every = int(flush_every)
+        self._attempts = [0] * self.n
+        self._pending = 0
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        # 항상 새 파일로 교체: 같은 pid 재사용 시 이전 실행 기록과 섞이지 않음
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HDR.pack(MAGIC, self.n, _ops_crc(ops), self.cap, 0))
+            f.write(b"\0" * (self.cap * _REC.size))
+        os.replace(tmp, path)
+        with open(path, "r+b") as f:
+            self._mm = mmap.mmap(f.fileno(), 0)
+        self._head = 0
+
+    def _append(self, op: int, kind: int, n: int) -> None:
+        _REC.pack_into(self._mm, _HDR.size + (self._head % self.cap) * _REC.size, op, kind, n)
+        self._head += 1
+        _HEAD.pack_into(self._mm, _HEAD_OFF, self._head)
+
+    def attempt(self, op: int) -> None:
+        # 실행마다 레코드를 쓰지 않고 메모리에서 누적 후 flush_every마다 기록
+        self._attempts[op] += 1
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def hit(self, op: int) -> None:
+        self.flush()
+        self._append(op, K_HIT, 1)
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        for i, c in enumerate(self._attempts):
+            if c:
+                self._append(i, K_ATTEMPT, c)
+                self._attempts[i] = 0
+        self._pending = 0
+
+
+class OpRingReader:
+    def __init__(self, path: str, ops: Sequence[str]):
+        self.path = path
+        self.ops = list(ops)
+        self.n = len(self.ops)
+        self._mm = None
+        self._ino = None
+        self._tail = 0
+
+    def _reopen(self) -> bool:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False
+        if self._mm is not None and st.st_ino == self._ino:
+            return True
+        try:
+            with open(self.path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, n, crc, cap, _ = _HDR.unpack_from(mm, 0)
+        except (OSError, ValueError, struct.error):
+            return False
+        if magic != MAGIC or n != self.n or crc != _ops_crc(self.ops) \
+                or len(mm) < _HDR.size + cap * _REC.size:
+            mm.close()
+            return False
+        if self._mm is not None:
+            self._mm.close()
+        self._mm, self._ino, self._cap, self._tail = mm, st.st_ino, cap, 0
+        return True
+
+    def poll(self) -> Optional[Tuple[List[int], List[int]]]:
+        """Records appended since the last poll as (attempts, hits) per op; None if no ring."""
+        if not self._reopen():
+            return None
+        head = _HEAD.unpack_from(self._mm, _HEAD_OFF)[0]
+        if head < self._tail:          # 파일이 재생성됨
+            self._tail = 0
+        start = max(self._tail, head - self._cap)
+        attempts, hits = [0] * self.n, [0] * self.n
+        for seq in range(start, head):
+            op, kind, n = _REC.unpack_from(self._mm, _HDR.size + (seq % self._cap) * _REC.size)
+            if op >= self.n:
+                continue
+            if kind == K_HIT:
+                hits[op] += n
+            else:
+                attempts[op] += n
+        self._tail = head
+        return attempts, hits
@@ -0,0 +1,172 @@
+# mutators/phase_rate.py
+# Phase control for json_adapt's A/B/C curriculum from a sampled, decaying
+# parse rate. Only about one output in `period` is validated: a countdown with
+# a random gap in [1, 2·period − 1] (mean = period, no aliasing with batch or
+# scheduler patterns), so the hot path is one decrement. Each operator keeps
+# exponentially decayed ok/total counts (half-life HALF samples of that op),
+# and the phase signal is the mean rate of the ops in the current phase that
+# have enough samples. Moves go both ways with hysteresis: up when the signal
+# reaches UP[phase], down when it falls HYST below the threshold that let us
+# in, never twice within DWELL samples.
+#
+# The plateau flag written by tools/phase_ctl.py (<instance>/phase_ctl.json)
+# is re-read only when the file's mtime changes (stat at most every CHECK_SEC):
+# a rising edge promotes one phase (B→C), in the top phase it calls on_reset
+# (EMA reset), and while it is set the rate cannot demote.
+#
+#   pc = PhaseControl(n_ops, (PHASE_A, PHASE_B, PHASE_C), on_reset=sched.reset_scores)
+#   if pc.sample(): ok = valid(out); pc.record(op, ok)
+#   allowed = pc.ops                       # current phase's op tuple
+import codecs, json, math, os, random, time
+from typing import Callable, Optional, Sequence, Tuple
+from .json_ast import parse
+from .op_profile import find_instance
+
+PERIOD = 8                  # 평균 몇 개 출력마다 한 번 검사할지 (1 = 전부)
+HALF = 128                  # 연산자별 감쇠 반감기 (그 연산자의 표본 수)
+MIN_N = 8.0                 # 이보다 (감쇠된) 표본이 적은 연산자는 신호에서 제외
+UP = (0.50, 0.90)           # A→B, B→C 진입 파싱률
+HYST = 0.10                 # 강등은 진입 임계 − HYST 미만일 때
+DWELL = 256                 # 전이 후 이만큼 표본이 쌓이기 전엔 다시 전이하지 않음
+CHECK_SEC = 2.0             # phase_ctl.json stat 주기
+SIDECAR = "phase_ctl.json"
+
+
+def valid(buf) -> bool:
+    """
+    출력이 JSON인지: json.loads(C 스캐너). 재귀 한도를 넘는 깊은 중첩만 스택 기반
+    parse(strict=True)로 (UTF-8 디코딩 + 리터럴/숫자/문자열 검사까지 json.loads와 같은 기준).
+    """
+    try:
+        json.loads(buf)
+        return True
+    except RecursionError:
+        try:
+            data = bytes(buf)
+            if data.startswith(codecs.BOM_UTF8):
+                data = data[3:]                                # json.loads(bytes)처럼 BOM 무시
+            data.decode("utf-8", "surrogatepass")              # ... 같은 디코딩 규칙
+            parse(data, strict=True)
+            return True
+        except (ValueError, IndexError):
+            return False
+    except Exception:
+        return False
+
+
+class PhaseControl:
+    def __init__(self, n_ops: int, phases: Sequence[Tuple[int, ...]], period: int = PERIOD,
+                 ctl_path: Optional[str] = None, on_reset: Optional[Callable[[], None]] = None,
+                 rng: Optional[random.Random] = None):
+        self.phases = tuple(phases)
+        self.period = max(1, int(period))
+        self.rng = rng or random.Random()
+        self.on_reset = on_reset
+        self.decay = math.pow(0.5, 1.0 / HALF)
+        self.ok = [0.0] * n_ops
+        self.n = [0.0] * n_ops
+        self.phase = 0
+        self.ops = self.phases[0]
+        self.samples = 0
+        self.moved_at = 0                  # 마지막 전이 때의 samples
+        self.plateau = False
+        self._left = self._gap()
+        self._ctl_path = ctl_path
+        self._ctl_mtime = None
+        self._next_check = 0.0
+
+    @classmethod
+    def from_env(cls, n_ops: int, phases, on_reset=None, rng=None) -> "PhaseControl":
+        try:
+            period = int(os.environ.get("RAGFUZZ_PARSE_SAMPLE", str(PERIOD)))
+        except ValueError:
+            period = PERIOD
+        return cls(n_ops, phases, period=period, ctl_path=os.environ.get("RAGFUZZ_PHASE_CTL") or None,
+                   on_reset=on_reset, rng=rng)
+
+    def _gap(self) -> int:
+        return 1 if self.period == 1 else self.rng.randint(1, 2 * self.period - 1)
+
+    # ── hot path ────────────────────────────────────────────────────────────
+    def sample(self) -> bool:
+        """이번 출력을 검사할 차례인지."""
+        self._left -= 1
+        if self._left > 0:
+            return False
+        self._left = self._gap()
+        return True
+
+    def record(self, op: int, ok: bool) -> None:
+        d = self.decay
+        self.n[op] = self.n[op] * d + 1.0
+        self.ok[op] = self.ok[op] * d + (1.0 if ok else 0.0)
+        self.samples += 1
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + CHECK_SEC
+            self._poll_ctl()
+        if self.samples - self.moved_at >= DWELL:
+            self._update()
+
+    # ── phase ───────────────────────────────────────────────────────────────
+    def rate(self, ops: Optional[Sequence[int]] = None) -> Optional[float]:
+        """ops(기본: 현재 페이즈)의 연산자별 감쇠 파싱률 평균; 표본이 부족하면 None."""
+        rs = [self.ok[i] / self.n[i] for i in (self.ops if ops is None else ops) if self.n[i] >= MIN_N]
+        return sum(rs) / len(rs) if rs else None
+
+    def _move(self, phase: int) -> None:
+        self.phase = phase
+        self.ops = self.phases[phase]
+        self.moved_at = self.samples
+
+    def _update(self) -> None:
+        r = self.rate()
+        if r is None:
+            return
+        p = self.phase
+        if p + 1 < len(self.phases) and r >= UP[p]:
+            self._move(p + 1)
+        elif p > 0 and not self.plateau and r < UP[p - 1] - HYST:
+            self._move(p - 1)
+
+    def _resolve_ctl(self) -> Optional[str]:
+        if self._ctl_path:
+            return self._ctl_path
+        out = os.environ.get("AFL_OUT_DIR")
+        if not out:
+            return None
+        inst = find_instance(out, os.getpid())
+        if inst:
+            self._ctl_path = os.path.join(inst, SIDECAR)
+            return self._ctl_path
+        return os.path.join(out, "default", SIDECAR)   # phase_ctl.py 기본 위치 (다음에 다시 찾음)
+
+    def _poll_ctl(self) -> None:
+        path = self._resolve_ctl()
+        if not path:
+            return
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        if st.st_mtime_ns == self._ctl_mtime:
+            return
+        self._ctl_mtime = st.st_mtime_ns
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                plateau = bool(json.load(f).get("plateau", False))
+        except (OSError, ValueError, AttributeError):
+            return
+        rising = plateau and not self.plateau
+        self.plateau = plateau
+        if not rising:
+            return
+        if self.phase + 1 < len(self.phases):
+            self._move(self.phase + 1)
+        elif self.on_reset is not None:
+            self.on_reset()
+
+    def stats(self) -> dict:
+        return {"phase": self.phase, "samples": self.samples,
+                "plateau": self.plateau, "rate": self.rate(),
+                "ops": [round(self.ok[i] / self.n[i], 3) if self.n[i] else None for i in range(len(self.n))]}
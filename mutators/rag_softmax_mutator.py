@@ -1,5 +1,9 @@
 # AFL++ Python custom mutator (numpy 無 / 시그니처 유연)
 import os, random, math, struct
+try:
+    from .splice_cache import DictCache, QueueIndex, SpliceLRU
+except ImportError:  # loaded as a top-level module (PYTHONPATH=mutators)
+    from splice_cache import DictCache, QueueIndex, SpliceLRU
 
 OPS = ["bitflip","arith","havoc","splice","dict_ins","len_skew","grammar_ins"]
 ema   = {op: 0.0 for op in OPS}
@@ -8,6 +12,11 @@ lambda_ = 0.2
 tau     = 3.0
 epsilon = 0.03
 
+# dict_ins/splice 재료 캐시 (매 실행마다 파일을 다시 열지 않음)
+_DICT   = DictCache(os.environ.get("RAGFUZZ_DICT", "corpus/dict/json.dict"))
+_QUEUE  = QueueIndex("queue")
+_SPLICE = SpliceLRU()
+
 def _softmax(scores):
     m = max(scores)
     exps = [math.exp((s - m) * tau) for s in scores]
@@ -34,22 +43,16 @@ def _mutate_bytes(data: bytearray, op: str) -> bytearray:
             j=random.randrange(len(b)); b[j]=random.randrange(256)
     elif op=="splice":
         try:
-            qs=[p for p in os.listdir("queue") if p.startswith("id:")]
-            if qs:
-                with open(os.path.join("queue", random.choice(qs)),"rb") as f:
-                    other=bytearray(f.read())
+            p=_QUEUE.pick(random)
+            other=_SPLICE.get(p) if p else None
+            if other is not None:
                 cut=min(len(b), len(other), random.randint(1,16))
                 b[:cut]=other[:cut]
         except: pass
     elif op=="dict_ins":
         try:
-            toks=[]
-            with open("corpus/dict/json.dict","r",encoding="utf-8") as f:
-                for t in f:
-                    t=t.strip()
-                    if t: toks.append(t.strip('"'))
-            if toks:
-                t=random.choice(toks).encode("utf-8","ignore")
+            t=_DICT.pick(random)
+            if t:
                 pos=random.randrange(len(b)+1); b[pos:pos]=t
         except: pass
     elif op=="len_skew" and len(b)>0:
@@ -79,6 +82,12 @@ def afl_custom_fuzz(buf, add_buf, max_size, *args, **kwargs):
     out = _mutate_bytes(bytearray(buf), op)
     return bytes(out[:max_size])
 
+def afl_custom_queue_new_entry(filename, *args, **kwargs):
+    # 새 queue 항목을 splice 후보에 바로 추가 (디렉터리 재스캔 불필요)
+    try: _QUEUE.add(filename)
+    except Exception: pass
+    return 0
+
 # 외부 보상 업데이트(폴러가 주기적으로 호출)
 def update_reward(delta_cov, new_crash, novel_path):
     r = 1.0*delta_cov + 5.0*(1 if new_crash else 0) + 0.3*novel_path
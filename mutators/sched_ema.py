@@ -1,6 +1,8 @@
 # mutators/sched_ema.py
 import math, random
 
+_UNSET = object()
+
 class EMAScheduler:
     def __init__(self, n_ops, lam=0.2, tau=0.8, eps=0.02):
         self.n_ops = int(n_ops)
@@ -8,38 +10,76 @@ class EMAScheduler:
         self.tau = float(tau)
         self.eps = float(eps)
         self.s = [0.0] * self.n_ops  # EMA 점수
+        # 샘플링 테이블 캐시: allowed 튜플 -> (version, allowed, prob, alias, cdf)
+        # 점수가 바뀔 때(reward_update/reset_scores)만 version이 올라가고,
+        # 다음 pick에서 해당 allowed-set만 재구성
+        self._version = 0
+        self._tables = {}
+        self._last_allowed = _UNSET
+        self._last_table = None
 
     def reset_scores(self):
         self.s = [0.0] * self.n_ops
+        self._version += 1
 
-    def pick(self, allowed=None):
+    def _table(self, allowed):
+        # 같은 allowed 객체가 반복 전달되는 경우(json_adapt 페이즈 튜플) 해시도 생략
+        if allowed is self._last_allowed and self._last_table[0] == self._version:
+            return self._last_table
+        key = None if allowed is None else tuple(allowed)
+        t = self._tables.get(key)
+        if t is None or t[0] != self._version:
+            t = self._tables[key] = self._build(key)
+        self._last_allowed, self._last_table = allowed, t
+        return t
+
+    def _build(self, key):
         # --- 방어: 허용 인덱스 정제 ---
-        if allowed is None:
+        if key is None:
             allowed = list(range(self.n_ops))
         else:
-            allowed = [int(i) for i in allowed if isinstance(i, int) and 0 <= int(i) < self.n_ops]
+            allowed = [int(i) for i in key if isinstance(i, int) and 0 <= int(i) < self.n_ops]
         if not allowed:
             # 안전 기본값: 0번 연산자(op_nop 등)
             allowed = [0]
 
-        # 소프트맥스 샘플링(+ epsilon 탐색)
+        # 소프트맥스(+ epsilon 탐색)
         logits = [self.tau * self.s[i] for i in allowed]
         m = max(logits)
         exps = [math.exp(x - m) for x in logits]
         Z = sum(exps) or 1.0
-        probs = [e / Z for e in exps]
-
-        # eps-explore
         k = len(allowed)
-        probs = [(1.0 - self.eps) * p + (self.eps / k) for p in probs]
+        probs = [(1.0 - self.eps) * (e / Z) + (self.eps / k) for e in exps]
 
-        r = random.random()
-        acc = 0.0
-        for idx, p in enumerate(probs):
+        # Vose alias 테이블: pick()은 난수 1개 + 인덱싱 1회
+        prob = [p * k for p in probs]
+        alias = list(range(k))
+        small = [i for i, p in enumerate(prob) if p < 1.0]
+        large = [i for i, p in enumerate(prob) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            alias[s] = l
+            prob[l] -= 1.0 - prob[s]
+            (small if prob[l] < 1.0 else large).append(l)
+        for i in small + large:
+            prob[i] = 1.0
+
+        cdf, acc = [], 0.0
+        for p in probs:
             acc += p
-            if r <= acc:
-                return allowed[idx]
-        return allowed[-1]
+            cdf.append(acc)
+        return (self._version, allowed, prob, alias, cdf)
+
+    def pick(self, allowed=None):
+        _, ops, prob, alias, _ = self._table(allowed)
+        r = random.random() * len(ops)
+        i = int(r)
+        return ops[i] if (r - i) < prob[i] else ops[alias[i]]
+
+    def pick_many(self, k, allowed=None):
+        # k개를 한 번에 샘플링 (캐시된 누적분포 사용)
+        _, ops, _, _, cdf = self._table(allowed)
+        return random.choices(ops, cum_weights=cdf, k=max(0, int(k)))
 
     def reward_update(self, op, d_cov=0.0, uniq_crash=False, new_path=False):
         # --- 방어: 범위 밖 인덱스 무시 ---
@@ -47,4 +87,5 @@ class EMAScheduler:
             return
         # 간단한 보상 함수
         r = (0.7 * float(d_cov)) + (1.0 if uniq_crash else 0.0) + (0.2 if new_path else 0.0)
-        self.s[op] = (1.0 - self.lam) * self.s[op] + self.lam * r
\ No newline at end of file
+        self.s[op] = (1.0 - self.lam) * self.s[op] + self.lam * r
+        self._version += 1
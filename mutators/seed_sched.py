@@ -0,0 +1,170 @@
+# mutators/seed_sched.py
+# Per-seed energy for AFL++'s queue_get / fuzz_count hooks.
+# Stats are kept per queue entry in flat unsigned arrays indexed by the
+# entry's queue id (id:NNNNNN in the filename), so a lookup is one int parse
+# plus an array index and 100k entries cost ~2.4 MB. Names without an id
+# get a slot in a fixed MAX_NAMED table through a small LRU map. Ids beyond
+# MAX_SEEDS fold onto existing slots.
+#
+#   queue_get(fname)   → select(fname): False = skip (stale seed, sampled)
+#   fuzz_count(buf)    → energy(len(buf)): base × productivity factor
+#   fuzz() outputs     → spent(valid, weight)  (valid only for sampled outputs)
+#   queue_new_entry    → hit(orig_fname): parent produced a new path
+#
+# Productivity is the seed's new-path yield ((hits+1)/(mutations+base)) relative
+# to the campaign-wide yield, clamped to [MIN_FACTOR, MAX_FACTOR]; fresh seeds
+# get FRESH_FACTOR until they have been fuzzed for WARMUP × base mutations.
+# Seeds with a low parse-valid output ratio or far above the mean size
+# (slow execs) get half of that.
+import os, random, re
+from array import array
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+MAX_SEEDS = 1 << 20
+MAX_NAMED = 4096                # id 없는 파일명 슬롯 (LRU)
+BASE = 256                      # afl HAVOC_CYCLES와 같은 기본 반복 수
+WARMUP = 2                      # base × WARMUP 변이 전까지는 "새 시드"
+FRESH_FACTOR = 2.0
+MIN_FACTOR, MAX_FACTOR = 0.25, 4.0
+STALE = 16                      # 마지막 new path 이후 base × STALE 변이면 정체
+SKIP_PROB = 0.9                 # 정체 시드를 건너뛸 확률 (가끔은 다시 봄)
+LOW_VALID = 0.1                 # 출력 파싱 성공률이 이보다 낮으면 에너지 절반
+BIG = 4.0                       # 평균 크기의 BIG배보다 큰 시드는 에너지 절반 (실행이 느림)
+_QID = re.compile(r"id:(\d+)")
+_U32 = 0xFFFFFFFF
+
+
+class _Table:
+    """슬롯별 카운터 배열 묶음 (unsigned 32비트, 필요할 때 두 배씩 늘림)."""
+    FIELDS = ("mutations", "hits", "last_hit", "valid", "size", "skips")
+
+    def __init__(self, cap: int, n: int = 0):
+        self.cap = int(cap)
+        for f in self.FIELDS:
+            setattr(self, f, array("I", bytes(4 * n)))
+
+    def grow(self, i: int) -> None:
+        n = len(self.mutations)
+        if i < n:
+            return
+        add = max(i + 1, min(2 * n, self.cap)) - n
+        for f in self.FIELDS:
+            getattr(self, f).frombytes(bytes(4 * add))
+
+    def reset(self, i: int) -> None:
+        for f in self.FIELDS:
+            getattr(self, f)[i] = 0
+
+
+class SeedEnergy:
+    def __init__(self, base: int = BASE, rng: Optional[random.Random] = None):
+        self.base = max(1, int(base))
+        self.rng = rng or random.Random()
+        self._ids = _Table(MAX_SEEDS)                    # queue id로 직접 인덱스
+        self._names = _Table(MAX_NAMED, MAX_NAMED)       # id 없는 파일명
+        self._named: "OrderedDict[str, int]" = OrderedDict()
+        self.cur: Optional[Tuple[_Table, int]] = None
+        self.total_mut = 0
+        self.total_hits = 0
+        self.mean_size = 0.0           # fuzz_count에 들어온 크기의 EMA
+
+    @classmethod
+    def from_env(cls, rng: Optional[random.Random] = None) -> Optional["SeedEnergy"]:
+        # RAGFUZZ_SEED_SCHED=0 → 훅이 afl 기본 동작을 그대로 따름
+        if os.environ.get("RAGFUZZ_SEED_SCHED", "1").strip().lower() in ("0", "no", "off", "false"):
+            return None
+        try:
+            base = int(os.environ.get("RAGFUZZ_FUZZ_COUNT", str(BASE)))
+        except ValueError:
+            base = BASE
+        return cls(base=base, rng=rng)
+
+    def slot(self, fname) -> Optional[Tuple[_Table, int]]:
+        if not fname:
+            return None
+        if isinstance(fname, bytes):
+            fname = fname.decode("utf-8", "replace")
+        m = _QID.match(fname, fname.rfind("/") + 1)
+        if m:
+            i = int(m.group(1)) % MAX_SEEDS
+            self._ids.grow(i)
+            return self._ids, i
+        i = self._named.get(fname)
+        if i is not None:
+            self._named.move_to_end(fname)
+        elif len(self._named) < MAX_NAMED:
+            i = self._named[fname] = len(self._named)
+        else:
+            _, i = self._named.popitem(last=False)
+            self._names.reset(i)
+            self._named[fname] = i
+        return self._names, i
+
+    # ── hooks ───────────────────────────────────────────────────────────────
+    def select(self, fname) -> bool:
+        """queue_get: 정체된 시드는 SKIP_PROB 확률로 건너뜀."""
+        self.cur = s = self.slot(fname)
+        if s is None:
+            return True
+        t, i = s
+        m = t.mutations[i]
+        if m >= self.base * WARMUP and m - t.last_hit[i] >= self.base * STALE \
+                and self.rng.random() < SKIP_PROB:
+            t.skips[i] = min(t.skips[i] + 1, _U32)
+            self.cur = None
+            return False
+        return True
+
+    def factor(self, t: "_Table", i: int) -> float:
+        m = t.mutations[i]
+        if m < self.base * WARMUP:
+            return FRESH_FACTOR
+        seed = (t.hits[i] + 1.0) / (m + self.base)
+        glob = (self.total_hits + 1.0) / (self.total_mut + self.base)
+        f = min(MAX_FACTOR, max(MIN_FACTOR, seed / glob))
+        if t.valid[i] < LOW_VALID * m:
+            f *= 0.5
+        if self.mean_size and t.size[i] > BIG * self.mean_size:
+            f *= 0.5
+        return max(MIN_FACTOR, f)
+
+    def energy(self, size: int) -> int:
+        """fuzz_count: 현재 시드(select로 고른)에 줄 fuzz() 호출 수."""
+        if self.cur is None:
+            return self.base
+        t, i = self.cur
+        t.size[i] = min(int(size), _U32)
+        self.mean_size = 0.95 * self.mean_size + 0.05 * size if self.mean_size else float(size)
+        return max(1, int(self.base * self.factor(t, i)))
+
+    def spent(self, valid: Optional[bool], weight: int = 1) -> None:
+        """valid: 출력 파싱 결과 (None = 검사 안 함). 표본 검사면 weight = 표본 주기로 보정."""
+        self.total_mut += 1
+        if self.cur is None:
+            return
+        t, i = self.cur
+        if t.mutations[i] < _U32:
+            t.mutations[i] += 1
+            if valid:
+                t.valid[i] = min(t.valid[i] + weight, _U32)
+
+    def hit(self, parent) -> None:
+        """queue_new_entry(new, orig): orig(부모)가 새 경로를 만듦 (없으면 현재 시드)."""
+        self.total_hits += 1
+        s = self.slot(parent) if parent else self.cur
+        if s is None:
+            return
+        t, i = s
+        if t.hits[i] < _U32:
+            t.hits[i] += 1
+            t.last_hit[i] = t.mutations[i]
+
+    def stats(self, fname) -> dict:
+        s = self.slot(fname)
+        if s is None:
+            return {}
+        t, i = s
+        out = {f: getattr(t, f)[i] for f in _Table.FIELDS}
+        out["factor"] = round(self.factor(t, i), 3)
+        return out
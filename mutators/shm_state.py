@@ -0,0 +1,125 @@
+# mutators/shm_state.py
+# Fixed-layout, mmap-backed EMA/count table shared by engine/reward_poller.py
+# (single writer) and every afl-fuzz instance's mutator (readers).
+#
+# Layout (little endian):
+#   0  magic  4s   b"RFST" (b"DEAD" once the writer replaced the file)
+#   4  ver    u32
+#   8  n_ops  u32
+#   12 crc    u32  crc32 of "\n".join(ops) — guards against op-list drift
+#   16 seq    u64  seqlock counter (odd while the writer is mid-update)
+#   24 n_ops × (ema f64, count u64)
+#
+# Readers map the file once; a read is plain memory access (no syscalls) and
+# retries while seq is odd or changed underneath it.
+
+import mmap, os, struct, zlib
+from typing import List, Optional, Sequence, Tuple
+
+MAGIC = b"RFST"
+DEAD = b"DEAD"
+VERSION = 1
+_HDR = struct.Struct("<4sIIIQ")
+_SEQ_OFF = 16
+_SEQ = struct.Struct("<Q")
+_ENT = struct.Struct("<dQ")
+
+def _ops_crc(ops: Sequence[str]) -> int:
+    return zlib.crc32("\n".join(ops).encode("utf-8")) & 0xFFFFFFFF
+
+def _size(n_ops: int) -> int:
+    return _HDR.size + n_ops * _ENT.size
+
+
+class ShmState:
+    def __init__(self, path: str, ops: Sequence[str], mm: mmap.mmap):
+        self.path = path
+        self.ops = list(ops)
+        self.n = len(self.ops)
+        self._mm = mm
+        self._ents = struct.Struct("<" + "dQ" * self.n)
+
+    # ── writer side ─────────────────────────────────────────────────────────
+    @classmethod
+    def create(cls, path: str, ops: Sequence[str]) -> "ShmState":
+        """Open for writing; (re)create the file if missing or laid out for other ops."""
+        ops = list(ops)
+        crc = _ops_crc(ops)
+        try:
+            with open(path, "r+b") as f:
+                mm = mmap.mmap(f.fileno(), 0)
+            magic, ver, n, c, _ = _HDR.unpack_from(mm, 0)
+            if (magic, ver, n, c) == (MAGIC, VERSION, len(ops), crc) and len(mm) >= _size(n):
+                return cls(path, ops, mm)
+            # 다른 레이아웃: 기존 리더가 재오픈하도록 표시 후 교체
+            mm[0:4] = DEAD
+            mm.close()
+        except (OSError, ValueError, struct.error):
+            pass
+
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HDR.pack(MAGIC, VERSION, len(ops), crc, 0))
+            f.write(b"\0" * (len(ops) * _ENT.size))
+        os.replace(tmp, path)  # 리더는 완성된 파일만 보게 됨
+        with open(path, "r+b") as f:
+            mm = mmap.mmap(f.fileno(), 0)
+        return cls(path, ops, mm)
+
+    def write(self, ema: dict, counts: dict) -> None:
+        mm = self._mm
+        seq = _SEQ.unpack_from(mm, _SEQ_OFF)[0]
+        _SEQ.pack_into(mm, _SEQ_OFF, seq + 1)          # odd: update in progress
+        vals = []
+        for op in self.ops:
+            vals.append(float(ema.get(op, 0.0)))
+            vals.append(int(counts.get(op, 0)))
+        self._ents.pack_into(mm, _HDR.size, *vals)
+        _SEQ.pack_into(mm, _SEQ_OFF, seq + 2)          # even: consistent
+
+    # ── reader side ─────────────────────────────────────────────────────────
+    @classmethod
+    def open(cls, path: str, ops: Sequence[str]) -> Optional["ShmState"]:
+        """Map an existing segment read-only; None if absent or for another op list."""
+        try:
+            with open(path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            magic, ver, n, crc, _ = _HDR.unpack_from(mm, 0)
+        except struct.error:
+            mm.close()
+            return None
+        if magic != MAGIC or ver != VERSION or n != len(ops) \
+                or crc != _ops_crc(ops) or len(mm) < _size(n):
+            mm.close()
+            return None
+        return cls(path, ops, mm)
+
+    def stale(self) -> bool:
+        return self._mm[0:4] != MAGIC
+
+    def seq(self) -> int:
+        return _SEQ.unpack_from(self._mm, _SEQ_OFF)[0]
+
+    def read(self, tries: int = 8) -> Optional[Tuple[int, List[float], List[int]]]:
+        """Consistent snapshot (seq, ema, counts), or None if the writer kept racing us."""
+        mm = self._mm
+        for _ in range(tries):
+            s1 = _SEQ.unpack_from(mm, _SEQ_OFF)[0]
+            if s1 & 1:
+                continue
+            vals = self._ents.unpack_from(mm, _HDR.size)
+            if _SEQ.unpack_from(mm, _SEQ_OFF)[0] == s1:
+                return s1, list(vals[0::2]), list(vals[1::2])
+        return None
+
+    def close(self) -> None:
+        try:
+            self._mm.close()
+        except Exception:
+            pass
@@ -1,9 +1,21 @@
-# AFL++ Python Custom Mutator with shared JSON state (new/old API compatible)
-import os, random, math, struct, json
+# AFL++ Python Custom Mutator with shared mmap state (new/old API compatible)
+import os, random, math, struct, time
+try:
+  from .shm_state import ShmState
+  from .op_ring import OpRingWriter, ring_path
+  from .splice_cache import DictCache, QueueIndex, SpliceLRU
+  from .json_trim import Trimmer
+except ImportError:  # loaded as a top-level module (PYTHONPATH=mutators)
+  from shm_state import ShmState
+  from op_ring import OpRingWriter, ring_path
+  from splice_cache import DictCache, QueueIndex, SpliceLRU
+  from json_trim import Trimmer
 
 # --- config/state ---
 OPS = ["bitflip","arith","havoc","splice","dict_ins","len_skew","grammar_ins"]
-STATE_PATH = os.environ.get("RAGFUZZ_STATE", "mutators/state.json")
+STATE_SHM = os.environ.get("RAGFUZZ_STATE_SHM", "mutators/state.shm")
+OPLOG_DIR = os.environ.get("RAGFUZZ_OPLOG_DIR", "mutators/oplog")
+OP_IDX = {op: i for i, op in enumerate(OPS)}
 
 ema    = {op: 0.0 for op in OPS}
 counts = {op: 1   for op in OPS}
@@ -11,27 +23,50 @@ _lambda = 0.2
 _tau     = 3.0
 _epsilon = 0.03
 
-_last_load = 0.0
+# dict_ins/splice 재료: 사전은 한 번만 파싱, queue 목록은 mtime/queue_new_entry로 갱신
+_DICT   = DictCache(os.environ.get("RAGFUZZ_DICT", "corpus/dict/json.dict"))
+_QUEUE  = QueueIndex("queue")
+_SPLICE = SpliceLRU()
+
+# per-op attempt/queue-hit 기록 → reward_poller가 연산자별로 보상 배분
+_ring = None
+_last_op = None
+def _open_ring():
+  global _ring
+  try:
+    _ring = OpRingWriter(ring_path(OPLOG_DIR, os.getpid()), OPS)
+  except Exception:
+    _ring = None
+
+_shm = None
+_shm_seq = -1
+_shm_retry = 0.0
 def _maybe_load_state():
-  """Reload EMA/counts from STATE_PATH if modified by reward_poller."""
-  global ema, counts, _last_load
+  """Pick up EMA/counts published by reward_poller (memory reads only once mapped)."""
+  global _shm, _shm_seq, _shm_retry
   try:
-    st = os.stat(STATE_PATH)
-    if st.st_mtime <= _last_load:
+    if _shm is None or _shm.stale():
+      # 세그먼트가 아직 없거나 교체됨: 1초에 한 번만 재오픈 시도
+      now = time.monotonic()
+      if now < _shm_retry:
+        return
+      _shm_retry = now + 1.0
+      if _shm is not None:
+        _shm.close()
+      _shm, _shm_seq = ShmState.open(STATE_SHM, OPS), -1
+      if _shm is None:
+        return
+    if _shm.seq() == _shm_seq:
+      return
+    snap = _shm.read()
+    if snap is None:
       return
-    with open(STATE_PATH, "r") as f:
-      data = json.load(f)
-    if "ema" in data:
-      for k in OPS:
-        if k in data["ema"]:
-          ema[k] = float(data["ema"][k])
-    if "counts" in data:
-      for k in OPS:
-        if k in data["counts"]:
-          counts[k] = int(data["counts"][k])
-    _last_load = st.st_mtime
+    _shm_seq, e, c = snap
+    for i, k in enumerate(OPS):
+      ema[k] = e[i]
+      counts[k] = max(1, c[i])
   except Exception:
-    # state 파일이 없거나 파싱 실패 시 조용히 무시
+    # 세그먼트가 없거나 읽기 실패 시 조용히 무시
     pass
 
 def _softmax(scores):
@@ -61,23 +96,17 @@ def _mutate_bytes(data: bytearray, op: str) -> bytearray:
       j = random.randrange(len(b)); b[j] = random.randrange(256)
   elif op == "splice":
     try:
-      cand=[p for p in os.listdir("queue") if p.startswith("id:")]
-      if cand:
-        with open(os.path.join("queue", random.choice(cand)),"rb") as f:
-          other=bytearray(f.read())
+      p=_QUEUE.pick(random)
+      other=_SPLICE.get(p) if p else None
+      if other is not None:
         cut=min(len(b), len(other), random.randint(1,16))
         b[:cut]=other[:cut]
     except Exception:
       pass
   elif op == "dict_ins":
     try:
-      toks=[]
-      with open("corpus/dict/json.dict","r",encoding="utf-8") as f:
-        for t in f:
-          t=t.strip()
-          if t: toks.append(t.strip('"'))
-      if toks:
-        t=random.choice(toks).encode("utf-8","ignore")
+      t=_DICT.pick(random)
+      if t:
         pos=random.randrange(len(b)+1); b[pos:pos]=t
     except Exception:
       pass
@@ -96,14 +125,24 @@ def _mutate_bytes(data: bytearray, op: str) -> bytearray:
 
 # old-style
 def afl_custom_init(_):  # seed param is ignored
+  _open_ring()
   return 0
 
 def afl_custom_deinit():
+  try:
+    if _ring is not None:
+      _ring.flush()
+  except Exception:
+    pass
   return 0
 
 def afl_custom_fuzz(buf, add_buf, max_size):
+    global _last_op
     try:
         op = _choose_op()
+        _last_op = op
+        if _ring is not None:
+          _ring.attempt(OP_IDX[op])
         out = _mutate_bytes(bytearray(buf), op)
         if not isinstance(out, (bytes, bytearray)):
             return bytes(buf[:max_size])
@@ -119,13 +158,35 @@ def afl_custom_post_process(buf):
         return b""
 
 def afl_custom_queue_new_entry(filename, orig_filename):
-  # no-op hook
+  # 직전 연산자에 queue hit 기록 + splice 후보에 바로 추가
+  try:
+    _QUEUE.add(filename)
+    if _ring is not None and _last_op is not None:
+      _ring.hit(OP_IDX[_last_op])
+  except Exception:
+    pass
   return 0
 
-# (optional trimming hooks as no-ops)
-def afl_custom_init_trim(buf): return 0
-def afl_custom_trim(max_size): return None
-def afl_custom_post_trim(success): return 0
+# JSON 구조 단위 trim (json_trim.py): JSON이 아니면 0단계 → afl-fuzz가 trim 생략
+_trim = Trimmer()
+
+def afl_custom_init_trim(buf):
+  try:
+    return _trim.init(buf)
+  except Exception:
+    return 0
+
+def afl_custom_trim():
+  try:
+    return _trim.trim()
+  except Exception:
+    return bytearray(_trim.data)
+
+def afl_custom_post_trim(success):
+  try:
+    return _trim.post_trim(success)
+  except Exception:
+    return _trim.steps
 
 # new-style
 def init(seed=None):
@@ -142,4 +203,13 @@ def post_process(buf):
   return afl_custom_post_process(buf)
 
 def queue_new_entry(filename, orig_filename):
-  return afl_custom_queue_new_entry(filename, orig_filename)
\ No newline at end of file
+  return afl_custom_queue_new_entry(filename, orig_filename)
+
+def init_trim(buf):
+  return afl_custom_init_trim(buf)
+
+def trim():
+  return afl_custom_trim()
+
+def post_trim(success):
+  return afl_custom_post_trim(success)
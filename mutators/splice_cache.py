@@ -0,0 +1,148 @@
+# mutators/splice_cache.py
+# Per-process caches for the byte-level mutators' dict_ins / splice ops, so a
+# fuzz() call does no syscalls in the common case:
+#   DictCache  — dictionary tokens parsed once (re-read only if the file's
+#                mtime changes, checked at most every `check` seconds);
+#                weighted picks when a <dict>.weights sidecar exists
+#   QueueIndex — queue/id:* listing, refreshed by directory mtime or fed
+#                directly from queue_new_entry
+#   SpliceLRU  — mmap-backed, byte-bounded LRU of recently used queue entries
+
+import mmap, os, random, time
+from collections import OrderedDict
+from typing import List, Optional
+
+try:
+    from .dict_util import load_weights, parse_dict
+except ImportError:  # loaded as a top-level module (PYTHONPATH=mutators)
+    from dict_util import load_weights, parse_dict
+
+
+class DictCache:
+    def __init__(self, path: str, check: float = 5.0):
+        self.path = path
+        self.wpath = path + ".weights"
+        self.check = float(check)
+        self._toks: List[bytes] = []
+        self._cum: Optional[List[float]] = None
+        self._mtime = None
+        self._next = 0.0
+
+    def _load(self) -> None:
+        m = []
+        for p in (self.path, self.wpath):
+            try:
+                m.append(os.stat(p).st_mtime_ns)
+            except OSError:
+                m.append(None)
+        if m[0] is None:
+            self._toks, self._cum, self._mtime = [], None, None
+            return
+        if m == self._mtime:
+            return
+        try:
+            toks = list(dict.fromkeys(parse_dict(self.path)))
+        except OSError:
+            return
+        # tools/dict_build.py가 만든 <dict>.weights가 있으면 가중 샘플링
+        cum = None
+        w = load_weights(self.wpath) if m[1] is not None else None
+        if w:
+            acc, cum = 0.0, []
+            for t in toks:
+                acc += max(0.0, w.get(t, 1.0))
+                cum.append(acc)
+            if acc <= 0:
+                cum = None
+        self._toks, self._cum, self._mtime = toks, cum, m
+
+    def tokens(self) -> List[bytes]:
+        now = time.monotonic()
+        if now >= self._next:
+            self._next = now + self.check
+            self._load()
+        return self._toks
+
+    def pick(self, rng=random) -> Optional[bytes]:
+        toks = self.tokens()
+        if not toks:
+            return None
+        if self._cum is None:
+            return rng.choice(toks)
+        return rng.choices(toks, cum_weights=self._cum, k=1)[0]
+
+
+class QueueIndex:
+    def __init__(self, qdir: str = "queue", check: float = 1.0):
+        self.qdir = qdir
+        self.check = float(check)
+        self._paths: List[str] = []
+        self._seen = set()
+        self._mtime = None
+        self._next = 0.0
+
+    def add(self, path: str) -> None:
+        """queue_new_entry에서 호출: 디렉터리 재스캔 없이 바로 후보에 추가."""
+        # afl은 절대 경로, _refresh는 qdir 기준 상대 경로를 넘기므로 큐 안에서 유일한
+        # 파일명(id:NNNNNN,...)으로 중복을 거름 (같은 항목이 두 번 뽑히지 않게)
+        name = os.path.basename(path) if path else ""
+        if name.startswith("id:") and name not in self._seen:
+            self._seen.add(name)
+            self._paths.append(path)
+
+    def _refresh(self) -> None:
+        try:
+            m = os.stat(self.qdir).st_mtime_ns
+        except OSError:
+            return
+        if m == self._mtime:
+            return
+        self._mtime = m
+        try:
+            names = os.listdir(self.qdir)
+        except OSError:
+            return
+        for n in names:
+            if n.startswith("id:"):
+                self.add(os.path.join(self.qdir, n))
+
+    def pick(self, rng=random) -> Optional[str]:
+        now = time.monotonic()
+        if now >= self._next:
+            self._next = now + self.check
+            self._refresh()
+        return rng.choice(self._paths) if self._paths else None
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+
+class SpliceLRU:
+    def __init__(self, max_bytes: int = 8 << 20):
+        self.max_bytes = int(max_bytes)
+        self._ents: "OrderedDict[str, object]" = OrderedDict()
+        self._bytes = 0
+
+    def get(self, path: str):
+        """Read-only buffer (mmap, or b"" for empty files); None if unreadable."""
+        buf = self._ents.get(path)
+        if buf is not None:
+            self._ents.move_to_end(path)
+            return buf
+        try:
+            with open(path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        except (OSError, ValueError):
+            return None
+        self._ents[path] = buf
+        self._bytes += len(buf)
+        while self._bytes > self.max_bytes and len(self._ents) > 1:
+            _, old = self._ents.popitem(last=False)
+            self._bytes -= len(old)
+            if isinstance(old, mmap.mmap):
+                old.close()
+        return buf
+
+    def __len__(self) -> int:
+        return len(self._ents)
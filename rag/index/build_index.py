@@ -1,25 +1,72 @@
-import glob
-from langchain_community.document_loaders import TextLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_openai import OpenAIEmbeddings
-from langchain_community.vectorstores import FAISS
+#!/usr/bin/env python3
+"""
+RAG 인덱스 빌드/질의
+- 기본: 로컬 해시 n-gram TF-IDF 인덱스 (rag/local_index.py, 네트워크/langchain 불필요)
+  details/, details_mitre/, cpe_names*.txt, rag/index/raw/* → rag/index/local/ (바뀐 파일만 추가)
+- --faiss: 기존 langchain + OpenAI 임베딩 FAISS 인덱스 (rag/index/faiss)
+- 사용: python3 rag/index/build_index.py
+        python3 rag/index/build_index.py --query "rapidjson ParseNumber overflow" -k 5
+"""
+import argparse, glob, pathlib, sys, time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent.parent))
+from rag.local_index import DEFAULT_DIR, DEFAULT_SOURCES, DIM, LocalIndex  # noqa: E402
 
 def load_docs():
+    from langchain_community.document_loaders import TextLoader
     docs=[]
     for p in glob.glob("rag/index/raw/*"):
         docs+=TextLoader(p, encoding="utf-8").load()
     return docs
 
-if __name__=="__main__":
+def build_faiss():
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+    from langchain_openai import OpenAIEmbeddings
+    from langchain_community.vectorstores import FAISS
     docs=load_docs()
     if not docs:
         from langchain.schema import Document
         docs=[Document(page_content="JSON boundary cases, control chars, nesting depth, long strings")]
     splitter=RecursiveCharacterTextSplitter(chunk_size=800, chunk_overlap=100)
     chunks=splitter.split_documents(docs)
-    try:
-        embs=OpenAIEmbeddings(model="text-embedding-3-large")
-        db=FAISS.from_documents(chunks, embs)
-        db.save_local("rag/index/faiss")
-    except Exception:
-        pass
+    embs=OpenAIEmbeddings(model="text-embedding-3-large")
+    db=FAISS.from_documents(chunks, embs)
+    db.save_local("rag/index/faiss")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--index", default=DEFAULT_DIR)
+    ap.add_argument("--sources", nargs="*", default=DEFAULT_SOURCES, help="files / globs to index")
+    ap.add_argument("--dim", type=int, default=DIM, help="hashed feature buckets")
+    ap.add_argument("--rebuild", action="store_true", help="drop the index and embed everything again")
+    ap.add_argument("--query", default=None, help="query instead of building")
+    ap.add_argument("-k", type=int, default=5)
+    ap.add_argument("--faiss", action="store_true", help="build the langchain/OpenAI FAISS index instead")
+    args = ap.parse_args()
+
+    if args.faiss:
+        try:
+            build_faiss()
+        except Exception as e:
+            print(f"[!] FAISS index build failed: {e}", file=sys.stderr)
+            sys.exit(1)
+        print("[i] wrote rag/index/faiss")
+        return
+
+    ix = LocalIndex(args.index)
+    if args.query is not None:
+        t0 = time.perf_counter()
+        hits = ix.query(args.query, k=args.k)
+        ms = (time.perf_counter() - t0) * 1000.0
+        for h in hits:
+            print(f"{h['score']:.3f}  {h['key']:40s} [{h['source']}] {h['text'][:100]!r}")
+        print(f"[i] {len(hits)} hits over {len(ix)} docs in {ms:.1f} ms")
+        return
+
+    t0 = time.perf_counter()
+    st = ix.build(args.sources, dim=args.dim, rebuild=args.rebuild)
+    print(f"[i] {st['files']} files, {st['live']} live docs ({st['added']} added, {st['removed']} removed) "
+          f"→ {args.index} in {time.perf_counter() - t0:.2f}s")
+
+if __name__ == "__main__":
+    main()
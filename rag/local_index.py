@@ -0,0 +1,351 @@
+# rag/local_index.py
+# Offline retrieval index over CVE text (details/, details_mitre/), CPE name
+# lists (cpe_names*.txt) and rag/index/raw/*: no network, no langchain.
+#
+# Documents are embedded as hashed n-gram TF vectors (word unigrams, word
+# bigrams and in-word char 4-grams; crc32 → `dim` buckets, sublinear tf).
+# IDF is applied at query time, so adding documents never rewrites old rows:
+#   <dir>/vectors.f32  N×dim float32, row-major, append-only (np.memmap)
+#   <dir>/norms.f32    per-row IDF-weighted L2 norms (0 = removed row)
+#   <dir>/terms.i32    sparse copy of every row: bucket ids, append-only
+#   <dir>/terms.f32    ... and their weights (same order)
+#   <dir>/terms.off    int64 offset of each row's terms (n + 1 entries)
+#   <dir>/docs.jsonl   one line per row: {row, key, source, path, text}
+#   <dir>/meta.json    dim, row count, document frequencies, indexed files
+# A rebuild only featurizes files whose (size, mtime) changed; rows of changed
+# or deleted files are tombstoned. A changed IDF still changes every live
+# row's norm, so each build that adds or removes rows re-sums the norms from
+# the stored sparse terms: O(total non-zeros) array arithmetic (one
+# vectorized pass with numpy), no re-tokenizing of old text. Without numpy
+# the same files are queried through mmap + memoryview (slower, still fine
+# for a few thousand rows).
+#
+#   ix = LocalIndex()
+#   ix.build()                                   # incremental
+#   ix.query("rapidjson ParseNumber integer overflow", k=5)
+import glob, json, math, mmap, os, re, zlib
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy 없으면 mmap + memoryview 경로
+    np = None
+
+DEFAULT_DIR = "rag/index/local"
+DEFAULT_SOURCES = ["details/*.txt", "details_mitre/*.txt", "cpe_names*.txt", "rag/index/raw/*"]
+DIM = 1 << 12
+VERSION = 2                     # 1: terms.* 없음 (norm 재계산 때 텍스트를 다시 토큰화)
+CHUNK = 1200
+_WORD = re.compile(r"\w+(?:::\w+)*")
+
+
+def features(text: str, dim: int = DIM) -> Dict[int, float]:
+    """해시 n-gram → {버킷: 1+log(tf)}."""
+    toks = [t.lower() for t in _WORD.findall(text)]
+    grams = ["w:" + t for t in toks]
+    grams += [f"b:{a} {b}" for a, b in zip(toks, toks[1:])]
+    for t in toks:
+        if len(t) >= 4:
+            s = f" {t} "
+            grams += ["c:" + s[i:i + 4] for i in range(len(s) - 3)]
+    tf: Dict[int, int] = {}
+    for g in grams:
+        h = zlib.crc32(g.encode("utf-8")) % dim
+        tf[h] = tf.get(h, 0) + 1
+    return {h: 1.0 + math.log(c) for h, c in tf.items()}
+
+
+def _chunks(text: str, size: int = CHUNK) -> List[str]:
+    # 빈 줄/줄 단위로 나눠 size 근처까지 이어 붙임
+    out, cur = [], ""
+    for para in re.split(r"\n\s*\n|\n", text):
+        para = para.strip()
+        if not para:
+            continue
+        if cur and len(cur) + len(para) + 1 > size:
+            out.append(cur)
+            cur = ""
+        cur = f"{cur}\n{para}" if cur else para
+        while len(cur) > size:
+            out.append(cur[:size])
+            cur = cur[size:]
+    if cur:
+        out.append(cur)
+    return out
+
+
+def _cpe_docs(text: str) -> List[Tuple[str, str]]:
+    # cpe:2.3:part:vendor:product:version:... → vendor:product별 문서 하나 (버전 목록 포함)
+    prods: Dict[Tuple[str, str], List[str]] = {}
+    for ln in text.splitlines():
+        f = ln.strip().split(":")
+        if len(f) < 6 or f[0] != "cpe":
+            continue
+        prods.setdefault((f[3], f[4]), [])
+        if f[5] not in ("*", "-") and f[5] not in prods[(f[3], f[4])]:
+            prods[(f[3], f[4])].append(f[5])
+    out = []
+    for (vendor, product), vers in sorted(prods.items()):
+        words = f"{vendor} {product}".replace("_", " ")
+        body = f"CPE {vendor}:{product} ({words}) versions: {' '.join(vers)}"
+        out.append((f"cpe:{vendor}:{product}", body[:CHUNK]))
+    return out
+
+
+def load_docs(path: str) -> List[Tuple[str, str, str]]:
+    """파일 → [(key, source, text)]. key는 결과 중복 제거 단위 (CVE id / cpe 제품)."""
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+    except OSError:
+        return []
+    name = os.path.basename(path)
+    parent = os.path.basename(os.path.dirname(path)) or "."
+    if name.startswith("cpe_names"):
+        return [(k, "cpe", t) for k, t in _cpe_docs(text)]
+    stem = os.path.splitext(name)[0]
+    return [(stem, parent, t) for t in _chunks(text)]
+
+
+class LocalIndex:
+    def __init__(self, path: str = DEFAULT_DIR):
+        self.path = path
+        self.dim = DIM
+        self.n = 0
+        self.df: List[int] = []
+        self.files: Dict[str, dict] = {}
+        self.docs: List[dict] = []
+        self._norms: List[float] = []
+        self._toff = array("q", [0])    # terms.* 안에서 행 r의 항은 [toff[r], toff[r+1])
+        self._tail = False
+        self._mm = self._mat = None
+        self._load()
+
+    # ── storage ─────────────────────────────────────────────────────────────
+    def _p(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _load(self) -> None:
+        try:
+            with open(self._p("meta.json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return
+        if meta.get("version") != VERSION:
+            return                      # terms.* 없는 구형 인덱스: 다음 build()가 처음부터
+        self.dim, self.n = int(meta["dim"]), int(meta["n"])
+        self.df, self.files = list(meta["df"]), dict(meta["files"])
+        self.docs = []
+        with open(self._p("docs.jsonl"), "r", encoding="utf-8") as f:
+            for line in f:
+                self.docs.append(json.loads(line))
+        self._tail = len(self.docs) > self.n
+        del self.docs[self.n:]        # 중단된 빌드가 남긴 꼬리 줄은 무시
+        with open(self._p("norms.f32"), "rb") as f:
+            self._norms = _floats(f.read())[:self.n]
+        with open(self._p("terms.off"), "rb") as f:
+            self._toff = array("q")
+            self._toff.frombytes(f.read())
+        del self._toff[self.n + 1:]
+
+    def _atomic(self, name: str, data: bytes) -> None:
+        tmp = self._p(name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self._p(name))
+
+    def _close_map(self) -> None:
+        self._mat = None
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def _matrix(self):
+        """N×dim 행렬: numpy 있으면 np.memmap, 없으면 float32 memoryview."""
+        if self._mat is None and self.n:
+            if np is not None:
+                self._mat = np.memmap(self._p("vectors.f32"), dtype=np.float32, mode="r",
+                                      shape=(self.n, self.dim))
+            else:
+                with open(self._p("vectors.f32"), "rb") as f:
+                    self._mm = mmap.mmap(f.fileno(), self.n * self.dim * 4, access=mmap.ACCESS_READ)
+                self._mat = memoryview(self._mm).cast("f")
+        return self._mat
+
+    # ── build ───────────────────────────────────────────────────────────────
+    def _terms(self):
+        """저장된 희소 항 전체 → (버킷 id, 가중치) 배열 (numpy 있으면 ndarray)."""
+        m = self._toff[-1]
+        if np is not None:
+            return (np.fromfile(self._p("terms.i32"), dtype=np.int32, count=m),
+                    np.fromfile(self._p("terms.f32"), dtype=np.float32, count=m))
+        idx, val = array("i"), array("f")
+        with open(self._p("terms.i32"), "rb") as f:
+            idx.frombytes(f.read(4 * m))
+        with open(self._p("terms.f32"), "rb") as f:
+            val.frombytes(f.read(4 * m))
+        return idx, val
+
+    def _renorm(self) -> None:
+        # IDF가 바뀌었으니 살아 있는 행의 norm을 저장된 희소 항으로 다시 합산
+        idf, (idx, val), off = self._idf(), self._terms(), self._toff
+        if np is not None and self.n:
+            w = val.astype(np.float64) * np.asarray(idf)[idx]
+            sq = np.add.reduceat(w * w, np.asarray(off[:-1], dtype=np.int64)) if len(w) else np.zeros(self.n)
+            live = np.asarray(self._norms) > 0
+            self._norms = np.where(live, np.sqrt(sq), 0.0).tolist()
+            return
+        for r in range(self.n):
+            if self._norms[r] > 0:
+                a, b = off[r], off[r + 1]
+                self._norms[r] = math.sqrt(sum((v * idf[h]) ** 2 for h, v in zip(idx[a:b], val[a:b]))) or 0.0
+
+    def _idf(self) -> List[float]:
+        live = sum(1 for x in self._norms if x > 0) if self._norms else 0
+        return [math.log((1.0 + live) / (1.0 + d)) + 1.0 for d in self.df]
+
+    def build(self, sources: Iterable[str] = DEFAULT_SOURCES, dim: int = DIM,
+              rebuild: bool = False) -> Dict[str, int]:
+        """
+        바뀐 파일만 다시 임베딩 (dim이 달라지거나 rebuild면 처음부터). 추가/삭제가 있으면
+        IDF가 바뀌므로 norm은 전체 행을 저장된 희소 항으로 다시 합산 (비용 O(전체 비영 항)).
+        """
+        self._close_map()
+        os.makedirs(self.path, exist_ok=True)
+        if rebuild or not self.docs or dim != self.dim:
+            self.dim, self.n, self.df, self.files, self.docs, self._norms = dim, 0, [0] * dim, {}, [], []
+            self._toff = array("q", [0])
+            for name in ("vectors.f32", "docs.jsonl", "terms.i32", "terms.f32"):
+                open(self._p(name), "wb").close()
+        elif self._tail:
+            self._atomic("docs.jsonl", "".join(json.dumps(d, ensure_ascii=False) + "\n"
+                                               for d in self.docs).encode("utf-8"))
+            self._tail = False
+
+        paths = sorted({p for pat in sources for p in glob.glob(pat) if os.path.isfile(p)})
+        stale, fresh = [], []
+        for p in paths:
+            st = os.stat(p)
+            sig = [st.st_size, st.st_mtime_ns]
+            old = self.files.get(p)
+            if old is not None and old["sig"] == sig:
+                continue
+            if old is not None:
+                stale.append(p)
+            fresh.append((p, sig))
+        current = set(paths)
+        stale += [p for p in self.files if p not in current]
+
+        # 바뀐/지워진 파일의 행은 tombstone: 저장된 항의 버킷을 df에서 빼고 norm=0
+        removed = 0
+        dead = [r for p in stale for r in self.files.pop(p)["rows"] if self._norms[r] > 0]
+        if dead:
+            idx, _ = self._terms()
+            for r in dead:
+                for h in idx[self._toff[r]:self._toff[r + 1]]:
+                    self.df[h] -= 1
+                self._norms[r] = 0.0
+                removed += 1
+
+        added = 0
+        with open(self._p("vectors.f32"), "r+b") as vf, open(self._p("docs.jsonl"), "a", encoding="utf-8") as df, \
+                open(self._p("terms.i32"), "r+b") as ti, open(self._p("terms.f32"), "r+b") as tv:
+            vf.seek(self.n * self.dim * 4)
+            ti.seek(4 * self._toff[-1])
+            tv.seek(4 * self._toff[-1])
+            for p, sig in fresh:
+                rows = []
+                for key, source, text in load_docs(p):
+                    feats = features(text, self.dim)
+                    if not feats:
+                        continue
+                    row = [0.0] * self.dim
+                    for h, v in feats.items():
+                        row[h] = v
+                        self.df[h] += 1
+                    vf.write(_pack(row))
+                    hs = sorted(feats)
+                    ti.write(array("i", hs).tobytes())
+                    tv.write(_pack([feats[h] for h in hs]))
+                    self._toff.append(self._toff[-1] + len(hs))
+                    doc = {"row": self.n, "key": key, "source": source, "path": p, "text": text}
+                    df.write(json.dumps(doc, ensure_ascii=False) + "\n")
+                    self.docs.append(doc)
+                    self._norms.append(1.0)       # 아래에서 IDF 반영해 다시 계산
+                    rows.append(self.n)
+                    self.n += 1
+                    added += 1
+                self.files[p] = {"sig": sig, "rows": rows}
+            # 중단된 빌드가 남긴 꼬리 항 정리
+            ti.truncate()
+            tv.truncate()
+
+        if added or removed:
+            self._renorm()
+        self._atomic("norms.f32", _pack(self._norms))
+        self._atomic("terms.off", self._toff.tobytes())
+        self._atomic("meta.json", json.dumps({"version": VERSION, "dim": self.dim, "n": self.n, "df": self.df,
+                                              "files": self.files}).encode("utf-8"))
+        return {"files": len(self.files), "rows": self.n, "live": sum(1 for x in self._norms if x > 0),
+                "added": added, "removed": removed}
+
+    # ── query ───────────────────────────────────────────────────────────────
+    def query(self, text: str, k: int = 5, sources: Optional[Iterable[str]] = None,
+              min_score: float = 0.0) -> List[dict]:
+        """코사인(TF·IDF) 상위 k개 (min_score 초과); 같은 key(CVE id / cpe 제품)는 최고 점수 하나만."""
+        if not self.n:
+            return []
+        q = features(text, self.dim)
+        if not q:
+            return []
+        idf = self._idf()
+        cols = sorted(q)
+        w = [q[h] * idf[h] * idf[h] for h in cols]
+        qn = math.sqrt(sum((q[h] * idf[h]) ** 2 for h in cols))
+        mat = self._matrix()
+        if np is not None:
+            raw = np.asarray(mat[:, cols], dtype=np.float64) @ np.asarray(w)
+            norms = np.asarray(self._norms, dtype=np.float64)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                sc = np.where(norms > 0, raw / (norms * qn), 0.0)
+            order = [int(i) for i in np.argsort(-sc)]
+            scores = sc.tolist()
+        else:
+            d = self.dim
+            scores = []
+            for r in range(self.n):
+                nr = self._norms[r]
+                if nr <= 0:
+                    scores.append(0.0)
+                    continue
+                base = r * d
+                scores.append(sum(mat[base + h] * x for h, x in zip(cols, w)) / (nr * qn))
+            order = sorted(range(self.n), key=lambda r: -scores[r])
+        want = set(sources) if sources else None
+        out, seen = [], set()
+        for r in order:
+            if scores[r] <= max(0.0, min_score) or len(out) >= k:
+                break
+            doc = self.docs[r]
+            if doc["key"] in seen or (want and doc["source"] not in want):
+                continue
+            seen.add(doc["key"])
+            out.append(dict(doc, score=round(float(scores[r]), 4)))
+        return out
+
+    def __len__(self) -> int:
+        return sum(1 for x in self._norms if x > 0)
+
+    def close(self) -> None:
+        self._close_map()
+
+
+def _pack(xs: List[float]) -> bytes:
+    return array("f", xs).tobytes()
+
+
+def _floats(b: bytes) -> List[float]:
+    a = array("f")
+    a.frombytes(b[:len(b) - len(b) % 4])
+    return a.tolist()
@@ -1,5 +1,8 @@
 import pathlib, matplotlib.pyplot as plt, csv, sys
 
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from engine.campaign_store import CampaignStore  # noqa: E402
+
 def pick_base():
     outs = pathlib.Path("out")
     cands = sorted(outs.rglob("fuzzer_stats"), key=lambda p: p.stat().st_mtime, reverse=True)
@@ -23,26 +26,22 @@ Cstr = kv.get("bitmap_cvg","0%")
 try: C = float(Cstr.split("%")[0])
 except: C = 0.0
 
-times, paths, crashes = [], [], []
-pd = base/"plot_data"
-if pd.exists():
-    for line in pd.read_text().splitlines():
-        if not line or line.startswith("#"): continue
-        parts = line.split(",")
-        try:
-            ts = int(parts[0])
-            pths = int(parts[3])       # paths_total
-            crs  = int(parts[7])       # unique_crashes
-        except (ValueError, IndexError):
-            continue
-        times.append(ts); paths.append(pths); crashes.append(crs)
+# 캠페인 저장소에서 시계열 조회 (새로 추가된 plot_data 행만 적재)
+with CampaignStore() as db:
+    db.ingest(str(base))
+    inst = db.instance(str(base))
+    ser = db.series(inst["id"], ["time", "corpus_count", "saved_crashes"]) if inst else {}
+pairs = [(t, p, c) for t, p, c in zip(ser.get("time", []), ser.get("corpus_count", []), ser.get("saved_crashes", []))
+         if t is not None and p is not None and c is not None]
+times = [t for t, _, _ in pairs]
+paths = [p for _, p, _ in pairs]
+crashes = [c for _, _, c in pairs]
 
 art = pathlib.Path("reports/artifacts")
 art.mkdir(parents=True, exist_ok=True)
 
 # Coverage: 시간축이 없으므로 현재값을 수평선으로 표시
 if times:
-    import numpy as np
     xs = times
 else:
     xs = list(range(2))
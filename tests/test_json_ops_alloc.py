@@ -0,0 +1,50 @@
+"""
+op_long_string / op_deep_nest 할당 상한: 결과를 max_size 안에서 바로 만들므로
+tracemalloc 피크가 max_size + SLACK을 넘지 않아야 함 (예전엔 max_size의 3~4배)
+- 사용: python3 -m pytest -q tests/test_json_ops_alloc.py
+"""
+import pathlib, random, sys, tracemalloc
+
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from mutators.json_ops import op_deep_nest, op_long_string  # noqa: E402
+
+# 측정된 최악 피크 − max_size (max_size와 무관한 상수): op_long_string 1333 B, op_deep_nest 745 B.
+# random.Random()을 측정 구간 안에서 만들면 그 상태(~2.8 KB)가 더해져 4165 / 3577 B가 되므로
+# rng는 구간 밖에서 만듦
+SLACK = 2 * 1024
+SIZES = (4 << 10, 64 << 10, 1 << 20)
+
+
+def _inputs(max_size):
+    # 예산을 거의 다 채운 입력 (최악의 경우) + 작은 입력 + '}' 없는 입력, json_adapt처럼 bytearray로도
+    bufs = [
+        b'{"a":"' + b"x" * (max_size - 8) + b'"}',
+        b'{"k":[' + b"1," * ((max_size - 10) // 2) + b"1]}",
+        b'{"a":1}',
+        b"[1,2,3]",
+    ]
+    return bufs + [bytearray(b) for b in bufs]
+
+
+def _peak(op, buf, max_size, seed):
+    rng = random.Random(seed)
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        out = op(buf, b"", max_size, rng=rng)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return out, peak
+
+
+@pytest.mark.parametrize("max_size", SIZES)
+@pytest.mark.parametrize("op", [op_long_string, op_deep_nest], ids=lambda op: op.__name__)
+def test_peak_alloc_bounded(op, max_size):
+    for buf in _inputs(max_size):
+        for seed in range(8):
+            out, peak = _peak(op, buf, max_size, seed)
+            assert len(out) <= max_size
+            assert peak <= max_size + SLACK, f"{op.__name__}: peak {peak} > {max_size} + {SLACK}"
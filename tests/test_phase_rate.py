@@ -0,0 +1,63 @@
+"""
+phase_rate.valid: json.loads가 RecursionError를 내는 깊은 중첩은 json_ast.parse(strict=True)로
+판정 — 유효한 깊은 JSON은 True, 깊은 곳에 문법 오류가 있으면 False (관대한 파서처럼 통과시키면 안 됨)
+- 사용: python3 -m pytest -q tests/test_phase_rate.py
+"""
+import json, pathlib, sys
+
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from mutators.phase_rate import valid  # noqa: E402
+
+DEPTH = 5000            # 기본 재귀 한도(1000)보다 깊게
+
+
+def _arr(inner: bytes) -> bytes:
+    return b"[" * DEPTH + inner + b"]" * DEPTH
+
+
+def _obj(inner: bytes) -> bytes:
+    return b'{"k":' * DEPTH + inner + b"}" * DEPTH
+
+
+def _recurses(buf: bytes) -> bool:
+    try:
+        json.loads(buf)
+    except RecursionError:
+        return True
+    except ValueError:
+        pass
+    return False
+
+
+DEEP_VALID = [
+    _arr(b""), _arr(b"1"), _arr(b"-0.5e+3"), _arr(b"true"), _arr(b"null"), _arr(b'"a\\n\\u00e9\\/"'),
+    _arr(b"NaN"), _obj(b'"x"'), _obj(b"[]"), b"\xef\xbb\xbf" + _arr(b"0"), _arr("\"é\"".encode()),
+]
+DEEP_INVALID = [
+    _arr(b"tru"), _arr(b"nul"), _arr(b"01"), _arr(b"1."), _arr(b"-"), _arr(b"0x10"),
+    _arr(b'"\x01"'), _arr(b'"\\q"'), _arr(b'"\\u12"'), _arr(b'"\x01\\q"'), _obj(b'"\t"'),
+    b'{"\\x":' * DEPTH + b"1" + b"}" * DEPTH, _arr(b'"\xff"'), _arr(b"1,"), _arr(b"1") + b"]",
+]
+
+
+@pytest.mark.parametrize("buf", DEEP_VALID, ids=lambda b: repr(b[DEPTH - 2:DEPTH + 12]))
+def test_deep_valid(buf):
+    assert _recurses(buf)
+    assert valid(buf)
+
+
+@pytest.mark.parametrize("buf", DEEP_INVALID, ids=lambda b: repr(b[DEPTH - 2:DEPTH + 12]))
+def test_deep_invalid(buf):
+    assert not valid(buf)
+
+
+@pytest.mark.parametrize("buf", [b"[1,2]", b'{"a":"\\u00e9"}', b"[tru]", b'"\x01"', b"", b"\xef\xbb\xbf{}"])
+def test_shallow_matches_json_loads(buf):
+    try:
+        json.loads(buf)
+        expect = True
+    except ValueError:
+        expect = False
+    assert valid(buf) == expect
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+afl-fuzz 스텁 (오케스트레이터/폴러 오프라인 점검용; 실제 퍼징 없음)
+- afl-fuzz 인자 중 -M/-S 이름, -o, -V만 해석, <out>/<name>/fuzzer_stats·plot_data를 1초마다 갱신
+- AFL_STUB_DIE_AFTER=N: 인스턴스마다 첫 실행은 N초 뒤 rc=1로 죽음 (재시작 경로 확인)
+- SIGINT/SIGTERM이나 -V 만료 시 rc=0
+- 사용: python3 tools/campaign.py --afl-fuzz tools/afl_stub.py -t json yajl -m none json_adapt -d 20
+"""
+import os, random, signal, sys, time
+
+def main():
+    argv = sys.argv[1:]
+    if "--" in argv:
+        argv = argv[:argv.index("--")]
+    opts, i = {}, 0
+    while i < len(argv):
+        if argv[i] in ("-M", "-S", "-o", "-V", "-i", "-x", "-t", "-m") and i + 1 < len(argv):
+            opts[argv[i]] = argv[i + 1]
+            i += 2
+        else:
+            i += 1
+    name = opts.get("-M") or opts.get("-S") or "default"
+    out = os.path.join(opts.get("-o", "out"), name)
+    os.makedirs(os.path.join(out, "queue"), exist_ok=True)
+    dur = float(opts.get("-V", 0) or 0)
+    die = float(os.environ.get("AFL_STUB_DIE_AFTER", 0) or 0)
+    marker = os.path.join(out, ".stub_died")
+    if die and os.path.exists(marker):
+        die = 0.0
+
+    stop = []
+    for s in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(s, lambda *_: stop.append(1))
+    rng = random.Random(os.getpid())
+    t0 = time.time()
+    execs = corpus = crashes = 0
+    plot = os.path.join(out, "plot_data")
+    if not os.path.exists(plot):
+        with open(plot, "w") as f:
+            f.write("# relative_time, cycles_done, cur_item, corpus_count, pending_total, pending_favs, "
+                    "map_size, saved_crashes, saved_hangs, max_depth, execs_per_sec, total_execs, edges_found\n")
+    print(f"[stub] {name} pid={os.getpid()} cpu={sorted(os.sched_getaffinity(0))} out={out}", flush=True)
+    while not stop:
+        el = time.time() - t0
+        if die and el >= die:
+            open(marker, "w").close()
+            print("[stub] simulated crash", flush=True)
+            sys.exit(1)
+        if dur and el >= dur:
+            break
+        eps = rng.uniform(800, 1200)
+        execs += int(eps)
+        corpus += rng.random() < 0.5
+        crashes += rng.random() < 0.02
+        cvg = min(100.0, 1.0 + corpus * 0.05)
+        with open(os.path.join(out, "fuzzer_stats.tmp"), "w") as f:
+            f.write(f"start_time        : {int(t0)}\nlast_update       : {int(time.time())}\n"
+                    f"fuzzer_pid        : {os.getpid()}\nexecs_done        : {execs}\n"
+                    f"execs_per_sec     : {eps:.2f}\ncorpus_count      : {corpus}\n"
+                    f"saved_crashes     : {crashes}\nbitmap_cvg        : {cvg:.2f}%\n"
+                    f"afl_banner        : {name}\n")
+        os.replace(os.path.join(out, "fuzzer_stats.tmp"), os.path.join(out, "fuzzer_stats"))
+        with open(plot, "a") as f:
+            f.write(f"{int(el)}, 0, 0, {corpus}, 0, 0, {cvg:.2f}%, {crashes}, 0, 1, {eps:.2f}, {execs}, {corpus}\n")
+        time.sleep(1.0)
+    print(f"[stub] {name} exiting", flush=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+AFL_PYTHON_MODULE 방식 변이기 오프라인 벤치마크 (afl-fuzz 없이 훅만 구동)
+- 대상: --module mutators.json_adapt | json_adapt | softmax_mutator | path/to/x.py ...
+- 구동: init(seed) → (부모당 --per-parent회) fuzz(buf, add_buf, max_size) → 주기적 queue_new_entry
+  add_buf는 AFL splice처럼 코퍼스의 다른 입력, max_size는 --max-size 값들을 순환
+- 출력: 전체/연산자별 mutations/sec, p50/p99 지연(µs), 호출당 할당(tracemalloc 피크),
+        출력 크기 분포; --json으로 기준선 저장, --baseline으로 회귀 비교(종료코드 1)
+- 사용: python3 tools/bench_mutator.py --module json_adapt --calls 50000 --json reports/bench/json_adapt.json
+"""
+import argparse, importlib, importlib.util, json, os, pathlib, random, sys, tempfile, time, tracemalloc
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+def load_corpus(dirs, limit=0):
+    files, bufs = [], []
+    for d in dirs:
+        for p in sorted(pathlib.Path(d).glob("*")):
+            if not p.is_file():
+                continue
+            try:
+                bufs.append(p.read_bytes())
+            except OSError:
+                continue
+            files.append(str(p))
+            if limit and len(bufs) >= limit:
+                return files, bufs
+    return files, bufs
+
+def load_module(name):
+    if name.endswith(".py"):
+        spec = importlib.util.spec_from_file_location(pathlib.Path(name).stem, name)
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        return mod
+    if "." not in name and (ROOT / "mutators" / f"{name}.py").exists():
+        name = f"mutators.{name}"
+    return importlib.import_module(name)
+
+def hook(mod, *names):
+    for n in names:
+        fn = getattr(mod, n, None)
+        if callable(fn):
+            return fn
+    return None
+
+def op_label(mod):
+    # 변이기가 마지막 연산자를 노출하면(_last_op) 그 이름으로 집계
+    op = getattr(mod, "_last_op", None)
+    if op is None:
+        return "all"
+    ops = getattr(mod, "OPS", None)
+    if isinstance(op, int) and ops is not None and 0 <= op < len(ops):
+        op = ops[op]
+    return getattr(op, "__name__", str(op))
+
+def pct(xs, p):
+    if not xs:
+        return 0
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(p / 100.0 * len(xs)))]
+
+def size_hist(sizes):
+    # 2의 거듭제곱 버킷: "<=64" → 개수
+    h = {}
+    for s in sizes:
+        b = 1
+        while b < s:
+            b <<= 1
+        h[b] = h.get(b, 0) + 1
+    return {f"<={k}": h[k] for k in sorted(h)}
+
+def drive(mod, bufs, files, calls, per_parent, max_sizes, new_entry_every, seed, sample=None):
+    """sample(fn) → (out, 측정값) 이 있으면 호출마다 측정을 위임 (할당 패스용)."""
+    fuzz = hook(mod, "afl_custom_fuzz", "fuzz")
+    qne = hook(mod, "afl_custom_queue_new_entry", "queue_new_entry")
+    rng = random.Random(seed)
+    n = len(bufs)
+    lat, sizes = {}, {}
+    t_all = time.perf_counter()
+    for i in range(calls):
+        j = (i // per_parent) % n
+        if i % per_parent == 0:
+            add = bufs[rng.randrange(n)]
+            ms = max_sizes[(i // per_parent) % len(max_sizes)]
+        if sample is None:
+            t0 = time.perf_counter_ns()
+            out = fuzz(bufs[j], add, ms)
+            dt = time.perf_counter_ns() - t0
+        else:
+            out, dt = sample(lambda: fuzz(bufs[j], add, ms))
+        label = op_label(mod)
+        lat.setdefault(label, []).append(dt)
+        sizes.setdefault(label, []).append(len(out) if out is not None else 0)
+        if qne is not None and new_entry_every and i % new_entry_every == new_entry_every - 1:
+            try:
+                qne(files[j], None)
+            except TypeError:
+                qne(files[j])
+    return time.perf_counter() - t_all, lat, sizes
+
+def alloc_sample(fn):
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    out = fn()
+    return out, max(0, tracemalloc.get_traced_memory()[1] - base)
+
+def compare(res, base, tol):
+    bad = []
+    old = base.get("mut_per_sec", 0)
+    if old and res["mut_per_sec"] < old * (1 - tol):
+        bad.append(f"total {res['mut_per_sec']:.0f} < {old:.0f} mut/s")
+    for op, r in res["ops"].items():
+        b = base.get("ops", {}).get(op)
+        if b and b.get("p99_us") and r["p99_us"] > b["p99_us"] * (1 + tol) and r["p99_us"] - b["p99_us"] > 1.0:
+            bad.append(f"{op} p99 {r['p99_us']:.1f}us > {b['p99_us']:.1f}us")
+    return bad
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--module", required=True, help="mutator module (AFL_PYTHON_MODULE style) or .py path")
+    ap.add_argument("--corpus", nargs="*", default=["corpus/seed_all", "corpus/generated"])
+    ap.add_argument("--calls", type=int, default=50000, help="fuzz() calls in the timed pass")
+    ap.add_argument("--per-parent", type=int, default=32, help="consecutive fuzz() calls per queue entry")
+    ap.add_argument("--max-size", default="1048576,65536,4096", help="comma list cycled per parent")
+    ap.add_argument("--new-entry-every", type=int, default=500, help="queue_new_entry every N calls (0 = never)")
+    ap.add_argument("--alloc-calls", type=int, default=5000, help="calls in the tracemalloc pass (0 = skip)")
+    ap.add_argument("--limit", type=int, default=0, help="max corpus files (0 = all)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", default=None, help="write results (baseline) as JSON")
+    ap.add_argument("--baseline", default=None, help="compare against a saved JSON; exit 1 on regression")
+    ap.add_argument("--tolerance", type=float, default=0.10, help="allowed regression fraction")
+    args = ap.parse_args()
+
+    files, bufs = load_corpus(args.corpus, args.limit)
+    if not bufs:
+        print(f"[!] no inputs under {args.corpus}", file=sys.stderr)
+        sys.exit(1)
+    max_sizes = [int(x) for x in args.max_size.split(",") if x.strip()]
+
+    # 변이기가 repo 안에 상태 파일(oplog ring 등)을 만들지 않도록
+    os.environ.setdefault("RAGFUZZ_OPLOG_DIR", tempfile.mkdtemp(prefix="bench_oplog_"))
+    mod = load_module(args.module)
+    if hook(mod, "afl_custom_fuzz", "fuzz") is None:
+        print(f"[!] {args.module} has no fuzz hook", file=sys.stderr)
+        sys.exit(1)
+    init = hook(mod, "afl_custom_init", "init")
+    if init is not None:
+        init(args.seed)
+
+    per_parent = max(1, args.per_parent)
+    drive(mod, bufs, files, min(2000, args.calls), per_parent, max_sizes, 0, args.seed + 1)   # 워밍업
+    wall, lat, sizes = drive(mod, bufs, files, args.calls, per_parent, max_sizes,
+                             args.new_entry_every, args.seed)
+
+    allocs = {}
+    if args.alloc_calls:
+        tracemalloc.start()
+        _, allocs, _ = drive(mod, bufs, files, args.alloc_calls, per_parent, max_sizes,
+                             args.new_entry_every, args.seed + 2, sample=alloc_sample)
+        tracemalloc.stop()
+
+    deinit = hook(mod, "afl_custom_deinit", "deinit")
+    if deinit is not None:
+        deinit()
+
+    total = sum(len(v) for v in lat.values())
+    all_sizes = [s for v in sizes.values() for s in v]
+    res = {
+        "module": mod.__name__, "inputs": len(bufs), "calls": total,
+        "per_parent": per_parent, "max_sizes": max_sizes,
+        "mut_per_sec": total / wall if wall > 0 else 0.0,
+        "size_hist": size_hist(all_sizes), "ops": {},
+    }
+    op_time = {op: sum(v) / 1e9 for op, v in lat.items()}
+    print(f"[i] {mod.__name__}: {len(bufs)} inputs, {total} calls, {res['mut_per_sec']:.0f} mut/s overall")
+    print(f"{'op':20s} {'share':>6s} {'mut/s':>10s} {'p50us':>8s} {'p99us':>8s} {'allocKB':>8s} {'out p50':>8s} {'out p99':>8s}")
+    for op in sorted(lat, key=lambda o: -len(lat[o])):
+        a = allocs.get(op, [])
+        r = {
+            "calls": len(lat[op]),
+            "mut_per_sec": len(lat[op]) / op_time[op] if op_time[op] > 0 else 0.0,
+            "p50_us": pct(lat[op], 50) / 1000.0,
+            "p99_us": pct(lat[op], 99) / 1000.0,
+            "alloc_peak_kb": (sum(a) / len(a) / 1024.0) if a else None,
+            "out_p50": pct(sizes[op], 50), "out_p99": pct(sizes[op], 99), "out_max": max(sizes[op]),
+        }
+        res["ops"][op] = r
+        ak = f"{r['alloc_peak_kb']:8.1f}" if r["alloc_peak_kb"] is not None else f"{'-':>8s}"
+        print(f"{op:20s} {r['calls'] / total:6.1%} {r['mut_per_sec']:10.0f} {r['p50_us']:8.1f} "
+              f"{r['p99_us']:8.1f} {ak} {r['out_p50']:8d} {r['out_p99']:8d}")
+    print("[i] output sizes:", " ".join(f"{k}:{v}" for k, v in res["size_hist"].items()))
+
+    if args.json:
+        pathlib.Path(os.path.dirname(args.json) or ".").mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump(res, f, indent=2)
+        print(f"[i] saved JSON: {args.json}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            bad = compare(res, json.load(f), args.tolerance)
+        for b in bad:
+            print(f"[!] regression: {b}", file=sys.stderr)
+        if bad:
+            sys.exit(1)
+        print(f"[i] within {args.tolerance:.0%} of baseline {args.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+json_ops 연산자 처리량 벤치마크 (mutations/sec, 연산자별)
+- 입력: --corpus <dir> (기본: corpus/seed_all), 각 파일을 buf / 다음 파일을 add_buf로 사용
+- 출력: 연산자별 mutations/sec + 유효율(유효 JSON 입력 → 유효 JSON 출력 비율, 시간 측정 밖에서 샘플),
+        텍스트 연산자 vs AST 연산자(json_ast 노드 테이블 편집) vs 풀 연산자(frag_pool 조각 splice) 그룹 요약
+        (+ --json 기계 판독용 결과). 풀 연산자용으로 코퍼스 전체를 먼저 frag_pool.POOL에 수확
+- 사용: python3 tools/bench_ops.py --corpus corpus/seed_all --iters 20000
+        python3 tools/bench_ops.py --ops ast --valid-samples 5000
+"""
+import argparse, json, os, pathlib, random, sys, time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from mutators.frag_pool import POOL  # noqa: E402
+from mutators.json_ops import AST_OPS, OPS, POOL_OPS  # noqa: E402
+
+def load_corpus(dirs, limit=0):
+    bufs = []
+    for d in dirs:
+        for p in sorted(pathlib.Path(d).glob("*")):
+            if not p.is_file():
+                continue
+            try:
+                bufs.append(bytearray(p.read_bytes()))
+            except OSError:
+                continue
+            if limit and len(bufs) >= limit:
+                return bufs
+    return bufs
+
+def bench_op(op, bufs, iters, max_size, per_parent=1, seed=0):
+    # per_parent: 같은 부모 버퍼를 연속으로 몇 번 변이할지 (AFL havoc 모사)
+    rng = random.Random(seed)
+    n = len(bufs)
+    t0 = time.perf_counter()
+    for i in range(iters):
+        j = i // per_parent
+        op(bufs[j % n], bufs[(j + 1) % n], max_size, rng=rng)
+    dt = time.perf_counter() - t0
+    return iters / dt if dt > 0 else 0.0
+
+def valid_rate(op, bufs, samples, max_size, seed=0):
+    # 유효 JSON 입력만 대상으로, 출력이 json.loads를 통과하는 비율
+    good = [b for b in bufs if _is_json(b)]
+    if not good or samples <= 0:
+        return None
+    rng = random.Random(seed)
+    ok = 0
+    for i in range(samples):
+        ok += _is_json(op(good[i % len(good)], good[(i + 1) % len(good)], max_size, rng=rng))
+    return ok / samples
+
+def _is_json(b):
+    try:
+        json.loads(bytes(b))
+        return True
+    except (ValueError, RecursionError):
+        return False
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", nargs="*", default=["corpus/seed_all"])
+    ap.add_argument("--iters", type=int, default=20000, help="iterations per operator")
+    ap.add_argument("--max-size", type=int, default=1 << 20)
+    ap.add_argument("--per-parent", type=int, default=1, help="consecutive calls per parent buffer")
+    ap.add_argument("--repeat", type=int, default=3, help="best-of-N runs per operator")
+    ap.add_argument("--limit", type=int, default=0, help="max corpus files (0 = all)")
+    ap.add_argument("--ops", choices=["all", "text", "ast", "pool"], default="all", help="operator group")
+    ap.add_argument("--valid-samples", type=int, default=2000, help="outputs checked per operator (0 = skip)")
+    ap.add_argument("--json", default=None, help="write results as JSON")
+    args = ap.parse_args()
+
+    bufs = load_corpus(args.corpus, args.limit)
+    if not bufs:
+        print(f"[!] no inputs under {args.corpus}", file=sys.stderr)
+        sys.exit(1)
+
+    group = {op: "text" for op in OPS}
+    group.update({op: "ast" for op in AST_OPS})
+    group.update({op: "pool" for op in POOL_OPS})
+    ops = [op for op in OPS if args.ops in ("all", group[op])]
+    if POOL is not None and any(group[op] == "pool" for op in ops):
+        for b in bufs:
+            POOL.harvest(b)
+        print(f"[i] fragment pool: {len(POOL)} fragments from {POOL.files} JSON inputs")
+    res, valid = {}, {}
+    print(f"[i] {len(bufs)} inputs, {args.iters} iters/op")
+    for op in ops:
+        name = op.__name__
+        res[name] = max(bench_op(op, bufs, args.iters, args.max_size, max(1, args.per_parent))
+                        for _ in range(max(1, args.repeat)))
+        valid[name] = valid_rate(op, bufs, args.valid_samples, args.max_size)
+        v = f"{100.0 * valid[name]:6.1f}% valid" if valid[name] is not None else ""
+        print(f"{name:20s} {res[name]:12.0f} mut/s  {v}")
+
+    # 그룹 요약: 처리량은 조화 평균(스케줄러가 고르게 뽑을 때의 실효 처리량), 유효율은 평균
+    groups = {}
+    for op in ops:
+        groups.setdefault(group[op], []).append(op.__name__)
+    summary = {}
+    for g, names in groups.items():
+        hm = len(names) / sum(1.0 / max(res[n], 1e-9) for n in names)
+        vs = [valid[n] for n in names if valid[n] is not None]
+        summary[g] = {"ops": len(names), "mut_per_sec": hm, "valid": sum(vs) / len(vs) if vs else None}
+        v = f"{100.0 * summary[g]['valid']:6.1f}% valid" if vs else ""
+        print(f"[{g}] {len(names):2d} ops {hm:12.0f} mut/s (harmonic)  {v}")
+
+    if args.json:
+        pathlib.Path(os.path.dirname(args.json) or ".").mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump({"inputs": len(bufs), "iters": args.iters, "per_parent": args.per_parent,
+                       "mut_per_sec": res, "valid": valid, "groups": summary}, f, indent=2)
+        print(f"[i] saved JSON: {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+EMAScheduler 픽 처리량 마이크로벤치 (picks/sec)
+- 연산자 수별(--ops, 기본 13 128)로 pick() / pick_many() 측정
+- --update-every N: N픽마다 reward_update 1회 (테이블 재구성 비용 포함)
+- 사용: python3 tools/bench_sched.py --ops 13 128 --picks 200000
+"""
+import argparse, pathlib, random, sys, time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from mutators.sched_ema import EMAScheduler  # noqa: E402
+
+def bench_pick(n_ops, picks, update_every):
+    sch = EMAScheduler(n_ops=n_ops)
+    for i in range(n_ops):
+        sch.reward_update(i, d_cov=random.random())
+    allowed = tuple(range(n_ops))
+    t0 = time.perf_counter()
+    for i in range(picks):
+        op = sch.pick(allowed=allowed)
+        if update_every and i % update_every == 0:
+            sch.reward_update(op, new_path=True)
+    dt = time.perf_counter() - t0
+    return picks / dt if dt > 0 else 0.0
+
+def bench_pick_many(n_ops, picks, batch):
+    sch = EMAScheduler(n_ops=n_ops)
+    allowed = tuple(range(n_ops))
+    t0 = time.perf_counter()
+    done = 0
+    while done < picks:
+        done += len(sch.pick_many(batch, allowed=allowed))
+    dt = time.perf_counter() - t0
+    return done / dt if dt > 0 else 0.0
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--ops", type=int, nargs="*", default=[13, 128])
+    ap.add_argument("--picks", type=int, default=200000)
+    ap.add_argument("--update-every", type=int, default=0, help="reward_update every N picks (0 = never)")
+    ap.add_argument("--batch", type=int, default=64, help="pick_many batch size")
+    args = ap.parse_args()
+
+    print("n_ops\tpick/s\t\tpick_many/s")
+    for n in args.ops:
+        a = bench_pick(n, args.picks, args.update_every)
+        b = bench_pick_many(n, args.picks, args.batch)
+        print(f"{n}\t{a:12.0f}\t{b:12.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+멀티 인스턴스 캠페인 오케스트레이터 (run_3way.sh / run_all.sh의 수동 -M/-S 구성 대체)
+- 매트릭스: 타깃(json/jsonc/rapidjson/yajl/yaml 또는 하니스 경로) × 변이기(none/json_adapt/...) × 시드
+  → 셀마다 sync 그룹 하나 (-o <root>/<타깃>__<변이기>, -M m + -S s1..)
+- 배치: /sys 토폴로지에서 빈 CPU(다른 프로세스가 단독 핀 중인 CPU 제외)를 물리 코어 → SMT 형제 순,
+  NUMA 노드별로 연속 배정; 인스턴스마다 sched_setaffinity 핀 (AFL_NO_AFFINITY=1)
+- 감시: 죽은 afl-fuzz는 지수 백오프로 재시작(AFL_AUTORESUME), reward_poller가 캠페인 루트를 감시
+- 사용: python3 tools/campaign.py -t json jsonc yajl rapidjson -m none json_adapt -d 3600
+        python3 tools/campaign.py -t json -m json_adapt --dry-run
+        python3 tools/campaign.py --afl-fuzz tools/afl_stub.py -t json yajl -m none json_adapt -d 20
+"""
+import argparse, os, pathlib, shutil, sys, time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from engine.campaign import Supervisor, cpu_topology, free_cpus, matrix, plan_campaign  # noqa: E402
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-t", "--targets", nargs="+", default=["json"], help="json jsonc rapidjson yajl yaml or harness paths")
+    ap.add_argument("-m", "--mutators", nargs="+", default=["json_adapt"], help="'none' or mutators/<name>")
+    ap.add_argument("-s", "--seeds", nargs="*", default=[], help="seed dirs (matrix axis; default per target)")
+    ap.add_argument("-x", "--dict", default=None, help="dictionary for every group (default per target)")
+    ap.add_argument("-o", "--out", default=None, help="campaign root (default out/camp_<utc time>)")
+    ap.add_argument("-d", "--duration", type=int, default=0, help="seconds per instance (afl-fuzz -V; 0 = until Ctrl-C)")
+    ap.add_argument("-j", "--jobs", type=int, default=0, help="max instances in total (0 = every free CPU)")
+    ap.add_argument("--per-group", type=int, default=0, help="instances per group (0 = split free CPUs evenly)")
+    ap.add_argument("--reserve", type=int, default=1, help="free CPUs left for the poller/system")
+    ap.add_argument("--oversubscribe", action="store_true", help="give every group an instance even without free CPUs")
+    ap.add_argument("--timeout-ms", type=int, default=200, help="afl-fuzz -t")
+    ap.add_argument("--afl-fuzz", default="afl-fuzz", help="afl-fuzz binary (or tools/afl_stub.py)")
+    ap.add_argument("--max-restarts", type=int, default=5)
+    ap.add_argument("--status-every", type=float, default=60.0, help="status table period in seconds (0 = off)")
+    ap.add_argument("--no-poller", action="store_true", help="do not run engine/reward_poller.py")
+    ap.add_argument("--dry-run", action="store_true", help="print the placement and exit")
+    ap.add_argument("afl_args", nargs=argparse.REMAINDER, help="extra afl-fuzz options after '--'")
+    args = ap.parse_args()
+
+    extra = args.afl_args[1:] if args.afl_args[:1] == ["--"] else args.afl_args
+    afl = args.afl_fuzz if os.sep not in args.afl_fuzz else os.path.abspath(args.afl_fuzz)
+    if not args.dry_run and shutil.which(afl) is None:
+        print(f"[!] {args.afl_fuzz} not found (use --afl-fuzz)", file=sys.stderr)
+        sys.exit(1)
+    root = os.path.abspath(args.out or os.path.join("out", time.strftime("camp_%Y%m%d_%H%M%S", time.gmtime())))
+
+    topo = cpu_topology()
+    cpus = free_cpus(topo, reserve=args.reserve if len(topo) > args.reserve else 0)
+    if args.jobs:
+        cpus = cpus[:args.jobs]
+    groups = matrix(args.targets, args.mutators, args.seeds or [None], args.dict)
+    for g in groups:
+        for p in (g.target, g.seeds):
+            if not os.path.exists(p):
+                print(f"[!] {g.name}: missing {p}", file=sys.stderr)
+                sys.exit(1)
+    plan = plan_campaign(groups, cpus, root, per_group=args.per_group, afl_fuzz=afl,
+                         timeout_ms=args.timeout_ms, duration=args.duration, extra_args=extra,
+                         oversubscribe=args.oversubscribe)
+
+    nodes = {c.node for c in topo}
+    smt = sum(1 for c in topo if c.smt > 0)
+    print(f"[i] {len(topo)} CPUs ({len(nodes)} NUMA node(s), {smt} SMT siblings), {len(cpus)} free for fuzzing")
+    node_of = {c.id: c.node for c in topo}
+    for inst in plan:
+        mod = inst.env.get("AFL_PYTHON_MODULE", "-")
+        print(f"  {inst.group + '/' + inst.name:36s} -{inst.role} cpu={inst.cpu} node={node_of.get(inst.cpu, '-')} mutator={mod}")
+    placed = {i.group for i in plan}
+    skipped = [g.name for g in groups if g.name not in placed]
+    if skipped:
+        print(f"[!] not enough free CPUs, skipped groups: {' '.join(skipped)} (use --oversubscribe)", file=sys.stderr)
+    if args.dry_run or not plan:
+        sys.exit(0 if plan else 1)
+
+    sup = Supervisor(plan, root, duration=args.duration, max_restarts=args.max_restarts,
+                     poller=not args.no_poller, status_every=args.status_every)
+    failed = sup.run()
+    print(f"[i] campaign done: {root} ({failed} instance(s) gave up)")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
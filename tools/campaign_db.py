@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+out/ 실험 이력 저장소 (SQLite)
+- ingest: fuzzer_stats 스냅샷 + plot_data 시계열을 증분 적재 (바뀐 파일/추가된 행만)
+- runs:   run별 최신 요약 (인스턴스 수, paths/edges/crashes 최대값, execs/s 합)
+- 사용: python3 tools/campaign_db.py ingest out
+        python3 tools/campaign_db.py runs --run '3way_*'
+"""
+import argparse, pathlib, sys, time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from engine.campaign_store import DEFAULT_DB, CampaignStore  # noqa: E402
+
+def _f(v):
+    try:
+        return float(str(v).rstrip("%"))
+    except (TypeError, ValueError):
+        return 0.0
+
+def cmd_ingest(db, args):
+    for root in args.roots:
+        t0 = time.perf_counter()
+        res = db.ingest(root)
+        print(f"[i] {root}: {res['instances']} instances, +{res['snapshots']} snapshots, "
+              f"+{res['plot_rows']} plot rows ({time.perf_counter() - t0:.2f}s)")
+
+def cmd_runs(db, args):
+    keys = ["paths_total", "corpus_count", "edges_found", "execs_per_sec", "unique_crashes", "saved_crashes"]
+    runs = {}
+    for r in db.latest(keys, run=args.run):
+        g = runs.setdefault(r["run"], {"inst": 0, "paths": 0.0, "edges": 0.0, "eps": 0.0, "crashes": 0.0})
+        g["inst"] += 1
+        g["paths"] = max(g["paths"], _f(r.get("corpus_count", r.get("paths_total"))))
+        g["edges"] = max(g["edges"], _f(r.get("edges_found")))
+        g["crashes"] = max(g["crashes"], _f(r.get("saved_crashes", r.get("unique_crashes"))))
+        g["eps"] += _f(r.get("execs_per_sec"))
+    print(f"{'run':32s} {'inst':>4s} {'paths':>8s} {'edges':>8s} {'crashes':>8s} {'execs/s':>10s}")
+    for name, g in sorted(runs.items()):
+        print(f"{name:32s} {g['inst']:4d} {g['paths']:8.0f} {g['edges']:8.0f} {g['crashes']:8.0f} {g['eps']:10.1f}")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--db", default=DEFAULT_DB)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("ingest", help="load new stats snapshots / plot rows")
+    p.add_argument("roots", nargs="*", default=["out"])
+    p = sub.add_parser("runs", help="per-run summary from the store")
+    p.add_argument("--run", default=None, help="glob on run name (e.g. 'exp_*')")
+    args = ap.parse_args()
+
+    with CampaignStore(args.db) as db:
+        {"ingest": cmd_ingest, "runs": cmd_runs}[args.cmd](db, args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+커버리지 기반 코퍼스 최소화 (afl-cmin의 Python 판)
+- 각 시드를 계측 타깃(기본 targets/json/*_asan)마다 1회 실행: 포크서버/퍼시스턴트 유지,
+  SysV shm 엣지 맵(__AFL_SHM_ID)으로 (엣지, 히트 버킷) 튜플 수집
+- 탐욕적 집합 덮개: 모든 타깃의 튜플을 덮는 가장 작은 시드 집합만 남김 (크래시/타임아웃 시드 제외)
+- 시드별 커버리지는 입력 sha1 기준으로 캐시(--cache) → 시드를 추가한 뒤 다시 돌리면 새 파일만 실행
+- 사용: python3 tools/cmin.py -i corpus/seed_all corpus/generated -o corpus/min -j 8 --force
+"""
+import argparse, glob, os, pathlib, shutil, sys, tempfile
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from engine.corpus_min import DEFAULT_CACHE, collect, minimize, tuple_count  # noqa: E402
+from engine.executor import DEFAULT_ASAN  # noqa: E402
+
+def seed_files(dirs):
+    out = []
+    for d in dirs:
+        for p in sorted(pathlib.Path(d).glob("*")):
+            if p.is_file() and not p.name.startswith("."):
+                out.append(str(p))
+    return out
+
+def write_out(keep, results, out_dir):
+    # 임시 디렉터리에 채운 뒤 교체: 중간에 실패해도 기존 결과가 남음
+    parent = os.path.dirname(os.path.abspath(out_dir))
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=".cmin_", dir=parent)
+    names = set()
+    for p in keep:
+        name = os.path.basename(p)
+        if name in names:            # seed_all/generated 이름 충돌(내용은 다름)
+            stem, ext = os.path.splitext(name)
+            name = f"{stem}_{results[p]['sha1'][:8]}{ext}"
+        names.add(name)
+        shutil.copyfile(p, os.path.join(tmp, name))
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+    os.replace(tmp, out_dir)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("targets", nargs="*", help="instrumented harnesses (stdin input); default targets/json/*_asan")
+    ap.add_argument("-i", "--inputs", nargs="+", default=["corpus/seed_all", "corpus/generated"])
+    ap.add_argument("-o", "--out", default="corpus/min")
+    ap.add_argument("-j", "--jobs", type=int, default=0, help="worker processes (0 = cpu count)")
+    ap.add_argument("--timeout-ms", type=int, default=1000)
+    ap.add_argument("--cache", default=DEFAULT_CACHE, help="per-seed coverage index ('' to disable)")
+    ap.add_argument("--asan-options", default=DEFAULT_ASAN)
+    ap.add_argument("--crashes", action="store_true", help="keep crashing seeds too (afl-cmin -C inverse)")
+    ap.add_argument("--force", action="store_true", help="replace a non-empty --out directory")
+    ap.add_argument("--dry-run", action="store_true", help="report only, do not write --out")
+    args = ap.parse_args()
+
+    targets = args.targets or sorted(t for t in glob.glob("targets/json/*_asan") if os.access(t, os.X_OK))
+    if not targets:
+        print("[!] no targets (pass harness paths or build targets/json/*_asan)", file=sys.stderr)
+        sys.exit(1)
+    if not args.dry_run and os.path.isdir(args.out) and os.listdir(args.out) and not args.force:
+        print(f"[!] {args.out} is not empty (use --force to replace it)", file=sys.stderr)
+        sys.exit(1)
+    files = seed_files(args.inputs)
+    if not files:
+        print(f"[!] no inputs under {args.inputs}", file=sys.stderr)
+        sys.exit(1)
+
+    log = lambda m: print(m, file=sys.stderr)  # noqa: E731
+    res = collect(files, targets, jobs=args.jobs, timeout_ms=args.timeout_ms,
+                  cache_path=args.cache or None, asan=args.asan_options, log=log)
+    keep = minimize(res, include_crashes=args.crashes)
+
+    bad = {}
+    for r in res.values():
+        if r["status"] != "ok":
+            bad[r["status"]] = bad.get(r["status"], 0) + 1
+    total = tuple_count(res, [p for p, r in res.items() if r["status"] == "ok" or args.crashes])
+    print(f"[i] targets: {', '.join(os.path.basename(t) for t in targets)}")
+    print(f"[i] {len(files)} inputs ({len({r['sha1'] for r in res.values()})} unique"
+          + "".join(f", {n} {s}" for s, n in sorted(bad.items())) + f"), {total} tuples")
+    print(f"[i] kept {len(keep)} seeds, {sum(res[p]['size'] for p in keep)} bytes, "
+          f"{tuple_count(res, keep)} tuples")
+    if not args.dry_run:
+        write_out(keep, res, args.out)
+        print(f"[i] wrote {args.out}")
+
+if __name__ == "__main__":
+    main()
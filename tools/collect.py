@@ -1,59 +1,39 @@
 #!/usr/bin/env python3
-import argparse, csv, os, glob
+import argparse, csv, os, pathlib, sys
 
-def read_fuzzer_stats(path):
-    d = {}
-    with open(path, "r", errors="ignore") as f:
-        for line in f:
-            if ":" in line:
-                k, v = line.strip().split(":", 1)
-                d[k.strip()] = v.strip()
-    return d
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from engine.campaign_store import DEFAULT_DB, CampaignStore  # noqa: E402
 
-def last_plot_row(path):
-    if not os.path.exists(path): return None, None
-    last = None
-    header = None
-    with open(path, "r", errors="ignore") as f:
-        for line in f:
-            if line.startswith("#"):
-                header = line.strip("# \n")
-                continue
-            if line.strip():
-                last = line.strip().split(",")
-    return header, last
+STAT_KEYS = ["paths_total", "edges_found", "execs_done", "execs_per_sec", "unique_crashes", "unique_hangs"]
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("outdir")
     ap.add_argument("csv_out")
+    ap.add_argument("--db", default=DEFAULT_DB, help="campaign store (see tools/campaign_db.py)")
     args = ap.parse_args()
 
     rows = []
-    for stats_path in glob.glob(os.path.join(args.outdir, "**", "fuzzer_stats"), recursive=True):
-        fuzzer_dir = os.path.dirname(stats_path)
-        pd_path = os.path.join(fuzzer_dir, "plot_data")
-        st = read_fuzzer_stats(stats_path)
-        hdr, last = last_plot_row(pd_path)
+    with CampaignStore(args.db) as db:
+        db.ingest(args.outdir)   # 바뀐 인스턴스/추가된 plot 행만 적재
+        stats = db.latest(STAT_KEYS, under=args.outdir)
+        lasts = {st["id"]: db.last_plot(st["id"]) for st in stats}
+    for st in stats:
+        fuzzer_dir = os.path.normpath(os.path.join(args.outdir, os.path.relpath(st["path"], args.outdir)))
+        last = lasts[st["id"]]
 
         row = {
             "fuzzer_dir": fuzzer_dir,
-            "paths_total": st.get("paths_total", ""),
-            "edges_found": st.get("edges_found", ""),
-            "execs_done": st.get("execs_done", ""),
-            "execs_per_sec": st.get("execs_per_sec", ""),
-            "unique_crashes": st.get("unique_crashes", ""),
-            "unique_hangs": st.get("unique_hangs", ""),
+            **{k: st.get(k, "") for k in STAT_KEYS},
         }
         if last:
-            # AFL++ plot_data는 보통 마지막 컬럼이 edges_found
-            row["plot_unix_time"] = last[0] if len(last) > 0 else ""
-            row["plot_cycles_done"] = last[1] if len(last) > 1 else ""
-            row["plot_cur_path"] = last[2] if len(last) > 2 else ""
-            row["plot_paths_total"] = last[3] if len(last) > 3 else ""
-            row["plot_execs_per_sec"] = last[10] if len(last) > 10 else ""
-            row["plot_total_execs"] = last[11] if len(last) > 11 else ""
-            row["plot_edges_found"] = last[-1]
+            # 헤더 이름으로 매핑 (AFL 버전별 컬럼 순서 차이 무관)
+            for name, col in (("plot_unix_time", "time"), ("plot_cycles_done", "cycles_done"),
+                              ("plot_cur_path", "cur_item"), ("plot_paths_total", "corpus_count"),
+                              ("plot_execs_per_sec", "execs_per_sec"), ("plot_total_execs", "total_execs"),
+                              ("plot_edges_found", "edges_found")):
+                v = last.get(col)
+                row[name] = "" if v is None or v != v else (int(v) if v.is_integer() else v)
         rows.append(row)
 
     cols = sorted({k for r in rows for k in r.keys()})
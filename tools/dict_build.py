@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+AFL 사전(-x) 컴파일러: corpus/dict 소스 병합 → 중복 제거 → 길이 제한 → 가중치 순위
+- 소스: 기본 json/manual/auto/auto_from_cve_*.dict (.bak/.clean/combined 등 산출물 제외)
+- 순위: out/**/queue 항목(새 경로를 낸 입력, orig: 시드 제외) 중 토큰을 포함한 항목 수,
+        +cov 항목은 한 번 더 셈 → weight = 1 + hits + cov_hits
+- 출력: --out (기본 corpus/dict/compiled.dict, 가중치 내림차순) + <out>.weights
+        (변이기 DictCache가 RAGFUZZ_DICT=<out>일 때 가중 샘플링에 사용)
+- 사용: python3 tools/dict_build.py --outs out --max-tokens 512
+"""
+import argparse, glob, hashlib, os, pathlib, sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from mutators.dict_util import MAX_TOKEN, escape_token, parse_dict, write_weights  # noqa: E402
+
+DEFAULT_SOURCES = ["corpus/dict/json.dict", "corpus/dict/manual.dict", "corpus/dict/auto.dict",
+                   "corpus/dict/auto_from_cve_*.dict"]
+SKIP_DIRS = {"crashes", "hangs", ".synced", ".state", "plot", "cmplog"}
+
+def merge_sources(patterns, max_len):
+    seen, order, dropped = set(), [], 0
+    for pat in patterns:
+        for path in sorted(glob.glob(pat)):
+            try:
+                toks = parse_dict(path)
+            except OSError:
+                continue
+            for t in toks:
+                if not (1 <= len(t) <= max_len):
+                    dropped += 1
+                    continue
+                if t not in seen:
+                    seen.add(t)
+                    order.append(t)
+    return order, dropped
+
+def queue_entries(roots):
+    # 내용이 같은 항목(인스턴스 간 동기화 사본)은 한 번만
+    seen = set()
+    for root in roots:
+        for d, dirs, files in os.walk(root):
+            dirs[:] = [x for x in dirs if x not in SKIP_DIRS]
+            if os.path.basename(d) != "queue":
+                continue
+            for name in files:
+                if not name.startswith("id:") or ",orig:" in name:
+                    continue
+                try:
+                    data = pathlib.Path(d, name).read_bytes()
+                except OSError:
+                    continue
+                h = hashlib.sha1(data).digest()
+                if h in seen:
+                    continue
+                seen.add(h)
+                yield data, "+cov" in name
+
+def rank(tokens, entries):
+    hits = dict.fromkeys(tokens, 0)
+    cov = dict.fromkeys(tokens, 0)
+    n = 0
+    for data, is_cov in entries:
+        n += 1
+        for t in tokens:
+            if t in data:
+                hits[t] += 1
+                if is_cov:
+                    cov[t] += 1
+    ranked = [(t, 1.0 + hits[t] + cov[t]) for t in tokens]
+    # 가중치 내림차순, 동률은 원래 소스 순서 유지
+    ranked.sort(key=lambda x: -x[1])
+    return ranked, n
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sources", nargs="*", default=DEFAULT_SOURCES, help="dict files / globs to merge")
+    ap.add_argument("--outs", nargs="*", default=["out"], help="AFL out dirs whose queue entries rank tokens")
+    ap.add_argument("--out", default="corpus/dict/compiled.dict")
+    ap.add_argument("--max-len", type=int, default=MAX_TOKEN, help="AFL per-token length limit")
+    ap.add_argument("--max-tokens", type=int, default=0, help="keep the N highest-weighted tokens (0 = all)")
+    args = ap.parse_args()
+
+    tokens, dropped = merge_sources(args.sources, min(args.max_len, MAX_TOKEN))
+    if not tokens:
+        print(f"[!] no tokens in {args.sources}", file=sys.stderr)
+        sys.exit(1)
+    ranked, n_entries = rank(tokens, queue_entries(args.outs))
+    if args.max_tokens:
+        ranked = ranked[:args.max_tokens]
+
+    pathlib.Path(os.path.dirname(args.out) or ".").mkdir(parents=True, exist_ok=True)
+    tmp = args.out + ".tmp"
+    with open(tmp, "w", encoding="ascii") as f:
+        for t, _ in ranked:
+            f.write(escape_token(t) + "\n")
+    os.replace(tmp, args.out)
+    write_weights(args.out + ".weights", ranked)
+
+    print(f"[i] {len(tokens)} unique tokens ({dropped} over length limit dropped), "
+          f"ranked over {n_entries} queue entries → {len(ranked)} written to {args.out}")
+    for t, w in ranked[:10]:
+        print(f"  {w:8.0f}  {escape_token(t)}")
+
+if __name__ == "__main__":
+    main()
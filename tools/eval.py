@@ -8,102 +8,47 @@ AFL++ 결과 집계 스크립트 (coverage/TTFC/execs/sec 요약 & 그래프)
 import argparse
 import csv
 import os
-import glob
+import sys
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from engine.campaign_store import DEFAULT_DB, CampaignStore  # noqa: E402
 
 import matplotlib
 matplotlib.use("Agg")  # headless
 import matplotlib.pyplot as plt
 
-def parse_fuzzer_stats(p: Path) -> Dict[str, str]:
-    d = {}
-    with p.open("r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            if ":" in line:
-                k, v = line.strip().split(":", 1)
-                d[k.strip()] = v.strip()
-    return d
-
-def read_plot_data(p: Path) -> List[Tuple[float, int, int, int, int, int, int, int, int, float]]:
-    """
-    Returns list of tuples:
-    (unix_time, cycles_done, paths_total, pending_total, pending_favs,
-     map_size, unique_crashes, unique_hangs, max_depth, execs_per_sec)
-    """
-    out = []
-    if not p.exists():
-        return out
-    with p.open("r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            if not line.strip():
-                continue
-            parts = line.strip().split(",")
-            if len(parts) < 10:
-                # older/newer formats may differ; try best-effort
-                parts += ["0"] * (10 - len(parts))
-            try:
-                row = (
-                    float(parts[0]),
-                    int(parts[1]),
-                    int(parts[2]),
-                    int(parts[3]),
-                    int(parts[4]),
-                    int(parts[5]),
-                    int(parts[6]),
-                    int(parts[7]),
-                    int(parts[8]),
-                    float(parts[9]),
-                )
-                out.append(row)
-            except Exception:
-                continue
-    return out
-
-def first_ttfc_seconds(plot: List[Tuple]) -> Optional[float]:
-    if not plot:
-        return None
-    t0 = plot[0][0]
-    prev_cr = 0
-    for (ts, *_rest) in plot:
-        unique_cr = _rest[5]  # index 6 overall; after ts + 5 fields
-        if unique_cr > 0 and prev_cr == 0:
-            return ts - t0
-        prev_cr = unique_cr
-    return None
-
-def scan_instances(out_dir: Path) -> List[Path]:
-    # 기대 구조: out_dir/<id>/{fuzzer_stats,plot_data,queue,crashes}
-    # (마스터 m, 슬레이브 s1,s2,... 또는 default/nvd1 등)
-    return [p for p in out_dir.iterdir() if p.is_dir()]
+STAT_KEYS = ["map_density", "bitmap_cvg", "execs_done", "execs_per_sec", "paths_total", "unique_crashes"]
 
-def summarize(out_dir: Path) -> List[Dict[str, object]]:
+def summarize(out_dir: Path, db_path: str = DEFAULT_DB) -> List[Dict[str, object]]:
+    # 기대 구조: out_dir/<id>/{fuzzer_stats,plot_data,queue,crashes}
+    # (마스터 m, 슬레이브 s1,s2,... 또는 default/nvd1 등) — 저장소에 증분 적재 후 조회
     rows = []
-    for inst in scan_instances(out_dir):
-        stats = inst / "fuzzer_stats"
-        plot = inst / "plot_data"
-        if not stats.exists():
-            continue
-        st = parse_fuzzer_stats(stats)
-        plot_rows = read_plot_data(plot)
-        ttfc = first_ttfc_seconds(plot_rows)
-
-        # 마지막 포인트로 커버리지·속도 추출(없으면 0)
-        map_density = float(st.get("map_density", st.get("bitmap_cvg", "0")).split("%")[0]) if st.get("map_density") or st.get("bitmap_cvg") else 0.0
-        execs_done = int(st.get("execs_done", "0"))
-        execs_per_sec = float(st.get("execs_per_sec", "0"))
-        paths_total = int(st.get("paths_total", "0"))
-        unique_crashes = int(st.get("unique_crashes", "0"))
-
-        rows.append({
-            "instance": inst.name,
-            "paths_total": paths_total,
-            "map_density_percent": map_density,
-            "execs_done": execs_done,
-            "execs_per_sec": execs_per_sec,
-            "unique_crashes": unique_crashes,
-            "ttfc_sec": ttfc if ttfc is not None else -1,
-        })
+    with CampaignStore(db_path) as db:
+        db.ingest(str(out_dir))
+        for st in db.latest(STAT_KEYS, under=str(out_dir)):
+            rel = os.path.relpath(st["path"], out_dir)
+            if rel == "." or os.sep in rel:
+                continue
+            ttfc = db.ttfc(st["id"])
+
+            # 마지막 포인트로 커버리지·속도 추출(없으면 0)
+            map_density = float(st.get("map_density", st.get("bitmap_cvg", "0")).split("%")[0]) if st.get("map_density") or st.get("bitmap_cvg") else 0.0
+            execs_done = int(st.get("execs_done", "0"))
+            execs_per_sec = float(st.get("execs_per_sec", "0"))
+            paths_total = int(st.get("paths_total", "0"))
+            unique_crashes = int(st.get("unique_crashes", "0"))
+
+            rows.append({
+                "instance": st["instance"].rsplit("/", 1)[-1],
+                "paths_total": paths_total,
+                "map_density_percent": map_density,
+                "execs_done": execs_done,
+                "execs_per_sec": execs_per_sec,
+                "unique_crashes": unique_crashes,
+                "ttfc_sec": ttfc if ttfc is not None else -1,
+            })
     return rows
 
 def save_csv(rows: List[Dict[str, object]], path: Path) -> None:
@@ -150,10 +95,11 @@ def main():
     ap.add_argument("--out", required=True, help="afl output root (e.g., out/exp_xxx/afl)")
     ap.add_argument("--save", default=None, help="summary csv path")
     ap.add_argument("--png", default=None, help="summary png path")
+    ap.add_argument("--db", default=DEFAULT_DB, help="campaign store (see tools/campaign_db.py)")
     args = ap.parse_args()
 
     out_dir = Path(args.out)
-    rows = summarize(out_dir)
+    rows = summarize(out_dir, args.db)
 
     if args.save:
         save_csv(rows, Path(args.save))
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+오프라인 테스트용 OpenAI 호환 스텁 서버 (표준 라이브러리만)
+- POST /v1/chat/completions (stream=true면 SSE 청크, 아니면 JSON 한 번에), POST /v1/responses
+- 프롬프트의 "Generate N" 만큼 무작위 JSON 줄을 생성 (프롬프트 해시로 시드 → 결정적)
+- --delay: 줄 사이 지연(초), --fail-every K: K번째 요청마다 429 (재시도 경로 확인용)
+- 사용: python3 tools/llm_stub.py --port 8808 &
+        python3 tools/rag_seedgen.py --bin ./targets/json/json_asan --base-url http://127.0.0.1:8808/v1 -n 40
+"""
+import argparse, hashlib, json, random, re, sys, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+KEYS = ["id", "name", "value", "items", "meta", "flag", "count", "data", "é", ""]
+
+def rand_value(rng, depth=0):
+    r = rng.random()
+    if depth < 4 and r < 0.25:
+        return {rng.choice(KEYS) + str(rng.randrange(5)): rand_value(rng, depth + 1)
+                for _ in range(rng.randrange(4))}
+    if depth < 4 and r < 0.45:
+        return [rand_value(rng, depth + 1) for _ in range(rng.randrange(4))]
+    return rng.choice([0, -1, 1, 2**31 - 1, 2**31, 2**32 - 1, 1.5e308, None, True, False, "",
+                       "x" * rng.randrange(1, 64), "\u0000퟿", rng.randrange(-1000, 1000)])
+
+def fake_lines(prompt):
+    m = re.search(r"Generate (\d+)", prompt)
+    n = int(m.group(1)) if m else 10
+    rng = random.Random(hashlib.sha1(prompt.encode("utf-8")).digest())
+    out = []
+    for i in range(n):
+        obj = {"seed": i, rng.choice(KEYS): rand_value(rng, 1)}
+        out.append(json.dumps(obj, ensure_ascii=rng.random() < 0.5))
+    if rng.random() < 0.3:
+        out.insert(0, "```json")
+        out.append("```")
+    if rng.random() < 0.3:
+        out.append('{"broken": [1, 2')      # 검증에서 걸러져야 함
+    return out
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    nreq = 0
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def _json(self, code, obj):
+        body = json.dumps(obj).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        n = int(self.headers.get("Content-Length") or 0)
+        try:
+            req = json.loads(self.rfile.read(n) or b"{}")
+        except ValueError:
+            return self._json(400, {"error": {"message": "bad json"}})
+        with Handler.lock:
+            Handler.nreq += 1
+            k = Handler.nreq
+        if self.server.fail_every and k % self.server.fail_every == 0:
+            return self._json(429, {"error": {"message": "rate limited (stub)"}})
+
+        if self.path.rstrip("/").endswith("/responses"):
+            text = "\n".join(fake_lines(str(req.get("input", ""))))
+            return self._json(200, {"id": f"resp_{k}", "object": "response", "output_text": text,
+                                    "output": [{"type": "message", "content": [{"type": "output_text", "text": text}]}]})
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            return self._json(404, {"error": {"message": f"unknown path {self.path}"}})
+
+        prompt = "".join(m.get("content", "") for m in req.get("messages", []) if isinstance(m, dict))
+        lines = fake_lines(prompt)
+        model = req.get("model", "stub")
+        if not req.get("stream"):
+            return self._json(200, {"id": f"chatcmpl-{k}", "object": "chat.completion", "model": model,
+                                    "choices": [{"index": 0, "finish_reason": "stop",
+                                                 "message": {"role": "assistant", "content": "\n".join(lines)}}]})
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def send(obj):
+            data = b"data: " + (obj if isinstance(obj, bytes) else json.dumps(obj).encode("utf-8")) + b"\n\n"
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+
+        for i, ln in enumerate(lines):
+            # 줄을 두 조각으로 나눠 보내 클라이언트의 줄 재조립도 확인
+            text = ln + ("\n" if i < len(lines) - 1 else "")
+            cut = len(text) // 2
+            for piece in (text[:cut], text[cut:]):
+                if piece:
+                    send({"id": f"chatcmpl-{k}", "object": "chat.completion.chunk", "model": model,
+                          "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]})
+            if self.server.delay:
+                time.sleep(self.server.delay)
+        send({"id": f"chatcmpl-{k}", "object": "chat.completion.chunk", "model": model,
+              "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        send(b"[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8808)
+    ap.add_argument("--delay", type=float, default=0.0, help="seconds between streamed lines")
+    ap.add_argument("--fail-every", type=int, default=0, help="answer every K-th request with 429")
+    ap.add_argument("-v", "--verbose", action="store_true")
+    args = ap.parse_args()
+    srv = ThreadingHTTPServer((args.host, args.port), Handler)
+    srv.delay, srv.fail_every, srv.verbose = args.delay, args.fail_every, args.verbose
+    print(f"[stub] listening on http://{args.host}:{args.port}/v1", file=sys.stderr)
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
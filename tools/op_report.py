@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+json_adapt 연산자 프로파일 리포트 (RAGFUZZ_PROFILE=1로 실행한 인스턴스의 op_profile.json)
+- 입력: 사이드카 파일 또는 디렉터리(하위 *.json 중 프로파일 스냅샷을 모두 합산, RAGFUZZ_PROFILE=<경로>로 쓴 것 포함)
+- 출력: 연산자별 호출 수, 총/평균 시간, p50/p99(log2 버킷 상한), 변이기 시간 점유율,
+        평균 크기 변화, 파싱 성공률 + fuzz()/파싱 검사가 벽시계 시간에서 차지하는 비율
+- 사용: AFL_OUT_DIR=out/x RAGFUZZ_PROFILE=1 AFL_PYTHON_MODULE=mutators.json_adapt afl-fuzz ... -o out/x ...
+        python3 tools/op_report.py out/x
+        python3 tools/op_report.py out/camp_*/json__json_adapt --sort calls --json reports/op_profile.json
+"""
+import argparse, json, pathlib, sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from mutators.op_profile import load, merge, quantile_ns  # noqa: E402
+
+def _us(ns):
+    return ns / 1000.0
+
+def rows(tot):
+    fuzz_ns = tot["fuzz"]["ns"] or 1
+    out = []
+    for name, o in tot["ops"].items():
+        calls = o["calls"]
+        out.append({
+            "op": name, "calls": calls, "total_ms": o["ns"] / 1e6,
+            "mean_us": _us(o["ns"] / calls) if calls else 0.0,
+            "p50_us": _us(quantile_ns(o["hist"], 0.5)), "p99_us": _us(quantile_ns(o["hist"], 0.99)),
+            "share": o["ns"] / fuzz_ns,
+            "mean_delta": o["delta"] / calls if calls else 0.0,
+            "parse_ok": o["parse_ok"] / o["parsed"] if o["parsed"] else None,
+            "parse_ms": o["parse_ns"] / 1e6,
+        })
+    return out
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("paths", nargs="+", help="op_profile.json files or dirs to search")
+    ap.add_argument("--sort", choices=["total", "calls", "mean", "p99", "parse"], default="total")
+    ap.add_argument("--json", default=None, help="write the merged table as JSON")
+    args = ap.parse_args()
+
+    snaps = load(args.paths)
+    if not snaps:
+        print(f"[!] no profiles under {' '.join(args.paths)} (run with RAGFUZZ_PROFILE=1)", file=sys.stderr)
+        sys.exit(1)
+    tot = merge(snaps)
+    table = rows(tot)
+    key = {"total": "total_ms", "calls": "calls", "mean": "mean_us", "p99": "p99_us", "parse": "parse_ms"}[args.sort]
+    table.sort(key=lambda r: -r[key])
+
+    wall = tot["wall_ns"] or 1
+    fz, ps = tot["fuzz"], tot["parse"]
+    print(f"[i] {len(snaps)} profile(s), {wall / 1e9:.1f}s instance wall time")
+    print(f"    fuzz()  {fz['calls']:>10d} calls  {fz['ns'] / 1e6:10.1f} ms  {100.0 * fz['ns'] / wall:5.1f}% of wall"
+          f"  p50 {_us(quantile_ns(fz['hist'], 0.5)):.0f}µs p99 {_us(quantile_ns(fz['hist'], 0.99)):.0f}µs")
+    print(f"    parse   {ps['calls']:>10d} calls  {ps['ns'] / 1e6:10.1f} ms  {100.0 * ps['ns'] / (fz['ns'] or 1):5.1f}% of fuzz()"
+          f"  p50 {_us(quantile_ns(ps['hist'], 0.5)):.0f}µs p99 {_us(quantile_ns(ps['hist'], 0.99)):.0f}µs")
+    print(f"{'operator':20s} {'calls':>10s} {'total ms':>10s} {'mean µs':>9s} {'p50':>7s} {'p99':>7s} "
+          f"{'%fuzz':>6s} {'Δsize':>9s} {'parse ok':>8s} {'parse ms':>9s}")
+    for r in table:
+        ok = f"{100.0 * r['parse_ok']:7.1f}%" if r["parse_ok"] is not None else f"{'-':>8s}"
+        print(f"{r['op']:20s} {r['calls']:10d} {r['total_ms']:10.1f} {r['mean_us']:9.1f} {r['p50_us']:7.0f} "
+              f"{r['p99_us']:7.0f} {100.0 * r['share']:5.1f}% {r['mean_delta']:+9.1f} {ok} {r['parse_ms']:9.1f}")
+
+    if args.json:
+        pathlib.Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"profiles": [s["path"] for s in snaps], "wall_ns": tot["wall_ns"],
+                       "fuzz": {k: fz[k] for k in ("calls", "ns")}, "parse": {k: ps[k] for k in ("calls", "ns")},
+                       "ops": table}, f, indent=2)
+        print(f"[i] wrote {args.json}")
+
+if __name__ == "__main__":
+    main()
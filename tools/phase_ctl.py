@@ -1,26 +1,31 @@
-import time, json, pathlib, argparse
+import sys, time, json, pathlib, argparse
 
-def read_stats(fp):
-    d = {}
-    with open(fp, "r") as f:
-        for line in f:
-            if ":" in line:
-                k, v = line.split(":", 1)
-                d[k.strip()] = v.strip()
-    return d
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from engine.stats_watch import StatsWatcher  # noqa: E402
 
 def main(out_dir, window_sec=180, k=3, interval=5):
     out = pathlib.Path(out_dir)
-    fuzzer_stats = out / "default" / "fuzzer_stats"
-    ctl_file     = out / "default" / "phase_ctl.json"
+    inst         = out / "default"
+    fuzzer_stats = inst / "fuzzer_stats"
+    ctl_file     = inst / "phase_ctl.json"
     hist = []
-    print(f"[phase-ctl] watching {fuzzer_stats}")
+    latest = {"paths_total": None}
+
+    def on_stats(path, cur, prev):
+        latest["paths_total"] = int(cur.get("paths_total", "0"))
+
+    # fuzzer_stats가 갱신될 때만 파싱 (inotify, 없으면 interval 주기 mtime 비교)
+    watcher = StatsWatcher(str(inst), depth=0, interval=interval)
+    watcher.subscribe(on_stats)
+    print(f"[phase-ctl] watching {fuzzer_stats} ({watcher.mode})")
     while True:
         try:
-            s = read_stats(fuzzer_stats)
+            watcher.run_once(timeout=interval)
+            if latest["paths_total"] is None:
+                # 아직 fuzzer_stats가 안 생겼을 때
+                continue
             now = time.time()
-            paths_total = int(s.get("paths_total", "0"))
-            hist.append((now, paths_total))
+            hist.append((now, latest["paths_total"]))
             # 최근 window_sec 구간만 유지
             hist = [(t, p) for (t, p) in hist if now - t <= window_sec]
             plateau = False
@@ -28,13 +33,9 @@ def main(out_dir, window_sec=180, k=3, interval=5):
                 delta = hist[-1][1] - hist[0][1]
                 plateau = (delta < k)
             ctl_file.write_text(json.dumps({"plateau": plateau}))
-        except FileNotFoundError:
-            # 아직 fuzzer_stats가 안 생겼을 때
-            pass
         except Exception:
             # 조용히 재시도
-            pass
-        time.sleep(interval)
+            time.sleep(interval)
 
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
@@ -1,7 +1,14 @@
 #!/usr/bin/env python3
-import os, json, glob, subprocess, argparse, random, time, pathlib, re, sys
+import os, json, glob, argparse, random, time, pathlib, re, sys, asyncio, hashlib, ssl, urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Iterable
 
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from engine.executor import Executor  # noqa: E402
+from engine.hint_miner import DEFAULT_PATH as HINT_SUMMARY, HintMiner  # noqa: E402
+from mutators.dict_util import MAX_TOKEN, escape_token, parse_dict  # noqa: E402
+from rag.local_index import DEFAULT_DIR as RAG_INDEX, LocalIndex  # noqa: E402
+
 # ---------- 설정 로딩 ----------
 def _read_text_file(path: str) -> str:
     return pathlib.Path(path).read_text(encoding="utf-8", errors="ignore").strip()
@@ -77,141 +84,454 @@ def extract_keys_from_files(files: Iterable[str], limit=500) -> List[str]:
             continue
     return sorted(keys)[:128]
 
-def gather_hints(corpus_dirs: List[str], out_dirs: List[str]) -> Dict[str, Any]:
-    files = []
-    for d in corpus_dirs or []:
-        files += glob.glob(os.path.join(d, "*.json"))
+def gather_hints(corpus_dirs: List[str], out_dirs: List[str],
+                 summary_path: str|None=HINT_SUMMARY) -> Dict[str, Any]:
+    """
+    키/형태 힌트: 누적 요약(summary_path)에 새 파일만 반영 → 빈도순 키 + 코퍼스 프로파일.
+    summary_path=None이면 기존 방식(최대 500개 파일을 매번 파싱, 키 알파벳순).
+    """
+    if not summary_path:
+        files = []
+        for d in corpus_dirs or []:
+            files += glob.glob(os.path.join(d, "*.json"))
+        for out in out_dirs or []:
+            q = os.path.join(out, "default", "queue", "*")
+            files += glob.glob(q)
+        keys = extract_keys_from_files(files, limit=500)
+        return {"keys": keys}
+
+    miner = HintMiner(summary_path)
+    n = miner.update(corpus_dirs or [], pattern=r".*\.json")
+    qdirs = []
     for out in out_dirs or []:
-        q = os.path.join(out, "default", "queue", "*")
-        files += glob.glob(q)
-    keys = extract_keys_from_files(files, limit=500)
-    return {"keys": keys}
+        qdirs += [os.path.join(out, "default", "queue")] + glob.glob(os.path.join(out, "*", "queue"))
+    n += miner.update(sorted(set(qdirs)))
+    miner.save()
+    prof = miner.profile()
+    print(f"[rag] hints: {n} new files mined ({prof['files']} total)", file=sys.stderr)
+    return {"keys": miner.top_keys(128), "profile": prof}
+
+# 하니스 바이너리 이름 → 라이브러리(CVE/CPE 질의어)
+TARGET_LIBS = {"json": "jansson", "jsonc": "json-c", "rapidjson": "rapidjson", "yajl": "yajl"}
+
+def target_library(bin_path: str) -> str:
+    name = os.path.basename(bin_path)
+    for suf in ("_asan", "_ubsan", "_msan", "_cmplog", "_plain"):
+        name = name.replace(suf, "")
+    return TARGET_LIBS.get(name, name)
+
+def retrieve_context(query: str, index_dir: str = RAG_INDEX, k: int = 4, width: int = 300,
+                     min_score: float = 0.1) -> List[str]:
+    """로컬 인덱스에서 query와 가까운 CVE/CPE 문단 k개 (인덱스가 없으면 빈 목록)."""
+    if k <= 0 or not query:
+        return []
+    ix = LocalIndex(index_dir)
+    try:
+        return [f"[{h['key']}] " + " ".join(h["text"].split())[:width] for h in ix.query(query, k=k, min_score=min_score)]
+    finally:
+        ix.close()
 
 # ---------- 하니스 빠른 검증 ----------
+# 바이너리별 실행기 재사용: 포크서버/퍼시스턴트 자식을 후보마다 새로 띄우지 않음
+_EXECUTORS: Dict[tuple, Executor] = {}
+
+def _executor(bin_path: str, timeout_ms: int) -> Executor:
+    key = (bin_path, int(timeout_ms))
+    ex = _EXECUTORS.get(key)
+    if ex is None:
+        ex = _EXECUTORS[key] = Executor(bin_path, timeout_ms=timeout_ms)
+    return ex
+
 def fast_harness_ok(bin_path: str, data: str, timeout_ms=60) -> bool:
     try:
-        p = subprocess.run(
-            [bin_path],
-            input=data.encode("utf-8", "ignore"),
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            timeout=timeout_ms / 1000.0,
-            check=False,
-        )
-        # 신호로 죽지 않았으면 OK로 간주
-        return p.returncode >= 0
-    except subprocess.TimeoutExpired:
-        return False
+        r = _executor(bin_path, timeout_ms).run(data.encode("utf-8", "ignore"))
     except Exception:
         return False
+    # 신호로 죽지 않고 시간 안에 끝났으면 OK로 간주
+    return r.ok
 
 # ---------- LLM 호출 ----------
-def llm_generate_jsons(hints: Dict[str, Any], n=40, model="gpt-4o-mini",
-                       temperature=1.1, api_key=None, base_url=None) -> List[str]:
-    """
-    OpenAI 호환 Responses API 호출 (python SDK v1.x).
-    키/엔드포인트는 인수로 주입 (환경변수 의존 X).
-    """
-    prompt = f"""You are a fuzzing seed generator.
+# 배치마다 초점을 바꿔 같은 힌트로도 서로 다른 프롬프트(→ 서로 다른 캐시 키)가 되게 함
+FOCUS = [
+    "integer/float boundary values and exponents",
+    "long, short, empty and escape-heavy strings (\\u escapes, control chars)",
+    "deep nesting of arrays and objects (depth 3~6)",
+    "objects with many keys, duplicate keys and unusual key names",
+    "mixed-type arrays, nulls, booleans and empty containers",
+]
+
+def build_prompt(hints: Dict[str, Any], n: int, variant: int = -1) -> str:
+    keys = hints.get('keys', [])[:64]
+    context = ""
+    prof = hints.get("profile")
+    if prof and prof.get("files"):
+        types = ", ".join(f"{t} {int(r * 100)}%" for t, r in list(prof["types"].items())[:5])
+        context += (f"- Corpus profile: value types {types}; "
+                    f"nesting depth p50={prof['depth_p50']} p90={prof['depth_p90']} max={prof['depth_max']}; "
+                    f"common number magnitudes {', '.join(prof['numbers'][:6])}. "
+                    f"Go beyond these shapes.\n")
+    if hints.get("context"):
+        context += ("- Known vulnerabilities of the target parser; craft inputs that stress these code paths:\n"
+                   + "".join(f"  * {c}\n" for c in hints["context"]))
+    focus = ""
+    if variant >= 0:
+        if keys:
+            r = (variant * 16) % len(keys)
+            keys = keys[r:] + keys[:r]
+        focus = f"- Emphasize: {FOCUS[variant % len(FOCUS)]} (batch {variant}).\n"
+    return f"""You are a fuzzing seed generator.
 
 Generate {n} *diverse* JSON objects for robustness testing.
 Requirements:
 - One JSON object per line (JSON Lines). No code fences, no comments.
 - Include boundary values (e.g., -1, 0, 1, 2^31-1, 2^31, 2^32-1), long/short strings, nulls, nested arrays/objects.
-- Prefer keys if relevant: {hints.get('keys', [])[:64]}
-- Add unusual structures: empty arrays/objects, deep nesting (depth 3~6), mixed types.
-- Keep each object under ~4KB.
+- Prefer keys if relevant: {keys}
+{context}- Add unusual structures: empty arrays/objects, deep nesting (depth 3~6), mixed types.
+{focus}- Keep each object under ~4KB.
 Output: only raw JSON objects, each on its own line.
 """
 
-    # 1) 신형 SDK (권장)
-    try:
-        from openai import OpenAI
-        kwargs = {}
-        if api_key:  kwargs["api_key"]  = api_key
-        if base_url: kwargs["base_url"] = base_url
-        client = OpenAI(**kwargs)
-        resp = client.responses.create(
-            model=model,
-            input=prompt,
-            temperature=float(temperature),
-            max_output_tokens=min(8192, n * 256),
-        )
-        text = getattr(resp, "output_text", None)
-        if not text:
-            # 드문 호환 케이스
-            text = "".join(getattr(c, "delta", "") for c in getattr(getattr(resp, "output", None), "choices", []) or [])
-    except Exception as e1:
-        # 2) 구버전 ChatCompletion 폴백
+def clean_line(ln: str) -> str:
+    # 코드펜스/빈줄은 "" (버림), 끝쉼표 제거
+    s = ln.strip()
+    if not s or s.startswith("```"):
+        return ""
+    return re.sub(r",\s*$", "", s)
+
+# ---------- 비동기 생성 파이프라인 ----------
+class ResponseCache:
+    """jsonl: 한 줄 = {key, model, response}. key = sha1(model, temperature, 프롬프트(힌트 포함))."""
+
+    def __init__(self, path: str|None):
+        self.path = path
+        self.recs: Dict[str, str] = {}
+        if not path:
+            return
         try:
-            import openai
-            if api_key:  openai.api_key = api_key
-            if base_url:
-                # 구 SDK는 api_base
-                openai.api_base = base_url
-            chat = openai.ChatCompletion.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=float(temperature),
-            )
-            text = chat["choices"][0]["message"]["content"]
-        except Exception as e2:
-            print(f"[rag] OpenAI call failed: {e1} / {e2}", file=sys.stderr)
-            return []
-
-    if not text:
-        return []
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                        self.recs[rec["key"]] = rec["response"]
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def key(model: str, temperature: float, prompt: str) -> str:
+        return hashlib.sha1(json.dumps([model, float(temperature), prompt]).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str|None:
+        return self.recs.get(key)
+
+    def put(self, key: str, model: str, response: str) -> None:
+        self.recs[key] = response
+        if not self.path:
+            return
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"key": key, "model": model, "response": response}) + "\n")
+
+class RateLimiter:
+    """요청 시작 간격을 60/rpm초 이상으로 (rpm<=0이면 무제한)."""
+
+    def __init__(self, rpm: float):
+        self.interval = 60.0 / rpm if rpm and rpm > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            if self._next > now:
+                await asyncio.sleep(self._next - now)
+            self._next = max(now, self._next) + self.interval
+
+class LLMHTTPError(Exception):
+    def __init__(self, status: int, body: bytes = b""):
+        super().__init__(f"HTTP {status}: {body[:200]!r}")
+        self.status = status
+
+    @property
+    def retryable(self) -> bool:
+        return self.status in (0, 429) or self.status >= 500   # 0 = 상태줄 없이 끊김
 
-    # 라인 단위 파싱 (코드펜스/빈줄/끝쉼표 제거)
-    out = []
-    for ln in text.splitlines():
-        s = ln.strip()
-        if not s or s.startswith("```"):
+async def _http_post_stream(url: str, headers: Dict[str, str], body: bytes, timeout: float):
+    """표준 라이브러리만으로 HTTP/1.1 POST → 응답 본문 조각을 도착하는 대로 yield (chunked 지원)."""
+    u = urllib.parse.urlsplit(url)
+    ctx = ssl.create_default_context() if u.scheme == "https" else None
+    port = u.port or (443 if ctx else 80)
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(u.hostname, port, ssl=ctx), timeout)
+    try:
+        path = (u.path or "/") + (f"?{u.query}" if u.query else "")
+        head = [f"POST {path} HTTP/1.1", f"Host: {u.netloc}", f"Content-Length: {len(body)}",
+                "Connection: close"] + [f"{k}: {v}" for k, v in headers.items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        parts = status_line.split(None, 2)
+        status = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
+        hdrs = {}
+        while True:
+            ln = await asyncio.wait_for(reader.readline(), timeout)
+            if ln in (b"\r\n", b"\n", b""):
+                break
+            k, _, v = ln.decode("latin-1").partition(":")
+            hdrs[k.strip().lower()] = v.strip()
+        if status >= 400 or status == 0:
+            raise LLMHTTPError(status, await asyncio.wait_for(reader.read(4096), timeout))
+
+        if "chunked" in hdrs.get("transfer-encoding", "").lower():
+            while True:
+                size = int((await asyncio.wait_for(reader.readline(), timeout)).split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    break
+                yield await asyncio.wait_for(reader.readexactly(size), timeout)
+                await reader.readline()
+        else:
+            left = int(hdrs.get("content-length", -1))
+            while left != 0:
+                chunk = await asyncio.wait_for(reader.read(65536 if left < 0 else min(left, 65536)), timeout)
+                if not chunk:
+                    break
+                left -= len(chunk) if left > 0 else 0
+                yield chunk
+    finally:
+        writer.close()
+
+async def _chat_stream_stdlib(prompt: str, model: str, temperature: float, api_key, base_url, timeout: float):
+    """Chat Completions(stream=True) SSE → 텍스트 델타. 서버가 스트림을 안 주면 본문 전체를 한 번에."""
+    url = (base_url or "https://api.openai.com/v1").rstrip("/") + "/chat/completions"
+    headers = {"Content-Type": "application/json", "Accept": "text/event-stream"}
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+    body = json.dumps({"model": model, "temperature": float(temperature), "stream": True,
+                       "messages": [{"role": "user", "content": prompt}]}).encode("utf-8")
+    buf, raw, sse = b"", b"", None
+    async for chunk in _http_post_stream(url, headers, body, timeout):
+        buf += chunk
+        if sse is None:
+            sse = buf.lstrip().startswith(b"data:") or buf.lstrip().startswith(b":")
+        if not sse:
+            raw = buf
             continue
-        s = re.sub(r",\s*$", "", s)
-        out.append(s)
-    return out
+        *lines, buf = buf.split(b"\n")
+        for ln in lines:
+            ln = ln.strip()
+            if not ln.startswith(b"data:"):
+                continue
+            data = ln[5:].strip()
+            if data == b"[DONE]":
+                return
+            try:
+                ch = json.loads(data)["choices"][0]
+            except (ValueError, KeyError, IndexError, TypeError):
+                continue
+            delta = (ch.get("delta") or ch.get("message") or {}).get("content")
+            if delta:
+                yield delta
+    if not sse and raw:
+        ch = json.loads(raw)["choices"][0]
+        yield (ch.get("message") or {}).get("content") or ""
+
+async def _chat_stream(prompt: str, model: str, temperature: float, api_key, base_url, timeout: float):
+    # 1) AsyncOpenAI 스트리밍 (SDK 있으면)  2) 표준 라이브러리 HTTP 폴백
+    try:
+        from openai import AsyncOpenAI
+    except ImportError:
+        AsyncOpenAI = None
+    if AsyncOpenAI is None:
+        async for d in _chat_stream_stdlib(prompt, model, temperature, api_key, base_url, timeout):
+            yield d
+        return
+    kwargs = {"timeout": timeout, "max_retries": 0}
+    if api_key:  kwargs["api_key"]  = api_key
+    if base_url: kwargs["base_url"] = base_url
+    client = AsyncOpenAI(**kwargs)
+    try:
+        stream = await client.chat.completions.create(
+            model=model, messages=[{"role": "user", "content": prompt}],
+            temperature=float(temperature), stream=True)
+        async for ch in stream:
+            if ch.choices and ch.choices[0].delta and ch.choices[0].delta.content:
+                yield ch.choices[0].delta.content
+    except Exception as e:
+        st = getattr(e, "status_code", None)
+        if st is not None:
+            raise LLMHTTPError(int(st)) from e
+        raise
+    finally:
+        await client.close()
+
+async def generate_async(hints: Dict[str, Any], n=50, model="gpt-4o-mini", temperature=1.1,
+                         api_key=None, base_url=None, batch=10, concurrency=4, rpm=0.0,
+                         cache: ResponseCache|None=None, validate=None, on_seed=None,
+                         retries=3, timeout=120.0, log=None) -> Dict[str, int]:
+    """
+    n개를 batch개씩 나눠 동시 요청(세마포어 + rpm 제한), 스트림으로 도착하는 JSON 줄을
+    바로 큐에 넣고 검증 워커(스레드 1개, 실행기 재사용)가 validate(line) → on_seed(line).
+    완료된 응답은 cache에 저장 → 같은 힌트로 다시 돌리면 네트워크 호출 없음.
+    """
+    log = log or (lambda m: print(m, file=sys.stderr))
+    k = max(1, -(-int(n) // max(1, batch)))
+    sizes = [min(batch, n - i * batch) for i in range(k)]
+    q: asyncio.Queue = asyncio.Queue()
+    sem = asyncio.Semaphore(max(1, concurrency))
+    limiter = RateLimiter(rpm)
+    stats = {"requests": 0, "cached": 0, "failed": 0, "lines": 0, "dup": 0, "kept": 0}
+
+    async def one(i: int, size: int):
+        prompt = build_prompt(hints, size, variant=i)
+        key = ResponseCache.key(model, temperature, prompt)
+        hit = cache.get(key) if cache is not None else None
+        if hit is not None:
+            stats["cached"] += 1
+            for ln in hit.splitlines():
+                await q.put(ln)
+            return
+        async with sem:
+            for attempt in range(retries + 1):
+                await limiter.wait()
+                stats["requests"] += 1
+                parts, pending = [], ""
+                try:
+                    async for delta in _chat_stream(prompt, model, temperature, api_key, base_url, timeout):
+                        parts.append(delta)
+                        pending += delta
+                        *done, pending = pending.split("\n")
+                        for ln in done:
+                            await q.put(ln)
+                    if pending:
+                        await q.put(pending)
+                    if cache is not None:
+                        cache.put(key, model, "".join(parts))
+                    return
+                except Exception as e:
+                    # 이미 흘려보낸 줄은 중복 제거가 처리; 재시도는 429/5xx/네트워크 오류만
+                    retry = attempt < retries and (not isinstance(e, LLMHTTPError) or e.retryable)
+                    log(f"[rag] batch {i}: {e}" + (" (retrying)" if retry else ""))
+                    if not retry:
+                        stats["failed"] += 1
+                        return
+                    await asyncio.sleep(min(30.0, 0.5 * 2 ** attempt) * (1 + random.random()))
+
+    loop = asyncio.get_running_loop()
+    pool = ThreadPoolExecutor(max_workers=1)
+    seen = set()
+
+    async def consumer():
+        while True:
+            ln = await q.get()
+            if ln is None:
+                return
+            s = clean_line(ln)
+            if not s:
+                continue
+            stats["lines"] += 1
+            if s in seen:
+                stats["dup"] += 1
+                continue
+            seen.add(s)
+            ok = True if validate is None else await loop.run_in_executor(pool, validate, s)
+            if ok:
+                stats["kept"] += 1
+                if on_seed is not None:
+                    on_seed(s)
+
+    cons = asyncio.create_task(consumer())
+    try:
+        await asyncio.gather(*(one(i, sz) for i, sz in enumerate(sizes)))
+    finally:
+        await q.put(None)
+        await cons
+        pool.shutdown(wait=True)
+    return stats
 
 # ---------- 메인 ----------
 def main(bin_path: str, out_dir_seeds: str, out_dict: str, n=50, model="gpt-4o-mini",
-         corpus_dirs: List[str]=None, out_dirs: List[str]=None, config_path: str|None=None):
+         corpus_dirs: List[str]=None, out_dirs: List[str]=None, config_path: str|None=None,
+         batch=10, concurrency=4, rpm=0.0, cache_path: str|None="corpus/.llm_cache.jsonl",
+         base_url: str|None=None, index_dir: str|None=RAG_INDEX, rag_k=4, target: str|None=None,
+         hint_summary: str|None=HINT_SUMMARY):
     pathlib.Path(out_dir_seeds).mkdir(parents=True, exist_ok=True)
     pathlib.Path(os.path.dirname(out_dict)).mkdir(parents=True, exist_ok=True)
 
     llm_cfg = load_llm_config(config_path)
     # CLI가 모델을 주면 우선, 아니면 설정 파일의 모델 사용
     if not model: model = llm_cfg["model"]
+    if base_url: llm_cfg["base_url"] = base_url
 
-    hints = gather_hints(corpus_dirs or ["corpus/json_seeds","corpus/generated"], out_dirs or [])
-    cands = llm_generate_jsons(
-        hints, n=n, model=model, temperature=llm_cfg["temperature"],
-        api_key=llm_cfg["api_key"], base_url=llm_cfg["base_url"]
-    )
+    hints = gather_hints(corpus_dirs or ["corpus/json_seeds","corpus/generated"], out_dirs or [], hint_summary)
+    if index_dir:
+        lib = target or target_library(bin_path)
+        hints["context"] = retrieve_context(lib, index_dir, k=rag_k)
+        print(f"[rag] {len(hints['context'])} context snippets for '{lib}' from {index_dir}", file=sys.stderr)
 
-    kept = 0
-    for idx, line in enumerate(cands):
-        if not parse_ok(line):
-            continue
-        if not fast_harness_ok(bin_path, line):
+    # auto.dict에 이미 있는 토큰은 다시 붙이지 않음 (파일 무한 증가 방지)
+    try:
+        dict_seen = set(parse_dict(out_dict))
+    except OSError:
+        dict_seen = set()
+    # 이미 저장된 시드와 같은 내용은 다시 쓰지 않음 (캐시 재실행 시 중복 파일 방지)
+    have = set()
+    for fn in glob.glob(os.path.join(out_dir_seeds, "*")):
+        try:
+            have.add(hashlib.sha1(pathlib.Path(fn).read_bytes()).digest())
+        except OSError:
             continue
-        ts = int(time.time())
-        fn = os.path.join(out_dir_seeds, f"auto_{ts}_{idx:03d}.json")
+
+    ts = int(time.time())
+    kept = [0]
+
+    def save_seed(line: str):
+        data = line.encode("utf-8")
+        h = hashlib.sha1(data).digest()
+        if h in have:
+            return
+        have.add(h)
+        fn = os.path.join(out_dir_seeds, f"auto_{ts}_{kept[0]:03d}.json")
         try:
-            pathlib.Path(fn).write_text(line)
-            kept += 1
-            # 딕셔너리 후보: 최상위 키만 기록
-            try:
-                obj = json.loads(line)
-                if isinstance(obj, dict):
+            pathlib.Path(fn).write_bytes(data)
+            kept[0] += 1
+        except Exception:
+            return
+        # 딕셔너리 후보: 최상위 키만 기록
+        try:
+            obj = json.loads(line)
+            if isinstance(obj, dict):
+                new = [k.encode("utf-8") for k in obj.keys()]
+                new = [t for t in dict.fromkeys(new) if t not in dict_seen and 1 <= len(t) <= MAX_TOKEN]
+                if new:
                     with open(out_dict, "a") as f:
-                        for k in obj.keys():
-                            f.write(f"\"{k}\"\n")
-            except Exception:
-                pass
+                        for t in new:
+                            f.write(escape_token(t) + "\n")
+                    dict_seen.update(new)
         except Exception:
-            continue
+            pass
+
+    def validate(line: str) -> bool:
+        return parse_ok(line) and fast_harness_ok(bin_path, line)
 
-    print(f"[rag] kept {kept}/{len(cands)}")
+    t0 = time.monotonic()
+    try:
+        st = asyncio.run(generate_async(
+            hints, n=n, model=model, temperature=llm_cfg["temperature"],
+            api_key=llm_cfg["api_key"], base_url=llm_cfg["base_url"],
+            batch=batch, concurrency=concurrency, rpm=rpm,
+            cache=ResponseCache(cache_path), validate=validate, on_seed=save_seed))
+    finally:
+        for ex in _EXECUTORS.values():
+            ex.close()
+        _EXECUTORS.clear()
+    print(f"[rag] kept {kept[0]}/{st['lines']} lines ({st['kept']} valid, {st['dup']} dup) from "
+          f"{st['requests']} requests + {st['cached']} cached, {st['failed']} failed, "
+          f"{time.monotonic() - t0:.1f}s")
 
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
@@ -223,8 +543,20 @@ if __name__ == "__main__":
     ap.add_argument("--corpus", nargs="*", default=["corpus/json_seeds","corpus/generated"])
     ap.add_argument("--outs", nargs="*", default=[], help="optional AFL out/ dirs to mine keys from")
     ap.add_argument("--config", default=None, help="path to TOML config (default: ~/.config/ragfuzz/config.toml)")
+    ap.add_argument("--batch", type=int, default=10, help="seeds per LLM request")
+    ap.add_argument("-c", "--concurrency", type=int, default=4, help="requests in flight")
+    ap.add_argument("--rpm", type=float, default=0, help="max requests per minute (0 = unlimited)")
+    ap.add_argument("--cache", default="corpus/.llm_cache.jsonl", help="prompt→response cache ('' to disable)")
+    ap.add_argument("--hint-summary", default=HINT_SUMMARY, help="incremental key/shape summary ('' = re-parse up to 500 files)")
+    ap.add_argument("--index", default=RAG_INDEX, help="local RAG index (rag/index/build_index.py; '' to disable)")
+    ap.add_argument("--rag-k", type=int, default=4, help="vulnerability snippets added to each prompt")
+    ap.add_argument("--target", default=None, help="library name for retrieval (default: from --bin)")
+    ap.add_argument("--base-url", default=None, help="override llm.base_url (e.g. http://127.0.0.1:8808/v1 for tools/llm_stub.py)")
     args = ap.parse_args()
     main(args.bin, args.out_seeds, args.out_dict,
          n=args.n, model=args.model,
          corpus_dirs=args.corpus, out_dirs=args.outs,
-         config_path=args.config)
+         config_path=args.config, batch=args.batch, concurrency=args.concurrency,
+         rpm=args.rpm, cache_path=args.cache or None, base_url=args.base_url,
+         index_dir=args.index or None, rag_k=args.rag_k, target=args.target,
+         hint_summary=args.hint_summary or None)
@@ -251,6 +251,8 @@ seed_gen() {
 
   # RAG 시드 생성 (옵션: 파일 존재만 체크)
   if [ -z "$RAG_SKIP" ] && [ -f tools/rag_seedgen.py ]; then
+    # details/ 등 새 CVE 텍스트만 로컬 인덱스에 추가 (프롬프트에 취약점 문맥 주입)
+    python3 rag/index/build_index.py || true
     python3 tools/rag_seedgen.py \
       --bin "${BIN}" \
       --config "${RAG_CONFIG}" \
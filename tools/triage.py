@@ -1,24 +1,48 @@
 #!/usr/bin/env python3
-import os, sys, subprocess, hashlib, glob
+"""
+크래시 트리아지: 프로세스 풀에서 재현 → ASAN 상위 N 프레임 시그니처로 클러스터링
+- 결과는 입력 sha1 기준으로 캐시(--cache), 다시 돌리면 새 파일만 재현
+- 출력: reports/triage.json (scripts/make_static_report.py 입력)
+- 사용: python3 tools/triage.py ./targets/json/json_asan out/*/default/crashes -j 8
+"""
+import argparse, glob, json, os, pathlib, sys
 
-target = sys.argv[1]
-crash_dir = sys.argv[2]
-env = os.environ.copy()
-env["ASAN_OPTIONS"] = "abort_on_error=1:symbolize=0:handle_segv=1"
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from engine.crash_triage import DEFAULT_ASAN, cluster, triage  # noqa: E402
 
-clusters = {}
-for path in glob.glob(os.path.join(crash_dir, "id:*")):
-    try:
-        p = subprocess.run([target], input=open(path,"rb").read(),
-                           stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, env=env, timeout=2)
-    except Exception as e:
-        out = str(e).encode()
-    else:
-        out = p.stderr or b""
-    sig = b"\n".join([ln for ln in out.splitlines() if b" at " in ln or b"#" in ln])[:4096]
-    h = hashlib.sha1(sig).hexdigest()[:12]
-    clusters.setdefault(h, []).append(os.path.basename(path))
+def crash_files(dirs):
+    out = []
+    for d in dirs:
+        out += [p for p in glob.glob(os.path.join(d, "id:*")) if os.path.isfile(p)]
+    return sorted(out)
 
-for h, items in sorted(clusters.items(), key=lambda x: -len(x[1])):
-    print(f"[{h}] x{len(items)}")
-    for it in items[:5]: print("  ", it)
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("target", help="harness binary (stdin input)")
+    ap.add_argument("crash_dirs", nargs="+", help="crashes/ directories")
+    ap.add_argument("-j", "--jobs", type=int, default=0, help="worker processes (0 = cpu count)")
+    ap.add_argument("--frames", type=int, default=5, help="top-N frames in the signature")
+    ap.add_argument("--timeout-ms", type=int, default=2000)
+    ap.add_argument("--cache", default="triage/cache.jsonl", help="on-disk result index ('' to disable)")
+    ap.add_argument("--out", default="reports/triage.json")
+    ap.add_argument("--asan-options", default=DEFAULT_ASAN)
+    args = ap.parse_args()
+
+    files = crash_files(args.crash_dirs)
+    res = triage(files, args.target, jobs=args.jobs, timeout_ms=args.timeout_ms,
+                 top=args.frames, cache_path=args.cache or None, asan=args.asan_options,
+                 log=lambda m: print(m, file=sys.stderr))
+    clusters = cluster(res)
+
+    pathlib.Path(os.path.dirname(args.out) or ".").mkdir(parents=True, exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(clusters, f, indent=2)
+
+    for c in clusters:
+        what = c["kind"] or (f"signal {c['signal']}" if c["status"] == "crash" else c["status"])
+        print(f"[{c['hash']}] x{c['count']}  {what}  {' < '.join(c['frames'][:3])}")
+        for it in c["samples"]: print("  ", it)
+    print(f"[i] {len(files)} inputs → {len(clusters)} clusters, wrote {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,19 @@
-import os, json, hashlib, sys, pathlib
+import os, json, sys, pathlib, glob
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from engine.crash_triage import cluster, triage  # noqa: E402
+
 def pick_base():
     cands = sorted(pathlib.Path("out").rglob("fuzzer_stats"), key=lambda p: p.stat().st_mtime, reverse=True)
     if not cands:
         print("[!] No fuzzer_stats under ./out", file=sys.stderr); sys.exit(1)
     return cands[0].parent
 
+# 입력 바이트 해시 대신 재현 스택 시그니처로 묶음 (캐시 공유: tools/triage.py와 동일)
+target = sys.argv[1] if len(sys.argv) > 1 else "targets/json/json_asan"
 base = pick_base()
-crashes = base/"crashes"
-groups = {}
-if crashes.is_dir():
-    for f in os.listdir(crashes):
-        if f.startswith("id:") and ",sig" in f:
-            p = crashes/ f
-            h = hashlib.md5(open(p,"rb").read(4096)).hexdigest()
-            groups.setdefault(h, []).append(str(p))
-
-report = [{"hash":h,"count":len(v),"samples":v[:3]} for h,v in groups.items()]
+files = sorted(p for p in glob.glob(str(base/"crashes"/"id:*")) if ",sig" in os.path.basename(p))
+report = cluster(triage(files, target, cache_path="triage/cache.jsonl")) if files else []
 pathlib.Path("reports").mkdir(exist_ok=True)
 json.dump(report, open("reports/triage.json","w"), indent=2)
 print(f"[i] Wrote reports/triage.json with {len(report)} clusters")